@@ -0,0 +1,36 @@
+"""
+Run all vLLM Judge examples against a single client and vLLM server.
+
+Sharing one client keeps its connections and result cache across the
+examples, and the examples reuse the server's prefix cache instead of each
+starting cold.
+
+Set VLLM_API_BASE and JUDGE_MODEL_ID to point the examples at your server.
+"""
+
+import os
+
+from vllm_judge import VLLMJudgeClient
+
+import basic_usage
+import generic_usage
+import template_management
+import utility_functions
+
+
+if __name__ == "__main__":
+    vllm_api_base = os.environ.get("VLLM_API_BASE", "http://localhost:8000/v1")
+    judge_model_id = os.environ.get("JUDGE_MODEL_ID", "qwen2")
+
+    # Initialize the client in direct mode
+    client = VLLMJudgeClient(
+        direct_mode=True,
+        vllm_api_base=vllm_api_base
+    )
+
+    # Pay the model's one-time startup cost once for all examples
+    client.warmup(judge_model_id)
+
+    for example in (basic_usage, generic_usage, template_management, utility_functions):
+        print(f"\n\n{'#' * 80}\n# {example.__name__}\n{'#' * 80}\n")
+        example.main(client, judge_model_id)
@@ -34,8 +34,8 @@ setup(
         "httpx>=0.26.0",
         "pydantic>=2.0.0",
         "pydantic-settings>=2.1.0",
-        "backoff>=2.2.1",
-        "requests>=2.31.0",
+        "orjson>=3.9.0",
+        "typing-extensions>=4.6.0",
     ],
     extras_require={
         "dev": [
@@ -45,6 +45,18 @@ setup(
             "mypy>=1.0.0",
             "pytest-cov>=4.0.0",
         ],
+        "aiohttp": [
+            "aiohttp>=3.9.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.26.0",
+        ],
+        "redis": [
+            "redis>=5.0.1",
+        ],
+        "speedups": [
+            "uvicorn[standard]>=0.27.0",
+        ],
     },
     entry_points={
         "console_scripts": [
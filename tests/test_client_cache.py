@@ -0,0 +1,154 @@
+from types import SimpleNamespace
+
+import pytest
+
+from vllm_judge import LRUCache, VLLMJudgeClient
+from vllm_judge import client as client_module
+
+
+GREEDY = {"temperature": 0}
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, calls):
+    def evaluate_text_direct(self, text, **kwargs):
+        calls.append(text)
+        return {
+            "evaluation_id": "direct-mode",
+            "status": "COMPLETED",
+            "result": {"judgment": True, "raw_judge_output": "yes", "reasoning": None},
+        }
+
+    monkeypatch.setattr(VLLMJudgeClient, "_evaluate_text_direct", evaluate_text_direct)
+    client = VLLMJudgeClient(
+        direct_mode=True,
+        vllm_api_base="http://localhost:8000/v1",
+        template_path=str(tmp_path / "templates.json"),
+    )
+    yield client
+    client.close()
+
+
+def evaluate(client, text="Some text", **kwargs):
+    return client.evaluate_text(
+        text=text,
+        evaluation_criteria="helpful",
+        judge_model_id="judge",
+        prompt_template_id="binary_classification",
+        **kwargs,
+    )
+
+
+def test_cache_key_ignores_unset_arguments(client):
+    request = {"text": "t", "judge_model_id": "judge", "sampling_params": GREEDY}
+    assert client._result_cache_key(request) == client._result_cache_key(
+        {**request, "prompt_template_id": None, "provide_reasoning": False, "wait": True, "timeout": 5}
+    )
+    assert client._result_cache_key(request) != client._result_cache_key({**request, "text": "u"})
+
+
+def test_only_greedy_requests_get_a_cache_key(client):
+    request = {"text": "t", "judge_model_id": "judge"}
+    assert client._result_cache_key(request) is None
+    assert client._result_cache_key({**request, "sampling_params": {"temperature": 0.7}}) is None
+    assert client._result_cache_key({**request, "sampling_params": GREEDY}) is not None
+
+
+def test_repeated_greedy_requests_are_served_from_the_cache(client, calls):
+    first = evaluate(client, sampling_params=GREEDY)
+    first["result"]["judgment"] = False
+
+    second = evaluate(client, sampling_params=GREEDY)
+    assert calls == ["Some text"]
+    assert second["result"]["judgment"] is True
+
+
+def test_sampled_requests_are_never_cached(client, calls):
+    for _ in range(2):
+        evaluate(client, sampling_params={"temperature": 0.7})
+    evaluate(client)
+    assert len(calls) == 3
+
+
+def test_template_changes_invalidate_its_results(client, calls):
+    evaluate(client, sampling_params=GREEDY)
+    client.evaluate_text(
+        text="Other text",
+        evaluation_criteria="helpful",
+        judge_model_id="judge",
+        prompt_template_id="likert_scale",
+        sampling_params=GREEDY,
+    )
+
+    client.update_template("binary_classification", {"description": "Changed"})
+    evaluate(client, sampling_params=GREEDY)
+    client.evaluate_text(
+        text="Other text",
+        evaluation_criteria="helpful",
+        judge_model_id="judge",
+        prompt_template_id="likert_scale",
+        sampling_params=GREEDY,
+    )
+    assert calls == ["Some text", "Other text", "Some text"]
+
+
+def test_cache_size_bounds_the_entries(client, calls):
+    client.cache_size = 2
+    for text in ("a", "b", "c"):
+        evaluate(client, text=text, sampling_params=GREEDY)
+    evaluate(client, text="a", sampling_params=GREEDY)
+    assert calls == ["a", "b", "c", "a"]
+
+
+def test_early_stopped_completions_are_not_cached(tmp_path):
+    client = VLLMJudgeClient(
+        direct_mode=True,
+        vllm_api_base="http://localhost:8000/v1",
+        template_path=str(tmp_path / "templates.json"),
+        completion_cache=LRUCache(),
+    )
+    streams = []
+
+    def stream_completion(model, messages, sampling_params):
+        streams.append(model)
+        yield from ("Yes", "\n", "Because it is.")
+
+    client.vllm_client.stream_completion = stream_completion
+    messages = [{"role": "user", "content": "Is this helpful?"}]
+    try:
+        response = client._generate_completion("judge", messages, GREEDY, is_decided=lambda text: "Yes" in text)
+        assert response["choices"][0]["message"]["content"] == "Yes"
+
+        response = client._generate_completion("judge", messages, GREEDY, is_decided=lambda text: False)
+        assert response["choices"][0]["message"]["content"] == "Yes\nBecause it is."
+
+        # The full completion is cached and answers early-stopping callers too
+        response = client._generate_completion("judge", messages, GREEDY, is_decided=lambda text: "Yes" in text)
+        assert response["choices"][0]["message"]["content"] == "Yes\nBecause it is."
+        assert len(streams) == 2
+    finally:
+        client.close()
+
+
+def test_template_changes_refetch_the_server_template_list():
+    class FakeHTTP:
+        def post(self, *args, **kwargs):
+            return SimpleNamespace(status_code=200, content=b"{}", text="")
+
+        def close(self):
+            pass
+
+    client = VLLMJudgeClient(base_url="http://judge.test")
+    try:
+        client._http = FakeHTTP()
+        client_module._template_cache[client.base_url] = (0.0, [])
+
+        client.create_template({"template_name": "New"})
+        assert client.base_url not in client_module._template_cache
+    finally:
+        client.close()
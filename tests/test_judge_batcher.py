@@ -0,0 +1,128 @@
+import asyncio
+
+from vllm_judge.services.judge_batcher import JudgeBatcher
+
+
+class FakeVLLMClient:
+    """Records the batched calls JudgeBatcher makes instead of contacting vLLM."""
+
+    def __init__(self):
+        self.batches = []
+        self.single_calls = []
+
+    async def generate_completions_batch(self, model, messages_list, sampling_params, routing_key=None):
+        self.batches.append((model, sampling_params, routing_key, [m[0]["content"] for m in messages_list]))
+        return [
+            ValueError("failed") if m[0]["content"] == "fail" else {"content": m[0]["content"]}
+            for m in messages_list
+        ]
+
+    async def generate_completion(self, model, messages, sampling_params, is_decided=None, routing_key=None):
+        self.single_calls.append(messages[0]["content"])
+        return {"content": messages[0]["content"]}
+
+
+def messages(text):
+    return [{"role": "user", "content": text}]
+
+
+def test_requests_are_grouped_by_model_params_and_routing_key():
+    async def run():
+        vllm_client = FakeVLLMClient()
+        batcher = JudgeBatcher(vllm_client, max_batch_size=16, max_wait_ms=50)
+        await batcher.start()
+        try:
+            results = await asyncio.gather(
+                batcher.generate_completion("judge", messages("a"), {"temperature": 0, "max_tokens": 8}),
+                batcher.generate_completion("judge", messages("b"), {"max_tokens": 8, "temperature": 0}),
+                batcher.generate_completion("judge", messages("c"), {"temperature": 0.5}),
+                batcher.generate_completion("other", messages("d"), {"temperature": 0, "max_tokens": 8}),
+                batcher.generate_completion("judge", messages("e"), {"temperature": 0, "max_tokens": 8}, routing_key="tpl"),
+            )
+        finally:
+            await batcher.stop()
+
+        assert [result["content"] for result in results] == ["a", "b", "c", "d", "e"]
+        groups = sorted((model, routing_key or "", texts) for model, _, routing_key, texts in vllm_client.batches)
+        assert groups == [
+            ("judge", "", ["a", "b"]),
+            ("judge", "", ["c"]),
+            ("judge", "tpl", ["e"]),
+            ("other", "", ["d"]),
+        ]
+
+    asyncio.run(run())
+
+
+def test_batch_size_is_capped():
+    async def run():
+        vllm_client = FakeVLLMClient()
+        batcher = JudgeBatcher(vllm_client, max_batch_size=2, max_wait_ms=50)
+        await batcher.start()
+        try:
+            await asyncio.gather(*(
+                batcher.generate_completion("judge", messages(text), {}) for text in "abcde"
+            ))
+        finally:
+            await batcher.stop()
+
+        assert all(len(texts) <= 2 for _, _, _, texts in vllm_client.batches)
+        assert sorted(text for _, _, _, texts in vllm_client.batches for text in texts) == list("abcde")
+
+    asyncio.run(run())
+
+
+def test_errors_are_returned_to_their_own_caller():
+    async def run():
+        vllm_client = FakeVLLMClient()
+        batcher = JudgeBatcher(vllm_client, max_batch_size=16, max_wait_ms=50)
+        await batcher.start()
+        try:
+            results = await asyncio.gather(
+                batcher.generate_completion("judge", messages("ok"), {}),
+                batcher.generate_completion("judge", messages("fail"), {}),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.stop()
+
+        assert results[0] == {"content": "ok"}
+        assert isinstance(results[1], ValueError)
+
+    asyncio.run(run())
+
+
+def test_early_stopped_and_unstarted_requests_bypass_the_queue():
+    async def run():
+        vllm_client = FakeVLLMClient()
+        batcher = JudgeBatcher(vllm_client, max_batch_size=16, max_wait_ms=50)
+        await batcher.generate_completion("judge", messages("unstarted"), {})
+
+        await batcher.start()
+        try:
+            await batcher.generate_completion("judge", messages("streamed"), {}, is_decided=bool)
+        finally:
+            await batcher.stop()
+
+        assert vllm_client.single_calls == ["unstarted", "streamed"]
+        assert vllm_client.batches == []
+
+    asyncio.run(run())
+
+
+def test_stop_answers_queued_requests():
+    async def run():
+        vllm_client = FakeVLLMClient()
+        batcher = JudgeBatcher(vllm_client, max_batch_size=16, max_wait_ms=10_000)
+        await batcher.start()
+        requests = [
+            asyncio.create_task(batcher.generate_completion("judge", messages(text), {}))
+            for text in "abc"
+        ]
+        await asyncio.sleep(0.01)
+
+        await batcher.stop()
+        results = await asyncio.wait_for(asyncio.gather(*requests), 1)
+        assert [result["content"] for result in results] == ["a", "b", "c"]
+
+    asyncio.run(run())
@@ -0,0 +1,108 @@
+import pytest
+
+from vllm_judge.core.errors import PromptTemplateError
+from vllm_judge.services.output_parser import OutputParser, _compile_patterns
+
+
+BINARY_RULES = {
+    "type": "binary",
+    "positive_patterns": ["yes", "safe", "acceptable"],
+    "negative_patterns": ["no", "unsafe", "unacceptable"],
+}
+NUMERIC_RULES = {"type": "numeric", "pattern": r"\b([1-5])\b"}
+PREFERENCE_RULES = {"type": "preference", "pattern": r"(?:(?:Text|Option|Response)\s*)?([AB])"}
+
+
+@pytest.fixture
+def parser():
+    parser = OutputParser()
+    parser.clear_cache()
+    return parser
+
+
+def test_compiled_patterns_match_any_term_case_insensitively():
+    pattern = _compile_patterns(("safe", "save", "sa"))
+    assert pattern.search("It is SAFE")
+    assert pattern.search("salt")
+    assert not pattern.search("unknown")
+
+
+def test_compiled_patterns_reject_non_string_terms():
+    with pytest.raises(TypeError):
+        _compile_patterns(("yes", 1))
+
+
+def test_binary_rules_prefer_positive_patterns(parser):
+    result = parser.parse_single_evaluation("Yes, but also no", parser_rules=BINARY_RULES)
+    assert result["judgment"] is True
+
+    result = parser.parse_single_evaluation("No.", parser_rules=BINARY_RULES)
+    assert result["judgment"] is False
+
+    # Outputs matching no rule fall back to the raw text
+    result = parser.parse_single_evaluation("Maybe", parser_rules=BINARY_RULES)
+    assert result["judgment"] == "Maybe"
+
+
+def test_numeric_rules_return_first_match(parser):
+    result = parser.parse_single_evaluation("Rating: 4\nNot a 2", parser_rules=NUMERIC_RULES)
+    assert result["judgment"] == 4
+
+
+def test_preference_rules(parser):
+    assert parser.parse_pairwise_comparison("Response B", parser_rules=PREFERENCE_RULES)["judgment"] == "B"
+
+
+def test_reasoning_is_split_from_judgment(parser):
+    result = parser.parse_single_evaluation(
+        "No\nReasoning: yes, it is harmful.", parser_rules=BINARY_RULES, provide_reasoning=True
+    )
+    assert result == {"judgment": False, "reasoning": "yes, it is harmful."}
+
+
+def test_results_are_memoized_per_template(parser):
+    first = parser.parse_single_evaluation("Yes, 4", template_id="tpl", parser_rules=BINARY_RULES)
+    first["judgment"] = "changed"
+    assert parser.parse_single_evaluation("Yes, 4", template_id="tpl", parser_rules=BINARY_RULES)["judgment"] is True
+
+    # Changing a template clears its results
+    parser.clear_cache("tpl")
+    assert parser.parse_single_evaluation("Yes, 4", template_id="tpl", parser_rules=NUMERIC_RULES)["judgment"] == 4
+
+
+def test_json_judgments_are_not_shared(parser):
+    first = parser.parse_single_evaluation('{"errors": [1]}', template_id="tpl", parser_rules={"type": "json"})
+    first["judgment"]["errors"].append(2)
+
+    second = parser.parse_single_evaluation('{"errors": [1]}', template_id="tpl", parser_rules={"type": "json"})
+    assert second["judgment"] == {"errors": [1]}
+
+
+def test_compile_rules_reports_invalid_patterns(parser):
+    with pytest.raises(PromptTemplateError):
+        parser.compile_rules({"type": "numeric", "pattern": "("})
+
+
+def test_binary_is_decided_once_positive_pattern_appears(parser):
+    assert not parser.is_decided("The answer is", BINARY_RULES)
+    assert parser.is_decided("The answer is yes", BINARY_RULES)
+    # A negative pattern could still be followed by a positive one
+    assert not parser.is_decided("no", BINARY_RULES)
+
+
+def test_numeric_is_decided_once_matching_line_is_complete(parser):
+    assert not parser.is_decided("Rating: 4", NUMERIC_RULES)
+    assert parser.is_decided("Rating: 4\n", NUMERIC_RULES)
+
+
+def test_is_decided_never_stops_reasoning_or_json(parser):
+    assert not parser.is_decided("yes\n", BINARY_RULES, provide_reasoning=True)
+    assert not parser.is_decided('{"answer": "yes"', BINARY_RULES)
+    assert not parser.is_decided("yes", {"type": "json"})
+    assert not parser.is_decided("yes", None)
+
+
+def test_comparison_is_decided_once_matching_line_is_complete(parser):
+    assert not parser.is_comparison_decided("Response A", PREFERENCE_RULES)
+    assert parser.is_comparison_decided("Response A\n", PREFERENCE_RULES)
+    assert not parser.is_comparison_decided("Response A\n", PREFERENCE_RULES, provide_reasoning=True)
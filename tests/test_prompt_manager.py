@@ -0,0 +1,131 @@
+import os
+from types import MappingProxyType
+
+import orjson
+import pytest
+
+from vllm_judge.core.errors import TemplateNotFoundError
+from vllm_judge.services import prompt_manager as prompt_manager_module
+from vllm_judge.services.prompt_manager import PromptManager, thaw_template
+from vllm_judge.services.segments import render_segment
+
+
+TEMPLATE_DATA = {
+    "template_name": "Helpfulness",
+    "prompt_structure": {
+        "system_message": "You are a judge.",
+        "user_instruction_prefix": "Criteria: {evaluation_criteria}\n\n",
+        "user_instruction_suffix": "\n\n{output_format_instruction}",
+    },
+    "output_parser_rules": {"type": "binary"},
+}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = PromptManager(str(tmp_path / "templates.json"))
+    yield manager
+    manager.flush()
+
+
+@pytest.mark.parametrize("segment", [
+    "Plain text",
+    "{evaluation_criteria}",
+    "A {evaluation_criteria} B {output_format_instruction} C",
+    "{evaluation_criteria}{evaluation_criteria}",
+    "Braces {{kept}} around {evaluation_criteria}",
+    "Spec {evaluation_criteria:>5}",
+])
+def test_render_segment_matches_str_format(segment):
+    values = {"evaluation_criteria": "crit", "output_format_instruction": "fmt"}
+    assert render_segment(segment, **values) == segment.format(**values)
+
+
+def test_template_views(manager):
+    assert manager.templates["templates"] is manager.template_snapshot
+    assert "binary_classification" in manager.template_snapshot
+    with pytest.raises(TypeError):
+        manager.templates["templates"] = {}
+
+
+def test_templates_are_frozen_and_thaw_into_plain_dicts(manager):
+    template = manager.get_template("binary_classification")
+    assert isinstance(template["prompt_structure"], MappingProxyType)
+    with pytest.raises(TypeError):
+        template["prompt_structure"]["system_message"] = "changed"
+    with pytest.raises(TypeError):
+        template["output_parser_rules"]["type"] = "numeric"
+    with pytest.raises(AttributeError):
+        template["output_parser_rules"]["positive_patterns"].append("sure")
+    with pytest.raises(TypeError):
+        template["description"] = "changed"
+
+    thawed = thaw_template(template)
+    thawed["prompt_structure"]["system_message"] = "changed"
+    thawed["output_parser_rules"]["positive_patterns"].append("sure")
+    assert type(thawed["prompt_structure"]) is dict
+    assert manager.get_template("binary_classification")["prompt_structure"]["system_message"] != "changed"
+    assert "sure" not in manager.get_template("binary_classification")["output_parser_rules"]["positive_patterns"]
+
+
+def test_changes_replace_the_snapshot(manager):
+    before = manager.template_snapshot
+    template = manager.create_template(TEMPLATE_DATA)
+
+    assert template["template_id"] not in before
+    assert manager.template_snapshot is not before
+    assert manager.get_template(template["template_id"])["template_name"] == "Helpfulness"
+
+    manager.delete_template(template["template_id"])
+    with pytest.raises(TemplateNotFoundError):
+        manager.get_template(template["template_id"])
+
+
+def test_single_evaluation_prompt_fills_segments(manager):
+    template = manager.create_template(TEMPLATE_DATA)
+    messages = manager.generate_single_evaluation_prompt(
+        text_to_evaluate="Some text",
+        evaluation_criteria="helpful",
+        prompt_template_id=template["template_id"],
+        output_format_instruction="Answer yes or no.",
+    )
+    assert messages == [
+        {"role": "system", "content": "You are a judge."},
+        {"role": "user", "content": "Criteria: helpful\n\nSome text\n\nAnswer yes or no."},
+    ]
+
+
+def test_changes_are_saved_together_after_a_delay(manager, monkeypatch):
+    writes = []
+    write_templates = manager._write_templates
+    monkeypatch.setattr(manager, "_write_templates", lambda templates: (writes.append(1), write_templates(templates)))
+
+    first = manager.create_template(TEMPLATE_DATA)
+    second = manager.create_template(TEMPLATE_DATA)
+    assert not os.path.exists(manager.template_path)
+
+    manager.flush()
+    assert len(writes) == 1
+    with open(manager.template_path, "rb") as f:
+        saved = orjson.loads(f.read())["templates"]
+    assert first["template_id"] in saved and second["template_id"] in saved
+    assert saved[first["template_id"]]["prompt_structure"] == TEMPLATE_DATA["prompt_structure"]
+
+
+def test_save_replaces_the_file_atomically(manager, monkeypatch):
+    manager.create_template(TEMPLATE_DATA)
+    manager.flush()
+    with open(manager.template_path, "rb") as f:
+        saved = f.read()
+
+    # A write failing halfway leaves the previous file untouched
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(prompt_manager_module.os, "replace", fail_replace)
+    manager.create_template(TEMPLATE_DATA)
+    with pytest.raises(OSError):
+        manager.flush()
+
+    with open(manager.template_path, "rb") as f:
+        assert f.read() == saved
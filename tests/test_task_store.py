@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from vllm_judge.core.errors import TaskNotFoundError
+from vllm_judge.core.models import EvaluationResult, TaskStatus
+from vllm_judge.services import task_store as task_store_module
+from vllm_judge.services.task_store import TaskStore
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    # Replace the module's reference only, so the event loop keeps the real clock
+    monkeypatch.setattr(task_store_module, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def test_tasks_expire_after_their_last_update(clock):
+    async def run():
+        store = TaskStore(num_shards=4, expiry_seconds=60)
+        await store.create("task")
+
+        clock.now += 50
+        await store.update("task", TaskStatus.RUNNING)
+        clock.now += 50
+        assert (await store.get("task")).status == TaskStatus.RUNNING
+
+        clock.now += 11
+        assert await store.get("task") is None
+
+    asyncio.run(run())
+
+
+def test_wait_returns_once_task_finishes():
+    async def run():
+        store = TaskStore(num_shards=2, expiry_seconds=60)
+        await store.create("task")
+
+        async def finish():
+            await asyncio.sleep(0.01)
+            await store.update(
+                "task",
+                TaskStatus.COMPLETED,
+                result=EvaluationResult(judgment=True, raw_judge_output="yes"),
+            )
+
+        finisher = asyncio.create_task(finish())
+        record = await store.wait("task", timeout=5)
+        await finisher
+        assert record.status == TaskStatus.COMPLETED
+        assert record.result.judgment is True
+
+    asyncio.run(run())
+
+
+def test_wait_times_out_with_unfinished_task():
+    async def run():
+        store = TaskStore(num_shards=2, expiry_seconds=60)
+        await store.create("task")
+        record = await store.wait("task", timeout=0.01)
+        assert record.status == TaskStatus.PENDING
+
+    asyncio.run(run())
+
+
+def test_status_route_only_consumes_tasks_when_asked(monkeypatch):
+    from vllm_judge.api.routes import evaluate
+
+    async def run():
+        store = TaskStore(num_shards=2, expiry_seconds=60)
+        monkeypatch.setattr(evaluate, "task_store", store)
+        await store.create("task")
+
+        # Unfinished tasks are never consumed
+        response = await evaluate.get_evaluation_status("task", consume=True)
+        assert response.status == TaskStatus.PENDING
+
+        await store.update(
+            "task",
+            TaskStatus.COMPLETED,
+            result=EvaluationResult(judgment=True, raw_judge_output="yes"),
+        )
+        for _ in range(2):
+            await evaluate.get_evaluation_status("task")
+        assert await store.get("task") is not None
+
+        await evaluate.get_evaluation_status("task", consume=True)
+        with pytest.raises(TaskNotFoundError):
+            await evaluate.get_evaluation_status("task")
+
+    asyncio.run(run())
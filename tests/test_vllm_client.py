@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from vllm_judge.services.vllm_client import VLLMClient
+
+
+GREEDY = {"temperature": 0}
+MESSAGES = [{"role": "user", "content": "Is this helpful?"}]
+
+
+@pytest.fixture
+def client():
+    client = VLLMClient(api_base="http://localhost:8000/v1", completion_cache_size=16)
+    client.streams = 0
+
+    async def stream_completion(model, messages, sampling_params, routing_key=None):
+        client.streams += 1
+        for delta in ("Yes", "\n", "Because ", "it is."):
+            yield delta
+
+    client._stream_completion = stream_completion
+    return client
+
+
+def test_early_stopped_completions_are_not_cached(client):
+    async def run():
+        response = await client.generate_completion("judge", MESSAGES, GREEDY, is_decided=lambda text: "Yes" in text)
+        assert response["choices"][0]["message"]["content"] == "Yes"
+
+        # A caller without the early stop must get the whole completion
+        deltas = [delta async for delta in client.stream_completion("judge", MESSAGES, GREEDY)]
+        assert "".join(deltas) == "Yes\nBecause it is."
+        assert client.streams == 2
+
+    asyncio.run(run())
+
+
+def test_full_completions_are_cached_for_early_stopping_callers(client):
+    async def run():
+        deltas = [delta async for delta in client.stream_completion("judge", MESSAGES, GREEDY)]
+        assert "".join(deltas) == "Yes\nBecause it is."
+
+        response = await client.generate_completion("judge", MESSAGES, GREEDY, is_decided=lambda text: "Yes" in text)
+        assert response["choices"][0]["message"]["content"] == "Yes\nBecause it is."
+        assert client.streams == 1
+
+    asyncio.run(run())
+
+
+def test_streams_closed_early_are_not_cached(client):
+    async def run():
+        async for _ in client.stream_completion("judge", MESSAGES, GREEDY):
+            break
+        deltas = [delta async for delta in client.stream_completion("judge", MESSAGES, GREEDY)]
+        assert "".join(deltas) == "Yes\nBecause it is."
+        assert client.streams == 2
+
+    asyncio.run(run())
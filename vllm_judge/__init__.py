@@ -19,6 +19,7 @@ from vllm_judge.client import (
 from vllm_judge.services.vllm_client import VLLMClient
 from vllm_judge.services.prompt_manager import PromptManager
 from vllm_judge.services.output_parser import OutputParser
+from vllm_judge.services.completion_cache import CompletionCache, LRUCache, DiskCache
 
 __all__ = [
     "VLLMJudgeClient",
@@ -31,4 +32,7 @@ __all__ = [
     "VLLMClient",
     "PromptManager",
     "OutputParser",
+    "CompletionCache",
+    "LRUCache",
+    "DiskCache",
 ]
\ No newline at end of file
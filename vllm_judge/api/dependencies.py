@@ -0,0 +1,10 @@
+from vllm_judge.services.vllm_client import VLLMClient
+from vllm_judge.services.prompt_manager import PromptManager
+from vllm_judge.services.output_parser import OutputParser
+
+
+# Service instances shared by all routers, so that template changes made
+# through the config routes are seen by the evaluate routes
+vllm_client = VLLMClient()
+prompt_manager = PromptManager()
+output_parser = OutputParser()
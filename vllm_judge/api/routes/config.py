@@ -1,15 +1,39 @@
-from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 
-from vllm_judge.core.models import TemplateCreateRequest, TemplateResponse
+import orjson
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from vllm_judge.core.config import settings
+from vllm_judge.core.models import TemplateCreateRequest, TemplateResponse, WarmupRequest
 from vllm_judge.core.errors import TemplateNotFoundError
-from vllm_judge.services.prompt_manager import PromptManager
+from vllm_judge.api.dependencies import vllm_client, prompt_manager, output_parser
+from vllm_judge.services.prompt_manager import thaw_template
 
 
 router = APIRouter(prefix="/v1/config", tags=["config"])
 
-# Service instances
-prompt_manager = PromptManager()
+# Serialized template list and the templates snapshot it was built from
+_template_list_cache: Optional[Tuple[Mapping[str, Mapping[str, Any]], bytes]] = None
+
+
+def _check_templates_writable() -> None:
+    """
+    Reject template changes when the server runs several worker processes.
+    
+    Each worker loads its own copy of the templates at startup, so a change
+    made through one worker would be unknown to the others, and their
+    writes to the template file would overwrite each other.
+    
+    Raises:
+        HTTPException: If there is more than one worker
+    """
+    if settings.SERVER_WORKERS > 1:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Templates are read-only when the server runs more than one worker; "
+                   "edit the template file and restart the server instead",
+        )
 
 
 @router.get("/judge_templates", response_model=List[TemplateResponse])
@@ -20,8 +44,19 @@ async def list_judge_templates() -> List[TemplateResponse]:
     Returns:
         List of templates
     """
-    templates = prompt_manager.list_templates()
-    return [TemplateResponse(**template) for template in templates]
+    global _template_list_cache
+    
+    # The snapshot is replaced on every template change, so the list only
+    # needs serializing again when it is a different object
+    templates = prompt_manager.template_snapshot
+    if _template_list_cache is None or _template_list_cache[0] is not templates:
+        body = orjson.dumps([
+            TemplateResponse(**thaw_template(template)).model_dump(mode="json")
+            for template in templates.values()
+        ])
+        _template_list_cache = (templates, body)
+    
+    return Response(content=_template_list_cache[1], media_type="application/json")
 
 
 @router.get("/judge_templates/{template_id}", response_model=TemplateResponse)
@@ -40,7 +75,7 @@ async def get_judge_template(template_id: str) -> TemplateResponse:
     """
     try:
         template = prompt_manager.get_template(template_id)
-        return TemplateResponse(**template)
+        return TemplateResponse(**thaw_template(template))
     except TemplateNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -55,9 +90,18 @@ async def create_judge_template(template_data: TemplateCreateRequest) -> Templat
         
     Returns:
         The created template
+        
+    Raises:
+        PromptTemplateError: If a parser rule pattern is invalid
     """
-    template = prompt_manager.create_template(template_data.dict())
-    return TemplateResponse(**template)
+    _check_templates_writable()
+    
+    # Reject invalid patterns now rather than on every evaluation
+    output_parser.compile_rules(template_data.output_parser_rules)
+    
+    # Writing the template file blocks, so keep it off the event loop
+    template = await run_in_threadpool(prompt_manager.create_template, template_data.model_dump())
+    return TemplateResponse(**thaw_template(template))
 
 
 @router.put("/judge_templates/{template_id}", response_model=TemplateResponse)
@@ -74,10 +118,17 @@ async def update_judge_template(template_id: str, template_data: TemplateCreateR
         
     Raises:
         TemplateNotFoundError: If the template is not found
+        PromptTemplateError: If a parser rule pattern is invalid
     """
+    _check_templates_writable()
+    
+    # Reject invalid patterns now rather than on every evaluation
+    output_parser.compile_rules(template_data.output_parser_rules)
+    
     try:
-        template = prompt_manager.update_template(template_id, template_data.dict())
-        return TemplateResponse(**template)
+        template = await run_in_threadpool(prompt_manager.update_template, template_id, template_data.model_dump())
+        output_parser.clear_cache(template_id)
+        return TemplateResponse(**thaw_template(template))
     except TemplateNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -90,10 +141,55 @@ async def delete_judge_template(template_id: str) -> None:
     Args:
         template_id: ID of the template to delete
         
+    Raises:
+        TemplateNotFoundError: If the template is not found
+    """
+    _check_templates_writable()
+    
+    try:
+        await run_in_threadpool(prompt_manager.delete_template, template_id)
+        output_parser.clear_cache(template_id)
+    except TemplateNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post("/judge_templates/{template_id}/warmup", status_code=status.HTTP_204_NO_CONTENT)
+async def warmup_judge_template(template_id: str, warmup_request: WarmupRequest) -> None:
+    """
+    Warm the vLLM prefix cache with the static prefix of a judge prompt template.
+    
+    The warm-up request carries the same routing key as evaluations using the
+    template, so a router sends it to the replica that will serve them.
+    
+    Args:
+        template_id: ID of the template to warm
+        warmup_request: The judge model the template will be used with
+        
     Raises:
         TemplateNotFoundError: If the template is not found
     """
     try:
-        prompt_manager.delete_template(template_id)
+        messages = prompt_manager.generate_template_prefix_prompt(template_id)
     except TemplateNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    
+    await vllm_client.generate_completion(
+        model=warmup_request.judge_model_id,
+        messages=messages,
+        sampling_params={"max_tokens": 1},
+        routing_key=template_id if settings.ROUTING_KEY_HEADER else None,
+    )
+
+
+@router.post("/warmup", status_code=status.HTTP_204_NO_CONTENT)
+async def warmup_judge_model(warmup_request: WarmupRequest) -> None:
+    """
+    Send the judge model a one-token request.
+    
+    The first request to a freshly started vLLM server pays one-time startup
+    costs; warming up moves them out of the first real evaluation.
+    
+    Args:
+        warmup_request: The judge model to warm up
+    """
+    await vllm_client.warmup(warmup_request.judge_model_id)
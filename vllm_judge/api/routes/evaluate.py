@@ -1,7 +1,12 @@
-import uuid
+import os
 import asyncio
-from typing import Dict, Any, Optional
-from fastapi import APIRouter, Depends, BackgroundTasks
+import functools
+import hashlib
+import orjson
+from contextlib import aclosing
+from typing import Dict, Any, Optional, Union, AsyncIterator, Awaitable, Callable
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response, StreamingResponse
 
 from vllm_judge.core.models import (
     SingleEvaluationRequest,
@@ -9,28 +14,229 @@ from vllm_judge.core.models import (
     EvaluationResponse,
     TaskStatus,
     EvaluationResult,
+    BatchEvaluationRequest,
+    BatchEvaluationResponse,
 )
-from vllm_judge.core.errors import TaskNotFoundError, TemplateNotFoundError
+from vllm_judge.core.config import settings
+from vllm_judge.core.errors import TaskNotFoundError, QueueFullError
+from vllm_judge.api.dependencies import vllm_client, prompt_manager, output_parser
 from vllm_judge.services.vllm_client import VLLMClient
+from vllm_judge.services.judge_batcher import JudgeBatcher
 from vllm_judge.services.prompt_manager import PromptManager
 from vllm_judge.services.output_parser import OutputParser
+from vllm_judge.services.task_store import create_task_store
+from vllm_judge.services.worker_pool import WorkerPool
 
 
 router = APIRouter(prefix="/v1/evaluate", tags=["evaluate"])
 
-#TODO: persistent store..?
-evaluation_tasks: Dict[str, Dict[str, Any]] = {}
-
 # Service instances
-vllm_client = VLLMClient()
-prompt_manager = PromptManager()
-output_parser = OutputParser()
+task_store = create_task_store()
+worker_pool = WorkerPool()
+# Shared by all batch requests, so together they run at most JUDGE_WORKERS
+# items at once, like the worker pool does for queued evaluations
+batch_slots = asyncio.Semaphore(settings.JUDGE_WORKERS)
+judge_batcher = JudgeBatcher(vllm_client)
+
+
+# Random bytes drawn in bulk for evaluation IDs, 16 bytes per ID
+_id_bytes = b""
+_id_offset = 0
+
+
+def new_evaluation_id() -> str:
+    """
+    Generate a random (version 4) UUID for an evaluation, as 32 hex digits.
+    
+    Random bytes are read from the OS 4 KiB at a time rather than once per ID.
+    
+    Returns:
+        The evaluation ID
+    """
+    global _id_bytes, _id_offset
+    if _id_offset >= len(_id_bytes):
+        _id_bytes = os.urandom(4096)
+        _id_offset = 0
+    
+    id_bytes = bytearray(_id_bytes[_id_offset:_id_offset + 16])
+    _id_offset += 16
+    
+    # Set the UUID version and variant bits
+    id_bytes[6] = id_bytes[6] & 0x0F | 0x40
+    id_bytes[8] = id_bytes[8] & 0x3F | 0x80
+    return id_bytes.hex()
+
+
+def get_sampling_params(
+    request: Union[SingleEvaluationRequest, PairwiseComparisonRequest],
+) -> Dict[str, Any]:
+    """
+    Get the vLLM sampling parameters for a request.
+    
+    Args:
+        request: The evaluation or comparison request
+        
+    Returns:
+        The sampling parameters to send to vLLM
+    """
+    return request.vllm_sampling_params.model_dump() if request.vllm_sampling_params else {}
+
+
+def get_routing_key(
+    request: Union[SingleEvaluationRequest, PairwiseComparisonRequest],
+) -> Optional[str]:
+    """
+    Get the key routing a request to a vLLM replica.
+    
+    Requests using a template are routed by the template ID, so a router in
+    front of several vLLM replicas can send them to the replica that already
+    holds the template's prefix in its cache. The key is only sent as a
+    header, never in the request body.
+    
+    Args:
+        request: The evaluation or comparison request
+        
+    Returns:
+        The template ID, or None if the request is not routed by template
+    """
+    if request.prompt_template_id and settings.ROUTING_KEY_HEADER:
+        return request.prompt_template_id
+    return None
+
+
+# Deterministic evaluations currently running, keyed by a hash of the request
+_in_flight: Dict[bytes, asyncio.Future] = {}
+
+
+def coalesce_identical(
+    run: Callable[..., Awaitable[EvaluationResult]],
+) -> Callable[..., Awaitable[EvaluationResult]]:
+    """
+    Share one judge call between identical requests that run at the same time.
+    
+    Only requests sampled with temperature 0 are shared, since any other
+    request is expected to get its own sample.
+    
+    Args:
+        run: Function running an evaluation or comparison request
+        
+    Returns:
+        The wrapped function
+    """
+    @functools.wraps(run)
+    async def wrapper(
+        request: Union[SingleEvaluationRequest, PairwiseComparisonRequest],
+        *args: Any,
+    ) -> EvaluationResult:
+        if request.vllm_sampling_params is None or request.vllm_sampling_params.temperature != 0:
+            return await run(request, *args)
+        
+        key = hashlib.blake2b(
+            orjson.dumps(request.model_dump(), option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).digest()
+        
+        # Wait for the identical request already running, unless it gets cancelled
+        future = _in_flight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            return await run(request, *args)
+        
+        future = asyncio.get_running_loop().create_future()
+        _in_flight[key] = future
+        try:
+            result = await run(request, *args)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del _in_flight[key]
+    
+    return wrapper
+
+
+@coalesce_identical
+async def run_single_evaluation(
+    request: SingleEvaluationRequest,
+    vllm_client: Union[VLLMClient, JudgeBatcher],
+    prompt_manager: PromptManager,
+    output_parser: OutputParser,
+) -> EvaluationResult:
+    """
+    Run a single evaluation against the judge model.
+    
+    Args:
+        request: The evaluation request
+        vllm_client: Instance of VLLMClient, or a JudgeBatcher wrapping one
+        prompt_manager: Instance of PromptManager
+        output_parser: Instance of OutputParser
+        
+    Returns:
+        The evaluation result
+    """
+    # Generate prompt
+    messages = prompt_manager.generate_single_evaluation_prompt(
+        text_to_evaluate=request.text_to_evaluate,
+        evaluation_criteria=request.evaluation_criteria,
+        prompt_template_id=request.prompt_template_id,
+        custom_prompt_segments=request.custom_prompt_segments,
+        output_format_instruction=request.output_format_instruction,
+        provide_reasoning=request.provide_reasoning,
+    )
+    
+    # Get sampling parameters
+    sampling_params = get_sampling_params(request)
+    
+    # Get parser rules if a template was used
+    parser_rules = prompt_manager.get_parser_rules(request.prompt_template_id)
+    
+    # Stop the generation once the judgment can no longer change
+    is_decided = None
+    if not request.provide_reasoning and parser_rules and parser_rules.get("type") in ("binary", "numeric"):
+        is_decided = functools.partial(output_parser.is_decided, parser_rules=parser_rules)
+    
+    # Generate completion
+    response = await vllm_client.generate_completion(
+        model=request.judge_model_id,
+        messages=messages,
+        sampling_params=sampling_params,
+        is_decided=is_decided,
+        routing_key=get_routing_key(request),
+    )
+    
+    # Extract the response text
+    raw_output = response["choices"][0]["message"]["content"]
+    
+    # Parse the output
+    parsed_result = output_parser.parse_single_evaluation(
+        raw_output=raw_output,
+        template_id=request.prompt_template_id,
+        parser_rules=parser_rules,
+        provide_reasoning=request.provide_reasoning,
+    )
+    
+    # Return the result; the values come from our own parser, so skip validation
+    return EvaluationResult.model_construct(
+        judgment=parsed_result["judgment"],
+        raw_judge_output=raw_output,
+        reasoning=parsed_result["reasoning"],
+    )
 
 
 async def process_single_evaluation(
     evaluation_id: str,
     request: SingleEvaluationRequest,
-    vllm_client: VLLMClient,
+    vllm_client: Union[VLLMClient, JudgeBatcher],
     prompt_manager: PromptManager,
     output_parser: OutputParser,
 ) -> None:
@@ -40,75 +246,96 @@ async def process_single_evaluation(
     Args:
         evaluation_id: ID of the evaluation task
         request: The evaluation request
-        vllm_client: Instance of VLLMClient
+        vllm_client: Instance of VLLMClient, or a JudgeBatcher wrapping one
         prompt_manager: Instance of PromptManager
         output_parser: Instance of OutputParser
     """
     try:
         # Update task status
-        evaluation_tasks[evaluation_id]["status"] = TaskStatus.RUNNING
+        await task_store.update(evaluation_id, TaskStatus.RUNNING)
         
-        # Generate prompt
-        messages = prompt_manager.generate_single_evaluation_prompt(
-            text_to_evaluate=request.text_to_evaluate,
-            evaluation_criteria=request.evaluation_criteria,
-            prompt_template_id=request.prompt_template_id,
-            custom_prompt_segments=request.custom_prompt_segments,
-            output_format_instruction=request.output_format_instruction,
-            provide_reasoning=request.provide_reasoning,
-        )
-        
-        # Get sampling parameters
-        sampling_params = request.vllm_sampling_params.dict() if request.vllm_sampling_params else {}
-        
-        # Generate completion
-        response = await vllm_client.generate_completion(
-            model=request.judge_model_id,
-            messages=messages,
-            sampling_params=sampling_params,
-        )
-        
-        # Extract the response text
-        raw_output = response["choices"][0]["message"]["content"]
-        
-        # Get parser rules if a template was used
-        parser_rules = None
-        if request.prompt_template_id:
-            try:
-                template = prompt_manager.get_template(request.prompt_template_id)
-                parser_rules = template.get("output_parser_rules")
-            except TemplateNotFoundError:
-                pass
-        
-        # Parse the output
-        parsed_result = output_parser.parse_single_evaluation(
-            raw_output=raw_output,
-            template_id=request.prompt_template_id,
-            parser_rules=parser_rules,
-            provide_reasoning=request.provide_reasoning,
-        )
+        result = await run_single_evaluation(request, vllm_client, prompt_manager, output_parser)
         
         # Update task with result
-        evaluation_tasks[evaluation_id].update({
-            "status": TaskStatus.COMPLETED,
-            "result": EvaluationResult(
-                judgment=parsed_result["judgment"],
-                raw_judge_output=raw_output,
-                reasoning=parsed_result["reasoning"],
-            ),
-        })
+        await task_store.update(evaluation_id, TaskStatus.COMPLETED, result=result)
     except Exception as e:
         # Update task with error
-        evaluation_tasks[evaluation_id].update({
-            "status": TaskStatus.FAILED,
-            "error_message": str(e),
-        })
+        await task_store.update(evaluation_id, TaskStatus.FAILED, error_message=str(e))
+
+
+@coalesce_identical
+async def run_pairwise_comparison(
+    request: PairwiseComparisonRequest,
+    vllm_client: Union[VLLMClient, JudgeBatcher],
+    prompt_manager: PromptManager,
+    output_parser: OutputParser,
+) -> EvaluationResult:
+    """
+    Run a pairwise comparison against the judge model.
+    
+    Args:
+        request: The comparison request
+        vllm_client: Instance of VLLMClient, or a JudgeBatcher wrapping one
+        prompt_manager: Instance of PromptManager
+        output_parser: Instance of OutputParser
+        
+    Returns:
+        The comparison result
+    """
+    # Generate prompt
+    messages = prompt_manager.generate_pairwise_comparison_prompt(
+        text_A=request.text_A,
+        text_B=request.text_B,
+        comparison_criteria=request.comparison_criteria,
+        prompt_template_id=request.prompt_template_id,
+        custom_prompt_segments=request.custom_prompt_segments,
+        output_format_instruction=request.output_format_instruction,
+        provide_reasoning=request.provide_reasoning,
+    )
+    
+    # Get sampling parameters
+    sampling_params = get_sampling_params(request)
+    
+    # Get parser rules if a template was used
+    parser_rules = prompt_manager.get_parser_rules(request.prompt_template_id)
+    
+    # Stop the generation once the preference can no longer change
+    is_decided = None
+    if not request.provide_reasoning and parser_rules and parser_rules.get("type") == "preference":
+        is_decided = functools.partial(output_parser.is_comparison_decided, parser_rules=parser_rules)
+    
+    # Generate completion
+    response = await vllm_client.generate_completion(
+        model=request.judge_model_id,
+        messages=messages,
+        sampling_params=sampling_params,
+        is_decided=is_decided,
+        routing_key=get_routing_key(request),
+    )
+    
+    # Extract the response text
+    raw_output = response["choices"][0]["message"]["content"]
+    
+    # Parse the output
+    parsed_result = output_parser.parse_pairwise_comparison(
+        raw_output=raw_output,
+        template_id=request.prompt_template_id,
+        parser_rules=parser_rules,
+        provide_reasoning=request.provide_reasoning,
+    )
+    
+    # Return the result; the values come from our own parser, so skip validation
+    return EvaluationResult.model_construct(
+        judgment=parsed_result["judgment"],
+        raw_judge_output=raw_output,
+        reasoning=parsed_result["reasoning"],
+    )
 
 
 async def process_pairwise_comparison(
     evaluation_id: str,
     request: PairwiseComparisonRequest,
-    vllm_client: VLLMClient,
+    vllm_client: Union[VLLMClient, JudgeBatcher],
     prompt_manager: PromptManager,
     output_parser: OutputParser,
 ) -> None:
@@ -118,107 +345,58 @@ async def process_pairwise_comparison(
     Args:
         evaluation_id: ID of the evaluation task
         request: The comparison request
-        vllm_client: Instance of VLLMClient
+        vllm_client: Instance of VLLMClient, or a JudgeBatcher wrapping one
         prompt_manager: Instance of PromptManager
         output_parser: Instance of OutputParser
     """
     try:
         # Update task status
-        evaluation_tasks[evaluation_id]["status"] = TaskStatus.RUNNING
-        
-        # Generate prompt
-        messages = prompt_manager.generate_pairwise_comparison_prompt(
-            text_A=request.text_A,
-            text_B=request.text_B,
-            comparison_criteria=request.comparison_criteria,
-            prompt_template_id=request.prompt_template_id,
-            custom_prompt_segments=request.custom_prompt_segments,
-            output_format_instruction=request.output_format_instruction,
-            provide_reasoning=request.provide_reasoning,
-        )
+        await task_store.update(evaluation_id, TaskStatus.RUNNING)
         
-        # Get sampling parameters
-        sampling_params = request.vllm_sampling_params.dict() if request.vllm_sampling_params else {}
-        
-        # Generate completion
-        response = await vllm_client.generate_completion(
-            model=request.judge_model_id,
-            messages=messages,
-            sampling_params=sampling_params,
-        )
-        
-        # Extract the response text
-        raw_output = response["choices"][0]["message"]["content"]
-        
-        # Get parser rules if a template was used
-        parser_rules = None
-        if request.prompt_template_id:
-            try:
-                template = prompt_manager.get_template(request.prompt_template_id)
-                parser_rules = template.get("output_parser_rules")
-            except TemplateNotFoundError:
-                pass
-        
-        # Parse the output
-        parsed_result = output_parser.parse_pairwise_comparison(
-            raw_output=raw_output,
-            template_id=request.prompt_template_id,
-            parser_rules=parser_rules,
-            provide_reasoning=request.provide_reasoning,
-        )
+        result = await run_pairwise_comparison(request, vllm_client, prompt_manager, output_parser)
         
         # Update task with result
-        evaluation_tasks[evaluation_id].update({
-            "status": TaskStatus.COMPLETED,
-            "result": EvaluationResult(
-                judgment=parsed_result["judgment"],
-                raw_judge_output=raw_output,
-                reasoning=parsed_result["reasoning"],
-            ),
-        })
+        await task_store.update(evaluation_id, TaskStatus.COMPLETED, result=result)
     except Exception as e:
         # Update task with error
-        evaluation_tasks[evaluation_id].update({
-            "status": TaskStatus.FAILED,
-            "error_message": str(e),
-        })
+        await task_store.update(evaluation_id, TaskStatus.FAILED, error_message=str(e))
 
 
 @router.post("/single_response", response_model=EvaluationResponse)
 async def evaluate_single_response(
     request: SingleEvaluationRequest,
-    background_tasks: BackgroundTasks,
 ) -> EvaluationResponse:
     """
     Evaluate a single piece of text based on specified criteria.
     
     Args:
         request: The evaluation request
-        background_tasks: FastAPI BackgroundTasks
         
     Returns:
         Evaluation response with task ID
+        
+    Raises:
+        QueueFullError: If too many evaluations are already queued
     """
     # Generate a unique ID for this evaluation
-    evaluation_id = str(uuid.uuid4())
+    evaluation_id = new_evaluation_id()
     
     # Create a new task
-    evaluation_tasks[evaluation_id] = {
-        "evaluation_id": evaluation_id,
-        "status": TaskStatus.PENDING,
-        "result": None,
-        "error_message": None,
-    }
-    
-    # Process the evaluation in the background
-    background_tasks.add_task(
-        process_single_evaluation,
-        evaluation_id,
-        request,
-        vllm_client,
-        prompt_manager,
-        output_parser,
-    )
+    await task_store.create(evaluation_id)
+    
+    # Queue the evaluation for a worker
+    try:
+        worker_pool.submit(
+            process_single_evaluation,
+            evaluation_id,
+            request,
+            judge_batcher,
+            prompt_manager,
+            output_parser,
+        )
+    except QueueFullError as e:
+        await task_store.update(evaluation_id, TaskStatus.FAILED, error_message=e.detail)
+        raise
     
     # Return the response
     return EvaluationResponse(
@@ -227,41 +405,58 @@ async def evaluate_single_response(
     )
 
 
+@router.post("/single_response/stream")
+async def evaluate_single_response_stream(request: SingleEvaluationRequest) -> StreamingResponse:
+    """
+    Evaluate a single piece of text, streaming the judge's output as it is generated.
+    
+    Args:
+        request: The evaluation request
+        
+    Returns:
+        Server-sent event stream of output deltas, ending with the evaluation response
+    """
+    return StreamingResponse(
+        stream_single_evaluation(request, vllm_client, prompt_manager, output_parser),
+        media_type="text/event-stream",
+    )
+
+
 @router.post("/pairwise_comparison", response_model=EvaluationResponse)
 async def pairwise_comparison(
     request: PairwiseComparisonRequest,
-    background_tasks: BackgroundTasks,
 ) -> EvaluationResponse:
     """
     Compare two pieces of text using a judge LLM.
     
     Args:
         request: The comparison request
-        background_tasks: FastAPI BackgroundTasks
         
     Returns:
         Evaluation response with task ID
+        
+    Raises:
+        QueueFullError: If too many evaluations are already queued
     """
     # Generate a unique ID for this evaluation
-    evaluation_id = str(uuid.uuid4())
+    evaluation_id = new_evaluation_id()
     
     # Create a new task
-    evaluation_tasks[evaluation_id] = {
-        "evaluation_id": evaluation_id,
-        "status": TaskStatus.PENDING,
-        "result": None,
-        "error_message": None,
-    }
-    
-    # Process the evaluation in the background
-    background_tasks.add_task(
-        process_pairwise_comparison,
-        evaluation_id,
-        request,
-        vllm_client,
-        prompt_manager,
-        output_parser,
-    )
+    await task_store.create(evaluation_id)
+    
+    # Queue the evaluation for a worker
+    try:
+        worker_pool.submit(
+            process_pairwise_comparison,
+            evaluation_id,
+            request,
+            judge_batcher,
+            prompt_manager,
+            output_parser,
+        )
+    except QueueFullError as e:
+        await task_store.update(evaluation_id, TaskStatus.FAILED, error_message=e.detail)
+        raise
     
     # Return the response
     return EvaluationResponse(
@@ -270,13 +465,155 @@ async def pairwise_comparison(
     )
 
 
+async def stream_single_evaluation(
+    request: SingleEvaluationRequest,
+    vllm_client: VLLMClient,
+    prompt_manager: PromptManager,
+    output_parser: OutputParser,
+) -> AsyncIterator[str]:
+    """
+    Run a single evaluation, streaming the judge's output as server-sent events.
+    
+    Each piece of generated text is sent as a {"delta": ...} event, followed by
+    one final event holding the evaluation response. For binary templates the
+    generation is stopped as soon as the judgment can no longer change.
+    
+    Args:
+        request: The evaluation request
+        vllm_client: Instance of VLLMClient
+        prompt_manager: Instance of PromptManager
+        output_parser: Instance of OutputParser
+        
+    Yields:
+        Server-sent event lines
+    """
+    evaluation_id = new_evaluation_id()
+    try:
+        # Generate prompt
+        messages = prompt_manager.generate_single_evaluation_prompt(
+            text_to_evaluate=request.text_to_evaluate,
+            evaluation_criteria=request.evaluation_criteria,
+            prompt_template_id=request.prompt_template_id,
+            custom_prompt_segments=request.custom_prompt_segments,
+            output_format_instruction=request.output_format_instruction,
+            provide_reasoning=request.provide_reasoning,
+        )
+        
+        # Get sampling parameters
+        sampling_params = get_sampling_params(request)
+        
+        # Get parser rules if a template was used
+        parser_rules = prompt_manager.get_parser_rules(request.prompt_template_id)
+        
+        # Forward the output as it is generated
+        raw_output = ""
+        async with aclosing(vllm_client.stream_completion(
+            model=request.judge_model_id,
+            messages=messages,
+            sampling_params=sampling_params,
+            routing_key=get_routing_key(request),
+        )) as deltas:
+            async for delta in deltas:
+                raw_output += delta
+                yield f"data: {orjson.dumps({'delta': delta}).decode()}\n\n"
+                if output_parser.is_decided(raw_output, parser_rules, request.provide_reasoning):
+                    break
+        
+        # Parse the output
+        parsed_result = output_parser.parse_single_evaluation(
+            raw_output=raw_output,
+            template_id=request.prompt_template_id,
+            parser_rules=parser_rules,
+            provide_reasoning=request.provide_reasoning,
+        )
+        response = EvaluationResponse(
+            evaluation_id=evaluation_id,
+            status=TaskStatus.COMPLETED,
+            result=EvaluationResult(
+                judgment=parsed_result["judgment"],
+                raw_judge_output=raw_output,
+                reasoning=parsed_result["reasoning"],
+            ),
+        )
+    except Exception as e:
+        response = EvaluationResponse(
+            evaluation_id=evaluation_id,
+            status=TaskStatus.FAILED,
+            error_message=str(e),
+        )
+    
+    yield f"data: {response.model_dump_json()}\n\n"
+
+
+async def process_batch_item(
+    request: Union[SingleEvaluationRequest, PairwiseComparisonRequest],
+) -> EvaluationResponse:
+    """
+    Run one item of a batch and capture its outcome.
+    
+    Args:
+        request: The evaluation or comparison request
+        
+    Returns:
+        Evaluation response with the result or the error message
+    """
+    evaluation_id = new_evaluation_id()
+    try:
+        async with batch_slots:
+            if isinstance(request, PairwiseComparisonRequest):
+                result = await run_pairwise_comparison(request, judge_batcher, prompt_manager, output_parser)
+            else:
+                result = await run_single_evaluation(request, judge_batcher, prompt_manager, output_parser)
+    except Exception as e:
+        return EvaluationResponse(
+            evaluation_id=evaluation_id,
+            status=TaskStatus.FAILED,
+            error_message=str(e),
+        )
+    
+    return EvaluationResponse(
+        evaluation_id=evaluation_id,
+        status=TaskStatus.COMPLETED,
+        result=result,
+    )
+
+
+@router.post("/batch", response_model=BatchEvaluationResponse)
+async def evaluate_batch(request: BatchEvaluationRequest) -> BatchEvaluationResponse:
+    """
+    Run several evaluations and pairwise comparisons in one round trip.
+    
+    Up to JUDGE_WORKERS items, counted across all batch requests, are sent to
+    vLLM before any of them is awaited, so the continuous batcher sees them
+    together and schedules them in the same step. A request holds at most
+    MAX_BATCH_ITEMS items. The call returns once every item has finished; a
+    failing item is reported with status FAILED and does not affect the others.
+    
+    Args:
+        request: The batch request
+        
+    Returns:
+        Batch response with one result per item, in request order
+    """
+    results = await asyncio.gather(*(process_batch_item(item) for item in request.items))
+    
+    return BatchEvaluationResponse(results=results)
+
+
 @router.get("/status/{evaluation_id}", response_model=EvaluationResponse)
-async def get_evaluation_status(evaluation_id: str) -> EvaluationResponse:
+async def get_evaluation_status(
+    evaluation_id: str,
+    consume: bool = False,
+    wait_ms: int = 0,
+) -> Union[EvaluationResponse, Response]:
     """
     Get the status of an evaluation task.
     
     Args:
         evaluation_id: ID of the evaluation task
+        consume: Remove the task once it has finished, for callers that will not ask again
+        wait_ms: Hold the request until the task finishes, for at most this many
+            milliseconds (capped at 30 seconds), so clients need not poll
         
     Returns:
         Evaluation response with current status and result if completed
@@ -284,17 +621,25 @@ async def get_evaluation_status(evaluation_id: str) -> EvaluationResponse:
     Raises:
         TaskNotFoundError: If the task is not found
     """
-    # Check if the task exists
-    if evaluation_id not in evaluation_tasks:
+    # Get the task
+    task = await task_store.wait(evaluation_id, min(max(wait_ms, 0), 30000) / 1000)
+    if task is None:
         raise TaskNotFoundError(evaluation_id)
     
-    # Get the task
-    task = evaluation_tasks[evaluation_id]
+    # Return the response; the task was built by this server, so skip validation
+    response = EvaluationResponse.model_construct(
+        evaluation_id=task.evaluation_id,
+        status=task.status,
+        result=task.result,
+        error_message=task.error_message,
+    )
+    if task.status not in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+        return response
     
-    # Return the response
-    return EvaluationResponse(
-        evaluation_id=task["evaluation_id"],
-        status=task["status"],
-        result=task["result"],
-        error_message=task["error_message"],
-    )
\ No newline at end of file
+    if consume:
+        await task_store.delete(evaluation_id)
+    
+    # A finished task no longer changes, so serialize it once for all polls
+    if task.response_json is None:
+        task.response_json = response.model_dump_json().encode()
+    return Response(content=task.response_json, media_type="application/json")
\ No newline at end of file
@@ -43,6 +43,12 @@ def main() -> None:
         action="store_true", 
         help="Enable auto-reload for development"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of server processes (ignored with --reload; more than one requires --task-store-url and makes templates read-only)"
+    )
     
     # vLLM connection options
     parser.add_argument(
@@ -63,6 +69,13 @@ def main() -> None:
         help="Path to the template storage file"
     )
     
+    # Task options
+    parser.add_argument(
+        "--task-store-url",
+        type=str,
+        help="Redis URL for sharing evaluation task state between workers (e.g., redis://localhost:6379/0)"
+    )
+    
     args = parser.parse_args()
     
     # Show version and exit if requested
@@ -80,9 +93,19 @@ def main() -> None:
     if args.template_storage_path:
         os.environ["TEMPLATE_STORAGE_PATH"] = args.template_storage_path
     
+    if args.task_store_url:
+        os.environ["TASK_STORE_URL"] = args.task_store_url
+        settings.TASK_STORE_URL = args.task_store_url
+    
+    # Each worker is a separate process, so they can only share tasks through Redis
+    workers = 1 if args.reload else args.workers
+    if workers > 1 and not settings.TASK_STORE_URL:
+        parser.error("--workers greater than 1 requires --task-store-url")
+    os.environ["SERVER_WORKERS"] = str(workers)
+    
     # Print configuration info
     print(f"Starting vLLM Judge v{get_version()}")
-    print(f"Server: {args.host}:{args.port}")
+    print(f"Server: {args.host}:{args.port} ({workers} worker{'s' if workers > 1 else ''})")
     print(f"vLLM API Base: {settings.VLLM_API_BASE}")
     print(f"Template Storage: {settings.TEMPLATE_STORAGE_PATH}")
     
@@ -92,6 +115,7 @@ def main() -> None:
         host=args.host,
         port=args.port,
         reload=args.reload,
+        workers=workers,
     )
 
 
@@ -1,19 +1,222 @@
+import asyncio
+import copy
+import functools
+import queue
+import re
+import threading
 import time
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable, Iterable, Iterator, Union
 
-import requests
+import httpx
+import orjson
 
 # Import components for direct mode
-from vllm_judge.services.prompt_manager import PromptManager
+from vllm_judge.services.prompt_manager import PromptManager, thaw_template
 from vllm_judge.services.output_parser import OutputParser
 from vllm_judge.services.sync_vllm_client import SyncVLLMClient
+from vllm_judge.services.completion_cache import CompletionCache
+from vllm_judge.services import http_pool
+from vllm_judge.core.errors import PromptTemplateError
 
 
 
 
+# Headers of server-mode requests whose bodies are encoded with orjson
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+async def _gather_bounded(awaitables: Iterable[Awaitable[Any]], max_concurrency: Optional[int]) -> List[Any]:
+    """Await several awaitables concurrently, at most max_concurrency at a time (None for no limit)."""
+    if not max_concurrency:
+        return await asyncio.gather(*awaitables)
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run(awaitable: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await awaitable
+    
+    return await asyncio.gather(*(run(awaitable) for awaitable in awaitables))
+
+
+class _BatchingDispatcher:
+    """
+    Collects direct-mode completion requests from caller threads into batches.
+    
+    Requests that arrive within a short window are sent to vLLM together, so
+    callers evaluating from many threads fill the same vLLM batch step instead
+    of trickling in one by one.
+    """
+    
+    def __init__(self, vllm_client: SyncVLLMClient, max_batch_size: int, max_wait_ms: float):
+        """
+        Initialize the dispatcher.
+        
+        Args:
+            vllm_client: Client used to send the batched requests
+            max_batch_size: Maximum number of requests sent together
+            max_wait_ms: Maximum time to wait for a batch to fill up, in milliseconds
+        """
+        self.vllm_client = vllm_client
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: "queue.Queue[Optional[Tuple[str, List[Dict[str, str]], Dict[str, Any], Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Send the requests already queued and stop the dispatcher thread."""
+        with self._thread_lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+    
+    def generate_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        sampling_params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Generate a completion as part of the next batch, blocking until it is done.
+        
+        Args:
+            model: Model ID to use
+            messages: List of message dictionaries
+            sampling_params: Parameters for sampling
+            
+        Returns:
+            Completion response
+        """
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="vllm-judge-batcher", daemon=True)
+                self._thread.start()
+        
+        future: Future = Future()
+        self._queue.put((model, messages, sampling_params, future))
+        return future.result()
+    
+    def _run(self) -> None:
+        """Collect queued requests into batches and send them, until close() queues None."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            
+            # Keep collecting until the batch is full or the wait time is up
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            # Only requests for the same model and sampling parameters share a call
+            groups: Dict[Tuple[str, bytes], List[Tuple[Any, ...]]] = {}
+            for item in batch:
+                model, _, sampling_params, _ = item
+                groups.setdefault((model, orjson.dumps(sampling_params, option=orjson.OPT_SORT_KEYS)), []).append(item)
+            
+            for items in groups.values():
+                self._send(items)
+    
+    def _send(self, items: List[Tuple[Any, ...]]) -> None:
+        """Send one group of requests without waiting, handing the responses back to the callers."""
+        model, _, sampling_params, _ = items[0]
+        responses = http_pool.submit(self.vllm_client.generate_completions_batch_async(
+            model=model,
+            messages_list=[messages for _, messages, _, _ in items],
+            sampling_params=sampling_params
+        ))
+        
+        def deliver(done: Future) -> None:
+            try:
+                results = done.result()
+            except Exception as e:
+                results = [e] * len(items)
+            for (_, _, _, future), result in zip(items, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        
+        responses.add_done_callback(deliver)
+
+
 class VLLMJudgeClient:
     """Client for the vLLM Judge adapter with hybrid mode support."""
     
+    # Attributes are looked up on every call, so keep them in slots
+    __slots__ = (
+        # Both modes
+        "direct_mode",
+        "timeout",
+        "async_transport",
+        "cache_size",
+        "completion_cache",
+        "_warmed_templates",
+        "_result_cache",
+        "_result_cache_lock",
+        # Direct mode
+        "vllm_client",
+        "prompt_manager",
+        "output_parser",
+        "_dispatcher",
+        # Server mode
+        "base_url",
+        "consume_results",
+        "_http",
+        "_url_eval_single",
+        "_url_eval_single_stream",
+        "_url_eval_pair",
+        "_url_eval_batch",
+        "_url_status",
+        "_url_templates",
+        "_url_template",
+        "_url_warmup",
+    )
+    
+    # max_tokens caps used by evaluate_batch to group items by output length:
+    # single labels, JSON scores, and free-form reasoning
+    OUTPUT_LENGTH_BINS = (16, 128, 512)
+    
+    # Maximum number of concurrent direct-mode requests sent to vLLM together
+    MAX_DIRECT_BATCH_SIZE = 16
+    
+    # Maximum number of items sent in one batch request to the server; the
+    # server's MAX_BATCH_ITEMS setting defaults to the same
+    MAX_SERVER_BATCH_ITEMS = 256
+    
+    # Fixed parts of the prompts used in direct mode when no template is given
+    _GENERIC_EVAL_SYSTEM = "You are an expert evaluator. Your task is to evaluate the provided content based on the given criteria."
+    _GENERIC_COMPARE_SYSTEM = "You are an expert evaluator. Your task is to compare two texts based on the given criteria."
+    _EVAL_INSTRUCTION = "Please evaluate the following content based on these criteria:\n\n"
+    _COMPARE_INSTRUCTION = "Please compare the following two texts based on these criteria:\n\n"
+    _REASONING_SUFFIX = "\n\nAfter your judgment, explain your reasoning on a new line starting with 'Reasoning:'"
+    _SAMPLES_INSTRUCTION = "\n\nFor each sample, output one line: '<sample number>: <judgment>'"
+    
+    # Request bodies whose texts together exceed this many characters are
+    # encoded and sent in pieces of _BODY_CHUNK_CHARS characters
+    _STREAM_BODY_THRESHOLD = 256 * 1024
+    _BODY_CHUNK_CHARS = 64 * 1024
+    
+    # One line of evaluate_texts output, e.g. "3: POSITIVE"
+    _SAMPLE_LINE_PATTERN = re.compile(r"^\s*(\d+)\s*:\s*(.+?)\s*$", re.MULTILINE)
+    
     def __init__(
         self, 
         base_url: Optional[str] = "http://localhost:8000/v1",
@@ -21,7 +224,12 @@ class VLLMJudgeClient:
         direct_mode: bool = False,
         vllm_api_base: Optional[str] = None,
         vllm_api_key: Optional[str] = None,
-        template_path: Optional[str] = None
+        template_path: Optional[str] = None,
+        async_transport: str = "httpx",
+        cache_size: int = 1024,
+        completion_cache: Optional[CompletionCache] = None,
+        batch_wait_ms: float = 0.0,
+        consume_results: bool = False
     ):
         """
         Initialize the client with options for both server and direct modes.
@@ -33,9 +241,30 @@ class VLLMJudgeClient:
             vllm_api_base: Base URL of the vLLM API (required for direct mode)
             vllm_api_key: API key for the vLLM API (optional)
             template_path: Path to template storage file (optional, for direct mode)
+            async_transport: HTTP transport for the concurrent batch methods, "httpx" or "aiohttp"
+            cache_size: Maximum number of completed results to reuse for identical temperature-0 requests (0 disables caching)
+            completion_cache: Cache of judge completions, e.g. LRUCache or DiskCache (optional, for direct mode)
+            batch_wait_ms: Time to collect concurrent direct-mode requests into one batch, in milliseconds (0, the default, disables batching)
+            consume_results: Remove finished tasks from the server once waited-for results are fetched, so later get_status calls for them fail (for server mode)
         """
+        if async_transport not in ("httpx", "aiohttp"):
+            raise ValueError(f"Unsupported async_transport: {async_transport}")
+        
         self.direct_mode = direct_mode
         self.timeout = timeout
+        self.async_transport = async_transport
+        
+        # (template_id, judge_model_id) pairs whose prefix is already cached by vLLM
+        self._warmed_templates = set()
+        
+        # LRU cache of completed results: cache key -> (template_id, result)
+        self.cache_size = cache_size
+        self._result_cache: "OrderedDict[str, Tuple[Optional[str], Dict[str, Any]]]" = OrderedDict()
+        # Batch calls fill the cache from the shared HTTP event loop thread
+        self._result_cache_lock = threading.Lock()
+        
+        # Completions of deterministic direct-mode requests, by prompt and parameters
+        self.completion_cache = completion_cache
         
         if direct_mode:
             if not vllm_api_base:
@@ -49,6 +278,20 @@ class VLLMJudgeClient:
             )
             self.prompt_manager = PromptManager(template_path)
             self.output_parser = OutputParser()
+            
+            # Compile the parser rules of the stored templates now, not on their
+            # first evaluation; invalid ones are reported when they are used
+            for template in self.prompt_manager.template_snapshot.values():
+                try:
+                    self.output_parser.compile_rules(template.get("output_parser_rules"))
+                except PromptTemplateError:
+                    pass
+            
+            # Batches completions requested from several threads at once
+            self._dispatcher = (
+                _BatchingDispatcher(self.vllm_client, self.MAX_DIRECT_BATCH_SIZE, batch_wait_ms)
+                if batch_wait_ms > 0 else None
+            )
         else:
             # Server mode configuration
             if base_url is None:
@@ -57,6 +300,46 @@ class VLLMJudgeClient:
             self.base_url = base_url.rstrip("/")
             if not self.base_url.endswith("/v1"):
                 self.base_url = f"{self.base_url}/v1"
+            self.consume_results = consume_results
+            
+            # Endpoint URLs, built once instead of on every call
+            self._url_eval_single = f"{self.base_url}/evaluate/single_response"
+            self._url_eval_single_stream = f"{self.base_url}/evaluate/single_response/stream"
+            self._url_eval_pair = f"{self.base_url}/evaluate/pairwise_comparison"
+            self._url_eval_batch = f"{self.base_url}/evaluate/batch"
+            self._url_status = f"{self.base_url}/evaluate/status/"
+            self._url_templates = f"{self.base_url}/config/judge_templates"
+            self._url_template = f"{self.base_url}/config/judge_templates/"
+            self._url_warmup = f"{self.base_url}/config/warmup"
+            
+            # Reuse connections to the adapter across calls instead of opening
+            # a new one for every request and status poll; over HTTPS with the
+            # http2 extra, concurrent calls share one multiplexed connection
+            self._http = httpx.Client(
+                timeout=httpx.Timeout(self.timeout),
+                transport=httpx.HTTPTransport(
+                    http2=http_pool.HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                    # Retry failed connection attempts; sent requests are never retried
+                    retries=3
+                )
+            )
+    
+    def close(self) -> None:
+        """Close the connections held by the client and write pending template changes."""
+        if self.direct_mode:
+            self.prompt_manager.flush()
+            if self._dispatcher is not None:
+                self._dispatcher.close()
+            self.vllm_client.close()
+        else:
+            self._http.close()
+    
+    def __enter__(self) -> "VLLMJudgeClient":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
     
     def evaluate_text(
         self,
@@ -89,8 +372,22 @@ class VLLMJudgeClient:
         Returns:
             Evaluation response
         """
+        cache_key = self._result_cache_key({
+            "text": text,
+            "evaluation_criteria": evaluation_criteria,
+            "judge_model_id": judge_model_id,
+            "prompt_template_id": prompt_template_id,
+            "custom_prompt_segments": custom_prompt_segments,
+            "output_format_instruction": output_format_instruction,
+            "sampling_params": sampling_params,
+            "provide_reasoning": provide_reasoning
+        })
+        cached_result = self._get_cached_result(cache_key)
+        if cached_result is not None:
+            return cached_result
+        
         if self.direct_mode:
-            return self._evaluate_text_direct(
+            result = self._evaluate_text_direct(
                 text=text,
                 evaluation_criteria=evaluation_criteria,
                 judge_model_id=judge_model_id,
@@ -101,7 +398,7 @@ class VLLMJudgeClient:
                 provide_reasoning=provide_reasoning
             )
         else:
-            return self._evaluate_text_server(
+            result = self._evaluate_text_server(
                 text=text,
                 evaluation_criteria=evaluation_criteria,
                 judge_model_id=judge_model_id,
@@ -113,15 +410,170 @@ class VLLMJudgeClient:
                 wait=wait,
                 timeout=timeout
             )
+        
+        self._cache_result(cache_key, prompt_template_id, result)
+        return result
+    
+    def evaluate_text_stream(
+        self,
+        text: str,
+        evaluation_criteria: str,
+        judge_model_id: str,
+        prompt_template_id: Optional[str] = None,
+        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        output_format_instruction: Optional[str] = None,
+        sampling_params: Optional[Dict[str, Any]] = None,
+        provide_reasoning: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Evaluate a single text, streaming the judge's output as it is generated.
+        
+        Long outputs such as JSON scores with reasoning can be displayed or
+        processed while the judge is still generating. For binary templates the
+        generation is stopped as soon as the judgment can no longer change.
+        
+        Args:
+            text: The text to evaluate
+            evaluation_criteria: Criteria for the evaluation
+            judge_model_id: ID of the model to use as judge
+            prompt_template_id: ID of the prompt template to use (optional)
+            custom_prompt_segments: Custom segments for the prompt (optional)
+            output_format_instruction: Instructions for output format (optional)
+            sampling_params: Parameters for vLLM sampling (optional)
+            provide_reasoning: Whether to request reasoning
+            
+        Yields:
+            {"delta": ...} dicts with each piece of generated text, followed by
+            the evaluation response, in the same format as evaluate_text
+        """
+        cache_key = self._result_cache_key({
+            "text": text,
+            "evaluation_criteria": evaluation_criteria,
+            "judge_model_id": judge_model_id,
+            "prompt_template_id": prompt_template_id,
+            "custom_prompt_segments": custom_prompt_segments,
+            "output_format_instruction": output_format_instruction,
+            "sampling_params": sampling_params,
+            "provide_reasoning": provide_reasoning
+        })
+        cached_result = self._get_cached_result(cache_key)
+        if cached_result is not None:
+            yield cached_result
+            return
+        
+        if self.direct_mode:
+            events = self._evaluate_text_stream_direct(
+                text=text,
+                evaluation_criteria=evaluation_criteria,
+                judge_model_id=judge_model_id,
+                prompt_template_id=prompt_template_id,
+                custom_prompt_segments=custom_prompt_segments,
+                output_format_instruction=output_format_instruction,
+                sampling_params=sampling_params,
+                provide_reasoning=provide_reasoning
+            )
+        else:
+            events = self._evaluate_text_stream_server(
+                payload=self._evaluation_payload(
+                    text=text,
+                    evaluation_criteria=evaluation_criteria,
+                    judge_model_id=judge_model_id,
+                    prompt_template_id=prompt_template_id,
+                    custom_prompt_segments=custom_prompt_segments,
+                    output_format_instruction=output_format_instruction,
+                    sampling_params=sampling_params,
+                    provide_reasoning=provide_reasoning
+                )
+            )
+        
+        for event in events:
+            if "delta" not in event:
+                self._cache_result(cache_key, prompt_template_id, event)
+            yield event
+    
+    def _evaluate_text_stream_direct(
+        self,
+        text: str,
+        evaluation_criteria: str,
+        judge_model_id: str,
+        prompt_template_id: Optional[str] = None,
+        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        output_format_instruction: Optional[str] = None,
+        sampling_params: Optional[Dict[str, Any]] = None,
+        provide_reasoning: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """Direct mode implementation of evaluate_text_stream."""
+        messages, parser_rules = self._build_evaluation_messages(
+            text=text,
+            evaluation_criteria=evaluation_criteria,
+            prompt_template_id=prompt_template_id,
+            custom_prompt_segments=custom_prompt_segments,
+            output_format_instruction=output_format_instruction,
+            provide_reasoning=provide_reasoning
+        )
+        
+        raw_output = ""
+        deltas = self.vllm_client.stream_completion(
+            model=judge_model_id,
+            messages=messages,
+            sampling_params=sampling_params or {}
+        )
+        try:
+            for delta in deltas:
+                raw_output += delta
+                yield {"delta": delta}
+                # Parser rules are only applied when a template is used
+                if prompt_template_id and self.output_parser.is_decided(raw_output, parser_rules, provide_reasoning):
+                    break
+        finally:
+            # Closing the stream makes vLLM abort the remaining generation
+            deltas.close()
+        
+        yield self._build_direct_result(
+            raw_output=raw_output,
+            parse=self.output_parser.parse_single_evaluation,
+            prompt_template_id=prompt_template_id,
+            parser_rules=parser_rules,
+            provide_reasoning=provide_reasoning
+        )
+    
+    def _evaluate_text_stream_server(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Server mode implementation of evaluate_text_stream."""
+        try:
+            with self._http.stream(
+                "POST",
+                self._url_eval_single_stream,
+                content=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout
+            ) as response:
+                # Check for errors
+                if response.status_code != 200:
+                    response.read()
+                    raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
+                
+                for line in response.iter_lines():
+                    if not line or not line.startswith("data:"):
+                        continue
+                    
+                    event = orjson.loads(line[len("data:"):])
+                    if event.get("status") == "FAILED":
+                        raise VLLMJudgeError(f"Evaluation failed: {event.get('error_message')}")
+                    yield event
+        except httpx.HTTPError as e:
+            raise VLLMJudgeError(f"Network error: {str(e)}")
     
     def _clean_output(self, output: str) -> str:
-        return output.removeprefix("```json").removeprefix("```").removesuffix("```")
+        # Most judge outputs are not fenced, so skip the work for them
+        if not (output.startswith("```") or output.endswith("```")):
+            return output
+        return output.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
     
     def _extract_reasoning(self, output: str) -> str:
-        paragraphs = output.split("\n")
-        if len(paragraphs) > 1:
-            return "\n".join(paragraphs[1:]).strip().removeprefix("Reasoning:").strip()
-        return ""
+        _, newline, rest = output.partition("\n")
+        if not newline:
+            return ""
+        return rest.strip().removeprefix("Reasoning:").strip()
 
 
     def _evaluate_text_direct(
@@ -136,6 +588,45 @@ class VLLMJudgeClient:
         provide_reasoning: bool = False
     ) -> Dict[str, Any]:
         """Direct mode implementation of evaluate_text."""
+        messages, parser_rules = self._build_evaluation_messages(
+            text=text,
+            evaluation_criteria=evaluation_criteria,
+            prompt_template_id=prompt_template_id,
+            custom_prompt_segments=custom_prompt_segments,
+            output_format_instruction=output_format_instruction,
+            provide_reasoning=provide_reasoning
+        )
+        
+        # A binary judgment is fixed once a positive pattern appears, and a
+        # rating once its line is complete, so stream the output and stop the
+        # generation there
+        is_decided = None
+        if prompt_template_id and parser_rules and parser_rules.get("type") in ("binary", "numeric") and not provide_reasoning:
+            is_decided = functools.partial(self.output_parser.is_decided, parser_rules=parser_rules)
+        
+        # Call vLLM directly using our synchronous client
+        completion_response = self._generate_completion(
+            judge_model_id, messages, sampling_params or {}, is_decided=is_decided
+        )
+        
+        return self._build_direct_result(
+            raw_output=completion_response["choices"][0]["message"]["content"],
+            parse=self.output_parser.parse_single_evaluation,
+            prompt_template_id=prompt_template_id,
+            parser_rules=parser_rules,
+            provide_reasoning=provide_reasoning
+        )
+    
+    def _build_evaluation_messages(
+        self,
+        text: str,
+        evaluation_criteria: str,
+        prompt_template_id: Optional[str] = None,
+        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        output_format_instruction: Optional[str] = None,
+        provide_reasoning: bool = False
+    ) -> Tuple[List[Dict[str, str]], Optional[Dict[str, Any]]]:
+        """Build the chat messages and parser rules for a direct mode evaluation."""
         # If a template is explicitly requested, use it
         if prompt_template_id:
             # Generate the prompt using the specified template
@@ -149,32 +640,30 @@ class VLLMJudgeClient:
             )
             
             # Get parser rules if a template was used
-            parser_rules = None
-            try:
-                template = self.prompt_manager.get_template(prompt_template_id)
-                parser_rules = template.get("output_parser_rules")
-            except Exception:
-                pass
+            parser_rules = self.prompt_manager.get_parser_rules(prompt_template_id)
         else:
             # No template specified - use a generic approach
             # Create system message
-            system_message = "You are an expert evaluator. Your task is to evaluate the provided content based on the given criteria."
+            system_message = self._GENERIC_EVAL_SYSTEM
             
             # Override with custom if provided
             if custom_prompt_segments and custom_prompt_segments.get("system_message"):
                 system_message = custom_prompt_segments.get("system_message")
             
-            # Create user message
-            user_message = f"Please evaluate the following content based on these criteria:\n\n{evaluation_criteria}\n\nContent to evaluate:\n\n{text}"
+            # Create user message; the instructions, which repeat across calls,
+            # come before the content so vLLM can reuse their cached prefix
+            parts = [self._EVAL_INSTRUCTION, evaluation_criteria]
+            
+            # Add output format instruction if provided
+            if output_format_instruction:
+                parts += ("\n\n", output_format_instruction)
             
             # Add reasoning request if needed
             if provide_reasoning:
-                reasoning_request = "\n\nThen, on a new line, explain your reasoning starting with 'Reasoning:'"
-                user_message += reasoning_request
+                parts.append(self._REASONING_SUFFIX)
             
-            # Add output format instruction if provided
-            if output_format_instruction:
-                user_message += f"\n\n{output_format_instruction}"
+            parts += ("\n\nContent to evaluate:\n\n", text)
+            user_message = "".join(parts)
             
             # Create messages list
             messages = [
@@ -185,23 +674,23 @@ class VLLMJudgeClient:
             # No specific parser rules in generic mode
             parser_rules = None
         
-        # Prepare sampling parameters
-        vllm_params = sampling_params or {}
-        
-        # Call vLLM directly using our synchronous client
-        completion_response = self.vllm_client.generate_completion(
-            model=judge_model_id,
-            messages=messages,
-            sampling_params=vllm_params
-        )
-        
-        # Extract the raw output from the completion
-        raw_output = self._clean_output(completion_response["choices"][0]["message"]["content"])
+        return messages, parser_rules
+    
+    def _build_direct_result(
+        self,
+        raw_output: str,
+        parse,
+        prompt_template_id: Optional[str],
+        parser_rules: Optional[Dict[str, Any]],
+        provide_reasoning: bool
+    ) -> Dict[str, Any]:
+        """Turn the judge's output into a response matching the server response format."""
+        raw_output = self._clean_output(raw_output)
         
         # Parse the output based on whether we're using a template or not
         if prompt_template_id and parser_rules:
             # Use structured parsing if we have a template and rules
-            parsed_result = self.output_parser.parse_single_evaluation(
+            parsed_result = parse(
                 raw_output=raw_output,
                 template_id=prompt_template_id,
                 parser_rules=parser_rules,
@@ -217,7 +706,7 @@ class VLLMJudgeClient:
             
             # If reasoning was requested, try to extract it, but don't rely on specific formats
             if provide_reasoning:
-                judgment = raw_output.split("\n")[0].strip()
+                judgment = raw_output.partition("\n")[0].strip()
                 reasoning = self._extract_reasoning(raw_output)
         
         # Format the result to match the server response format
@@ -245,30 +734,317 @@ class VLLMJudgeClient:
         timeout: Optional[int] = None
     ) -> Dict[str, Any]:
         """Server mode implementation of evaluate_text."""
-        # Build the request payload
-        payload = {
+        payload = self._evaluation_payload(
+            text=text,
+            evaluation_criteria=evaluation_criteria,
+            judge_model_id=judge_model_id,
+            prompt_template_id=prompt_template_id,
+            custom_prompt_segments=custom_prompt_segments,
+            output_format_instruction=output_format_instruction,
+            sampling_params=sampling_params,
+            provide_reasoning=provide_reasoning
+        )
+        
+        # Send the request
+        response = self._http.post(
+            self._url_eval_single,
+            content=self._json_body(payload, ("text_to_evaluate",)),
+            headers=_JSON_HEADERS,
+            timeout=self.timeout
+        )
+        
+        # Check for errors
+        if response.status_code != 200:
+            raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
+        
+        # Parse the response
+        task_data = orjson.loads(response.content)
+        evaluation_id = task_data["evaluation_id"]
+        
+        # Return immediately if not waiting
+        if not wait:
+            return task_data
+        
+        # Wait for the result
+        return self._wait_for_result(evaluation_id, timeout or self.timeout)
+    
+    def _json_body(self, payload: Dict[str, Any], text_fields: Tuple[str, ...]) -> Union[bytes, Iterator[bytes]]:
+        """
+        Encode a request payload, streaming it if its texts are large.
+        
+        Small payloads are encoded in one go. For large ones, the text fields
+        are encoded piece by piece as the body is sent with chunked transfer
+        encoding, so the whole encoded body is never held in memory.
+        
+        Args:
+            payload: The request payload
+            text_fields: Names of the payload's string fields that may be large
+            
+        Returns:
+            The encoded body, or an iterator over its pieces
+        """
+        if sum(len(payload[name]) for name in text_fields) <= self._STREAM_BODY_THRESHOLD:
+            return orjson.dumps(payload)
+        return self._iter_json_body(payload, text_fields)
+    
+    def _iter_json_body(self, payload: Dict[str, Any], text_fields: Tuple[str, ...]) -> Iterator[bytes]:
+        """Yield the JSON encoding of a payload, encoding its text fields piece by piece."""
+        rest = {name: value for name, value in payload.items() if name not in text_fields}
+        
+        # Open the object with the other fields, then add the texts
+        yield orjson.dumps(rest)[:-1]
+        separator = b"," if rest else b""
+        for name in text_fields:
+            yield separator + orjson.dumps(name) + b':"'
+            text = payload[name]
+            for start in range(0, len(text), self._BODY_CHUNK_CHARS):
+                # Each piece is encoded as a string on its own, without its quotes
+                yield orjson.dumps(text[start:start + self._BODY_CHUNK_CHARS])[1:-1]
+            yield b'"'
+            separator = b","
+        yield b"}"
+    
+    def _evaluation_payload(
+        self,
+        text: str,
+        evaluation_criteria: str,
+        judge_model_id: str,
+        prompt_template_id: Optional[str] = None,
+        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        output_format_instruction: Optional[str] = None,
+        sampling_params: Optional[Dict[str, Any]] = None,
+        provide_reasoning: bool = False
+    ) -> Dict[str, Any]:
+        """Build the request payload for the single_response endpoint."""
+        optional = {
+            "prompt_template_id": prompt_template_id,
+            "custom_prompt_segments": custom_prompt_segments,
+            "output_format_instruction": output_format_instruction,
+            "vllm_sampling_params": sampling_params
+        }
+        
+        # Unset optional fields are left out
+        return {
             "judge_model_id": judge_model_id,
             "text_to_evaluate": text,
             "evaluation_criteria": evaluation_criteria,
-            "provide_reasoning": provide_reasoning
+            "provide_reasoning": provide_reasoning,
+            **{name: value for name, value in optional.items() if value}
         }
+    
+    def compare_texts(
+        self,
+        text_A: str,
+        text_B: str,
+        comparison_criteria: str,
+        judge_model_id: str,
+        prompt_template_id: Optional[str] = None,
+        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        output_format_instruction: Optional[str] = None,
+        sampling_params: Optional[Dict[str, Any]] = None,
+        provide_reasoning: bool = False,
+        wait: bool = True,
+        timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare two texts based on the provided criteria.
         
-        if prompt_template_id:
-            payload["prompt_template_id"] = prompt_template_id
+        Args:
+            text_A: First text to compare
+            text_B: Second text to compare
+            comparison_criteria: Criteria for the comparison
+            judge_model_id: ID of the model to use as judge
+            prompt_template_id: ID of the prompt template to use (optional)
+            custom_prompt_segments: Custom segments for the prompt (optional)
+            output_format_instruction: Instructions for output format (optional)
+            sampling_params: Parameters for vLLM sampling (optional)
+            provide_reasoning: Whether to request reasoning
+            wait: Whether to wait for the result (only for server mode)
+            timeout: Timeout in seconds (only used if wait is True)
+            
+        Returns:
+            Comparison response
+        """
+        cache_key = self._result_cache_key({
+            "text_A": text_A,
+            "text_B": text_B,
+            "comparison_criteria": comparison_criteria,
+            "judge_model_id": judge_model_id,
+            "prompt_template_id": prompt_template_id,
+            "custom_prompt_segments": custom_prompt_segments,
+            "output_format_instruction": output_format_instruction,
+            "sampling_params": sampling_params,
+            "provide_reasoning": provide_reasoning
+        })
+        cached_result = self._get_cached_result(cache_key)
+        if cached_result is not None:
+            return cached_result
         
-        if custom_prompt_segments:
-            payload["custom_prompt_segments"] = custom_prompt_segments
+        if self.direct_mode:
+            result = self._compare_texts_direct(
+                text_A=text_A,
+                text_B=text_B,
+                comparison_criteria=comparison_criteria,
+                judge_model_id=judge_model_id,
+                prompt_template_id=prompt_template_id,
+                custom_prompt_segments=custom_prompt_segments,
+                output_format_instruction=output_format_instruction,
+                sampling_params=sampling_params,
+                provide_reasoning=provide_reasoning
+            )
+        else:
+            result = self._compare_texts_server(
+                text_A=text_A,
+                text_B=text_B,
+                comparison_criteria=comparison_criteria,
+                judge_model_id=judge_model_id,
+                prompt_template_id=prompt_template_id,
+                custom_prompt_segments=custom_prompt_segments,
+                output_format_instruction=output_format_instruction,
+                sampling_params=sampling_params,
+                provide_reasoning=provide_reasoning,
+                wait=wait,
+                timeout=timeout
+            )
         
-        if output_format_instruction:
-            payload["output_format_instruction"] = output_format_instruction
+        self._cache_result(cache_key, prompt_template_id, result)
+        return result
+    
+    def _compare_texts_direct(
+        self,
+        text_A: str,
+        text_B: str,
+        comparison_criteria: str,
+        judge_model_id: str,
+        prompt_template_id: Optional[str] = None,
+        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        output_format_instruction: Optional[str] = None,
+        sampling_params: Optional[Dict[str, Any]] = None,
+        provide_reasoning: bool = False
+    ) -> Dict[str, Any]:
+        """Direct mode implementation of compare_texts."""
+        messages, parser_rules = self._build_comparison_messages(
+            text_A=text_A,
+            text_B=text_B,
+            comparison_criteria=comparison_criteria,
+            prompt_template_id=prompt_template_id,
+            custom_prompt_segments=custom_prompt_segments,
+            output_format_instruction=output_format_instruction,
+            provide_reasoning=provide_reasoning
+        )
+        
+        # The first preference match wins, so stream the output and stop the
+        # generation once it has appeared
+        is_decided = None
+        if prompt_template_id and parser_rules and parser_rules.get("type") == "preference" and not provide_reasoning:
+            is_decided = functools.partial(self.output_parser.is_comparison_decided, parser_rules=parser_rules)
+        
+        # Call vLLM directly using synchronous client
+        completion_response = self._generate_completion(
+            judge_model_id, messages, sampling_params or {}, is_decided=is_decided
+        )
+        
+        return self._build_direct_result(
+            raw_output=completion_response["choices"][0]["message"]["content"],
+            parse=self.output_parser.parse_pairwise_comparison,
+            prompt_template_id=prompt_template_id,
+            parser_rules=parser_rules,
+            provide_reasoning=provide_reasoning
+        )
+    
+    def _build_comparison_messages(
+        self,
+        text_A: str,
+        text_B: str,
+        comparison_criteria: str,
+        prompt_template_id: Optional[str] = None,
+        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        output_format_instruction: Optional[str] = None,
+        provide_reasoning: bool = False
+    ) -> Tuple[List[Dict[str, str]], Optional[Dict[str, Any]]]:
+        """Build the chat messages and parser rules for a direct mode comparison."""
+        # If a template is explicitly requested, use it
+        if prompt_template_id:
+            # Generate the prompt using the specified template
+            messages = self.prompt_manager.generate_pairwise_comparison_prompt(
+                text_A=text_A,
+                text_B=text_B,
+                comparison_criteria=comparison_criteria,
+                prompt_template_id=prompt_template_id,
+                custom_prompt_segments=custom_prompt_segments,
+                output_format_instruction=output_format_instruction,
+                provide_reasoning=provide_reasoning
+            )
+            
+            # Get parser rules if a template was used
+            parser_rules = self.prompt_manager.get_parser_rules(prompt_template_id)
+        else:
+            # No template specified - use a generic approach
+            # Create system message
+            system_message = self._GENERIC_COMPARE_SYSTEM
+            
+            # Override with custom if provided
+            if custom_prompt_segments and custom_prompt_segments.get("system_message"):
+                system_message = custom_prompt_segments.get("system_message")
+            
+            # Create user message; the instructions, which repeat across calls,
+            # come before the texts so vLLM can reuse their cached prefix
+            parts = [self._COMPARE_INSTRUCTION, comparison_criteria]
+            
+            # Add output format instruction if provided
+            if output_format_instruction:
+                parts += ("\n\n", output_format_instruction)
+            
+            # Add reasoning request if needed
+            if provide_reasoning:
+                parts.append(self._REASONING_SUFFIX)
+            
+            parts += ("\n\nText A:\n\n", text_A, "\n\nText B:\n\n", text_B)
+            user_message = "".join(parts)
+            
+            # Create messages list
+            messages = [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_message}
+            ]
+            
+            # No specific parser rules in generic mode
+            parser_rules = None
         
-        if sampling_params:
-            payload["vllm_sampling_params"] = sampling_params
+        return messages, parser_rules
+    
+    def _compare_texts_server(
+        self,
+        text_A: str,
+        text_B: str,
+        comparison_criteria: str,
+        judge_model_id: str,
+        prompt_template_id: Optional[str] = None,
+        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        output_format_instruction: Optional[str] = None,
+        sampling_params: Optional[Dict[str, Any]] = None,
+        provide_reasoning: bool = False,
+        wait: bool = True,
+        timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Server mode implementation of compare_texts."""
+        payload = self._comparison_payload(
+            text_A=text_A,
+            text_B=text_B,
+            comparison_criteria=comparison_criteria,
+            judge_model_id=judge_model_id,
+            prompt_template_id=prompt_template_id,
+            custom_prompt_segments=custom_prompt_segments,
+            output_format_instruction=output_format_instruction,
+            sampling_params=sampling_params,
+            provide_reasoning=provide_reasoning
+        )
         
         # Send the request
-        response = requests.post(
-            f"{self.base_url}/evaluate/single_response",
-            json=payload,
+        response = self._http.post(
+            self._url_eval_pair,
+            content=self._json_body(payload, ("text_A", "text_B")),
+            headers=_JSON_HEADERS,
             timeout=self.timeout
         )
         
@@ -277,7 +1053,7 @@ class VLLMJudgeClient:
             raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
         
         # Parse the response
-        task_data = response.json()
+        task_data = orjson.loads(response.content)
         evaluation_id = task_data["evaluation_id"]
         
         # Return immediately if not waiting
@@ -287,11 +1063,434 @@ class VLLMJudgeClient:
         # Wait for the result
         return self._wait_for_result(evaluation_id, timeout or self.timeout)
     
-    def compare_texts(
+    def _comparison_payload(
+        self,
+        text_A: str,
+        text_B: str,
+        comparison_criteria: str,
+        judge_model_id: str,
+        prompt_template_id: Optional[str] = None,
+        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        output_format_instruction: Optional[str] = None,
+        sampling_params: Optional[Dict[str, Any]] = None,
+        provide_reasoning: bool = False
+    ) -> Dict[str, Any]:
+        """Build the request payload for the pairwise_comparison endpoint."""
+        optional = {
+            "prompt_template_id": prompt_template_id,
+            "custom_prompt_segments": custom_prompt_segments,
+            "output_format_instruction": output_format_instruction,
+            "vllm_sampling_params": sampling_params
+        }
+        
+        # Unset optional fields are left out
+        return {
+            "judge_model_id": judge_model_id,
+            "text_A": text_A,
+            "text_B": text_B,
+            "comparison_criteria": comparison_criteria,
+            "provide_reasoning": provide_reasoning,
+            **{name: value for name, value in optional.items() if value}
+        }
+    
+    def evaluate_batch(
+        self,
+        items: List[Dict[str, Any]],
+        timeout: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several evaluations and comparisons in a single call.
+        
+        Items are grouped by their expected output length (see
+        OUTPUT_LENGTH_BINS) and the groups are submitted concurrently, so short
+        label-only judgments are not held up by long reasoning or JSON outputs.
+        Items without an explicit max_tokens get their group's cap, which keeps
+        vLLM from reserving KV cache space for tokens they will never generate.
+        
+        In server mode each group is sent in one request to the batch endpoint,
+        which submits it to vLLM in a single scheduling step. In direct mode the
+        items are sent to vLLM concurrently.
+        
+        A failing item does not abort the batch; its response has status
+        "FAILED" and an "error_message" instead of a result.
+        
+        Args:
+            items: List of evaluations and comparisons. Each is a dict of keyword
+                arguments accepted by evaluate_text, or by compare_texts if it
+                contains "text_A" (the wait and timeout arguments are not allowed)
+            timeout: Timeout in seconds for the whole batch
+            
+        Returns:
+            List of evaluation responses, in the same order as items
+        """
+        return http_pool.run(self._gather_with_cache(
+            items, lambda misses: self._bin_and_submit(misses, timeout)
+        ))
+    
+    def map(
+        self,
+        fn: Callable[["VLLMJudgeClient", Any], Any],
+        items: Iterable[Any],
+        max_workers: int = 64
+    ) -> List[Any]:
+        """
+        Call a blocking function for every item from a pool of threads.
+        
+        This runs existing synchronous code, such as the utility functions,
+        concurrently without rewriting it for asyncio. Each call is made as
+        fn(client, item); the threads spend their time waiting on the network,
+        so throughput scales with max_workers until the judge model saturates.
+        
+        Args:
+            fn: Function called with this client and one item, e.g. detect_toxicity
+                or a functools.partial of it
+            items: Items to pass to fn
+            max_workers: Maximum number of calls in flight at once
+            
+        Returns:
+            List of results, in the same order as items
+        """
+        items = list(items)
+        if not items:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(lambda item: fn(self, item), items))
+    
+    def evaluate_texts(
+        self,
+        texts: List[str],
+        evaluation_criteria: str,
+        judge_model_id: str,
+        batch_size: int = 10,
+        output_format_instruction: Optional[str] = None,
+        sampling_params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate several texts against the same criteria, judging up to batch_size of them per model call.
+        
+        Each call lists its texts as numbered samples after the criteria and
+        asks the judge for one "<sample number>: <judgment>" line per sample,
+        so the criteria and instructions are sent once per batch instead of
+        once per text. The batches are sent concurrently.
+        
+        A text whose line is missing from the judge's output gets a response
+        with status "FAILED" and an "error_message" instead of a result.
+        
+        Args:
+            texts: The texts to evaluate
+            evaluation_criteria: Criteria for the evaluation
+            judge_model_id: ID of the model to use as judge
+            batch_size: Maximum number of texts judged in one model call
+            output_format_instruction: Instructions for the format of each judgment (optional)
+            sampling_params: Parameters for vLLM sampling (optional)
+            
+        Returns:
+            List of evaluation responses, in the same order as texts
+            
+        Raises:
+            ValueError: If using server mode
+        """
+        if not self.direct_mode:
+            raise ValueError("evaluate_texts is only available in direct mode")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        if not batches:
+            return []
+        
+        def evaluate(batch: List[str]) -> List[Dict[str, Any]]:
+            return self._evaluate_texts_batch(
+                batch, evaluation_criteria, judge_model_id, output_format_instruction, sampling_params
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(64, len(batches))) as executor:
+            return [result for results in executor.map(evaluate, batches) for result in results]
+    
+    def _evaluate_texts_batch(
+        self,
+        texts: List[str],
+        evaluation_criteria: str,
+        judge_model_id: str,
+        output_format_instruction: Optional[str],
+        sampling_params: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Judge one batch of evaluate_texts in a single model call."""
+        parts = [self._EVAL_INSTRUCTION, evaluation_criteria]
+        if output_format_instruction:
+            parts += ("\n\n", output_format_instruction)
+        parts.append(self._SAMPLES_INSTRUCTION)
+        for number, text in enumerate(texts, 1):
+            parts += (f"\n\nSample {number}:\n", text)
+        
+        messages = [
+            {"role": "system", "content": self._GENERIC_EVAL_SYSTEM},
+            {"role": "user", "content": "".join(parts)}
+        ]
+        completion_response = self._generate_completion(judge_model_id, messages, sampling_params or {})
+        raw_output = self._clean_output(completion_response["choices"][0]["message"]["content"])
+        
+        # The first line for a sample wins if the judge repeats itself
+        judgments: Dict[int, str] = {}
+        for number, judgment in self._SAMPLE_LINE_PATTERN.findall(raw_output):
+            judgments.setdefault(int(number), judgment)
+        
+        results = []
+        for number in range(1, len(texts) + 1):
+            if number in judgments:
+                results.append({
+                    "evaluation_id": "direct-mode",
+                    "status": "COMPLETED",
+                    "result": {
+                        "judgment": judgments[number],
+                        "raw_judge_output": raw_output,
+                        "reasoning": None
+                    }
+                })
+            else:
+                results.append({
+                    "evaluation_id": "direct-mode",
+                    "status": "FAILED",
+                    "error_message": f"The judge output has no line for sample {number}"
+                })
+        return results
+    
+    def _estimate_max_tokens(self, item: Dict[str, Any]) -> int:
+        """Estimate how many tokens the judge will generate for a batch item."""
+        sampling_params = item.get("sampling_params") or {}
+        if sampling_params.get("max_tokens"):
+            return sampling_params["max_tokens"]
+        
+        output_format_instruction = item.get("output_format_instruction")
+        if item.get("provide_reasoning") or not output_format_instruction:
+            # Free-form output: assume the longest bin
+            return self.OUTPUT_LENGTH_BINS[-1]
+        if "json" in output_format_instruction.lower():
+            return self.OUTPUT_LENGTH_BINS[1]
+        return self.OUTPUT_LENGTH_BINS[0]
+    
+    async def _bin_and_submit(
+        self,
+        items: List[Dict[str, Any]],
+        timeout: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Group items by expected output length and submit the groups concurrently."""
+        bins: Dict[Optional[int], List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, item in enumerate(items):
+            max_tokens = self._estimate_max_tokens(item)
+            # Items asking for more than the largest cap share an uncapped bin
+            cap = next((c for c in self.OUTPUT_LENGTH_BINS if max_tokens <= c), None)
+            
+            sampling_params = item.get("sampling_params") or {}
+            if cap is not None and not sampling_params.get("max_tokens"):
+                item = {**item, "sampling_params": {**sampling_params, "max_tokens": cap}}
+            bins.setdefault(cap, []).append((index, item))
+        
+        http_client = http_pool.get_client(self.async_transport)
+        bin_results = await asyncio.gather(
+            *(self._submit_bin_async(http_client, [item for _, item in entries], timeout)
+              for entries in bins.values())
+        )
+        
+        # Restore the original item order
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        for entries, responses in zip(bins.values(), bin_results):
+            for (index, _), response in zip(entries, responses):
+                results[index] = response
+        return results
+    
+    async def _submit_bin_async(
+        self,
+        http_client: httpx.AsyncClient,
+        items: List[Dict[str, Any]],
+        timeout: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Submit one bin of batch items."""
+        if self.direct_mode:
+            return await asyncio.gather(
+                *(self._evaluate_batch_item_async(http_client, {**item, "timeout": timeout}) for item in items)
+            )
+        
+        payloads = [
+            self._comparison_payload(**item) if "text_A" in item else self._evaluation_payload(**item)
+            for item in items
+        ]
+        # Larger bins are split to stay within the server's limit per request
+        responses = await asyncio.gather(*(
+            self._post_async(
+                http_client,
+                self._url_eval_batch,
+                {"items": payloads[start:start + self.MAX_SERVER_BATCH_ITEMS]},
+                timeout=timeout
+            )
+            for start in range(0, len(payloads), self.MAX_SERVER_BATCH_ITEMS)
+        ))
+        return [result for response in responses for result in response["results"]]
+    
+    async def _evaluate_batch_item_async(
+        self,
+        http_client: httpx.AsyncClient,
+        item: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run one batch item, reporting failures in the response instead of raising."""
+        try:
+            if "text_A" in item:
+                return await self._compare_texts_async(http_client, **item)
+            return await self._evaluate_text_async(http_client, **item)
+        except Exception as e:
+            return {
+                "evaluation_id": "direct-mode",
+                "status": "FAILED",
+                "result": None,
+                "error_message": str(e)
+            }
+    
+    async def evaluate_text_batch(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = 64
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate several texts concurrently.
+        
+        Up to max_concurrency requests are in flight at the same time, so the
+        vLLM scheduler can batch them together instead of processing them one
+        by one, while very large batches do not exhaust the connection pool.
+        
+        Args:
+            items: List of evaluations, each a dict of keyword arguments accepted by evaluate_text
+            max_concurrency: Maximum number of requests in flight at once (None for no limit)
+            
+        Returns:
+            List of evaluation responses, in the same order as items
+        """
+        return await self._gather_with_cache(
+            items, lambda misses: http_pool.run_async(self._evaluate_text_batch_uncached(misses, max_concurrency))
+        )
+    
+    async def _evaluate_text_batch_uncached(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Evaluate several texts concurrently, bypassing the result cache."""
+        http_client = http_pool.get_client(self.async_transport)
+        return await _gather_bounded(
+            (self._evaluate_text_async(http_client, **item) for item in items), max_concurrency
+        )
+    
+    async def compare_texts_batch(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = 64
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare several pairs of texts concurrently.
+        
+        Args:
+            items: List of comparisons, each a dict of keyword arguments accepted by compare_texts
+            max_concurrency: Maximum number of requests in flight at once (None for no limit)
+            
+        Returns:
+            List of comparison responses, in the same order as items
+        """
+        return await self._gather_with_cache(
+            items, lambda misses: http_pool.run_async(self._compare_texts_batch_uncached(misses, max_concurrency))
+        )
+    
+    async def _compare_texts_batch_uncached(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Compare several pairs of texts concurrently, bypassing the result cache."""
+        http_client = http_pool.get_client(self.async_transport)
+        return await _gather_bounded(
+            (self._compare_texts_async(http_client, **item) for item in items), max_concurrency
+        )
+    
+    async def _gather_with_cache(
+        self,
+        items: List[Dict[str, Any]],
+        submit: Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Answer batch items from the result cache and submit only the misses."""
+        cache_keys = [self._result_cache_key(item) for item in items]
+        results = [self._get_cached_result(cache_key) for cache_key in cache_keys]
+        
+        misses = [index for index, result in enumerate(results) if result is None]
+        if misses:
+            responses = await submit([items[index] for index in misses])
+            for index, response in zip(misses, responses):
+                results[index] = response
+                self._cache_result(cache_keys[index], items[index].get("prompt_template_id"), response)
+        
+        return results
+    
+    def _result_cache_key(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Build a stable cache key from the arguments of an evaluation or comparison.
+        
+        Only requests sampled with temperature 0 get a key, since any other
+        request is expected to get a fresh judgment; the others return None.
+        """
+        sampling_params = request.get("sampling_params")
+        if not sampling_params or sampling_params.get("temperature") != 0:
+            return None
+        
+        # Unset arguments are dropped so that explicit defaults and omitted keys match
+        key_data = {
+            name: value for name, value in request.items()
+            if name not in ("wait", "timeout") and value is not None and value is not False
+        }
+        return orjson.dumps(key_data, default=str, option=orjson.OPT_SORT_KEYS).decode()
+    
+    def _get_cached_result(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached result, or None if there is none."""
+        if cache_key is None:
+            return None
+        with self._result_cache_lock:
+            if cache_key not in self._result_cache:
+                return None
+            self._result_cache.move_to_end(cache_key)
+            return copy.deepcopy(self._result_cache[cache_key][1])
+    
+    def _cache_result(
+        self,
+        cache_key: Optional[str],
+        prompt_template_id: Optional[str],
+        result: Dict[str, Any]
+    ) -> None:
+        """Store a completed result, evicting the least recently used entry when full."""
+        if cache_key is None or self.cache_size <= 0 or result.get("status") != "COMPLETED":
+            return
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = (prompt_template_id, copy.deepcopy(result))
+            self._result_cache.move_to_end(cache_key)
+            while len(self._result_cache) > self.cache_size:
+                self._result_cache.popitem(last=False)
+    
+    def clear_cache(self, template_id: Optional[str] = None) -> None:
+        """
+        Clear cached evaluation results.
+        
+        Args:
+            template_id: Only clear results produced with this template (optional)
+        """
+        with self._result_cache_lock:
+            if template_id is None:
+                self._result_cache.clear()
+                return
+            
+            for cache_key in [k for k, (t, _) in self._result_cache.items() if t == template_id]:
+                del self._result_cache[cache_key]
+    
+    async def _evaluate_text_async(
         self,
-        text_A: str,
-        text_B: str,
-        comparison_criteria: str,
+        http_client: httpx.AsyncClient,
+        text: str,
+        evaluation_criteria: str,
         judge_model_id: str,
         prompt_template_id: Optional[str] = None,
         custom_prompt_segments: Optional[Dict[str, str]] = None,
@@ -301,54 +1500,49 @@ class VLLMJudgeClient:
         wait: bool = True,
         timeout: Optional[int] = None
     ) -> Dict[str, Any]:
-        """
-        Compare two texts based on the provided criteria.
-        
-        Args:
-            text_A: First text to compare
-            text_B: Second text to compare
-            comparison_criteria: Criteria for the comparison
-            judge_model_id: ID of the model to use as judge
-            prompt_template_id: ID of the prompt template to use (optional)
-            custom_prompt_segments: Custom segments for the prompt (optional)
-            output_format_instruction: Instructions for output format (optional)
-            sampling_params: Parameters for vLLM sampling (optional)
-            provide_reasoning: Whether to request reasoning
-            wait: Whether to wait for the result (only for server mode)
-            timeout: Timeout in seconds (only used if wait is True)
-            
-        Returns:
-            Comparison response
-        """
+        """Asynchronous implementation of evaluate_text for both modes."""
         if self.direct_mode:
-            return self._compare_texts_direct(
-                text_A=text_A,
-                text_B=text_B,
-                comparison_criteria=comparison_criteria,
-                judge_model_id=judge_model_id,
+            messages, parser_rules = self._build_evaluation_messages(
+                text=text,
+                evaluation_criteria=evaluation_criteria,
                 prompt_template_id=prompt_template_id,
                 custom_prompt_segments=custom_prompt_segments,
                 output_format_instruction=output_format_instruction,
-                sampling_params=sampling_params,
                 provide_reasoning=provide_reasoning
             )
-        else:
-            return self._compare_texts_server(
-                text_A=text_A,
-                text_B=text_B,
-                comparison_criteria=comparison_criteria,
-                judge_model_id=judge_model_id,
+            completion_response = await self._generate_completion_async(
+                http_client, judge_model_id, messages, sampling_params or {}, timeout
+            )
+            return self._build_direct_result(
+                raw_output=completion_response["choices"][0]["message"]["content"],
+                parse=self.output_parser.parse_single_evaluation,
                 prompt_template_id=prompt_template_id,
-                custom_prompt_segments=custom_prompt_segments,
-                output_format_instruction=output_format_instruction,
-                sampling_params=sampling_params,
-                provide_reasoning=provide_reasoning,
-                wait=wait,
-                timeout=timeout
+                parser_rules=parser_rules,
+                provide_reasoning=provide_reasoning
             )
+        
+        payload = self._evaluation_payload(
+            text=text,
+            evaluation_criteria=evaluation_criteria,
+            judge_model_id=judge_model_id,
+            prompt_template_id=prompt_template_id,
+            custom_prompt_segments=custom_prompt_segments,
+            output_format_instruction=output_format_instruction,
+            sampling_params=sampling_params,
+            provide_reasoning=provide_reasoning
+        )
+        task_data = await self._post_async(
+            http_client, self._url_eval_single, payload
+        )
+        if not wait:
+            return task_data
+        return await self._wait_for_result_async(
+            http_client, task_data["evaluation_id"], timeout or self.timeout
+        )
     
-    def _compare_texts_direct(
+    async def _compare_texts_async(
         self,
+        http_client: httpx.AsyncClient,
         text_A: str,
         text_B: str,
         comparison_criteria: str,
@@ -357,13 +1551,13 @@ class VLLMJudgeClient:
         custom_prompt_segments: Optional[Dict[str, str]] = None,
         output_format_instruction: Optional[str] = None,
         sampling_params: Optional[Dict[str, Any]] = None,
-        provide_reasoning: bool = False
+        provide_reasoning: bool = False,
+        wait: bool = True,
+        timeout: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Direct mode implementation of compare_texts."""
-        # If a template is explicitly requested, use it
-        if prompt_template_id:
-            # Generate the prompt using the specified template
-            messages = self.prompt_manager.generate_pairwise_comparison_prompt(
+        """Asynchronous implementation of compare_texts for both modes."""
+        if self.direct_mode:
+            messages, parser_rules = self._build_comparison_messages(
                 text_A=text_A,
                 text_B=text_B,
                 comparison_criteria=comparison_criteria,
@@ -372,154 +1566,201 @@ class VLLMJudgeClient:
                 output_format_instruction=output_format_instruction,
                 provide_reasoning=provide_reasoning
             )
-            
-            # Get parser rules if a template was used
-            parser_rules = None
-            try:
-                template = self.prompt_manager.get_template(prompt_template_id)
-                parser_rules = template.get("output_parser_rules")
-            except Exception:
-                pass
-        else:
-            # No template specified - use a generic approach
-            # Create system message
-            system_message = "You are an expert evaluator. Your task is to compare two texts based on the given criteria."
-            
-            # Override with custom if provided
-            if custom_prompt_segments and custom_prompt_segments.get("system_message"):
-                system_message = custom_prompt_segments.get("system_message")
-            
-            # Create user message
-            user_message = f"Please compare the following two texts based on these criteria:\n\n{comparison_criteria}\n\nText A:\n\n{text_A}\n\nText B:\n\n{text_B}"
-            
-            # Add reasoning request if needed
-            if provide_reasoning:
-                reasoning_request = "\n\nThen, on a new line, explain your reasoning starting with 'Reasoning:'"
-                user_message += reasoning_request
-            
-            # Add output format instruction if provided
-            if output_format_instruction:
-                user_message += f"\n\n{output_format_instruction}"
-            
-            # Create messages list
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ]
-            
-            # No specific parser rules in generic mode
-            parser_rules = None
-        
-        # Prepare sampling parameters
-        vllm_params = sampling_params or {}
+            completion_response = await self._generate_completion_async(
+                http_client, judge_model_id, messages, sampling_params or {}, timeout
+            )
+            return self._build_direct_result(
+                raw_output=completion_response["choices"][0]["message"]["content"],
+                parse=self.output_parser.parse_pairwise_comparison,
+                prompt_template_id=prompt_template_id,
+                parser_rules=parser_rules,
+                provide_reasoning=provide_reasoning
+            )
         
-        # Call vLLM directly using synchronous client
-        completion_response = self.vllm_client.generate_completion(
-            model=judge_model_id,
-            messages=messages,
-            sampling_params=vllm_params
+        payload = self._comparison_payload(
+            text_A=text_A,
+            text_B=text_B,
+            comparison_criteria=comparison_criteria,
+            judge_model_id=judge_model_id,
+            prompt_template_id=prompt_template_id,
+            custom_prompt_segments=custom_prompt_segments,
+            output_format_instruction=output_format_instruction,
+            sampling_params=sampling_params,
+            provide_reasoning=provide_reasoning
+        )
+        task_data = await self._post_async(
+            http_client, self._url_eval_pair, payload
+        )
+        if not wait:
+            return task_data
+        return await self._wait_for_result_async(
+            http_client, task_data["evaluation_id"], timeout or self.timeout
         )
+    
+    def _completion_cache_key(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        sampling_params: Dict[str, Any]
+    ) -> Optional[str]:
+        """Get the completion cache key of a request, or None if it must not be cached."""
+        # Sampled output differs between calls, so only greedy decoding is cached;
+        # vLLM samples by default, so the temperature must be set to 0 explicitly
+        if self.completion_cache is None or sampling_params.get("temperature") != 0:
+            return None
+        return self.completion_cache.make_key(model, messages, sampling_params)
+    
+    def _generate_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        sampling_params: Dict[str, Any],
+        is_decided: Optional[Callable[[str], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        Call vLLM's chat completions API, answering repeats from the completion cache (direct mode only).
         
-        # Extract the raw output from the completion
-        raw_output = self._clean_output(completion_response["choices"][0]["message"]["content"])    
+        If is_decided is given, the completion is streamed and stopped as soon
+        as is_decided returns True for the output so far. Completions stopped
+        early are not stored in the completion cache, since another caller may
+        need the full output.
+        """
+        cache_key = self._completion_cache_key(model, messages, sampling_params)
+        if cache_key is not None:
+            completion_response = self.completion_cache.get(cache_key)
+            if completion_response is not None:
+                return completion_response
         
-        # Parse the output based on whether we're using a template or not
-        if prompt_template_id and parser_rules:
-            # Use structured parsing if we have a template and rules
-            parsed_result = self.output_parser.parse_pairwise_comparison(
-                raw_output=raw_output,
-                template_id=prompt_template_id,
-                parser_rules=parser_rules,
-                provide_reasoning=provide_reasoning
+        if is_decided is not None:
+            raw_output = ""
+            deltas = self.vllm_client.stream_completion(
+                model=model,
+                messages=messages,
+                sampling_params=sampling_params
             )
-            
-            judgment = parsed_result["judgment"]
-            reasoning = parsed_result.get("reasoning")
+            try:
+                for delta in deltas:
+                    raw_output += delta
+                    if is_decided(raw_output):
+                        # Where the output was cut depends on the caller's rules
+                        cache_key = None
+                        break
+            finally:
+                # Closing the stream makes vLLM abort the remaining generation
+                deltas.close()
+            completion_response = {"choices": [{"message": {"role": "assistant", "content": raw_output}}]}
         else:
-            # In generic mode, just use the raw output as the judgment
-            judgment = raw_output
-            reasoning = None
-            
-            # If reasoning was requested, try to extract it, but don't rely on specific formats
-            if provide_reasoning:
-                judgment = raw_output.split("\n")[0].strip()
-                reasoning = self._extract_reasoning(raw_output)
+            generate = self._dispatcher.generate_completion if self._dispatcher else self.vllm_client.generate_completion
+            completion_response = generate(
+                model=model,
+                messages=messages,
+                sampling_params=sampling_params
+            )
         
-        # Format the result to match the server response format
-        return {
-            "evaluation_id": "direct-mode",  # No real evaluation ID in direct mode
-            "status": "COMPLETED",
-            "result": {
-                "judgment": judgment,
-                "raw_judge_output": raw_output,
-                "reasoning": reasoning
-            }
-        }
+        if cache_key is not None:
+            self.completion_cache.set(cache_key, completion_response)
+        return completion_response
     
-    def _compare_texts_server(
+    async def _generate_completion_async(
         self,
-        text_A: str,
-        text_B: str,
-        comparison_criteria: str,
-        judge_model_id: str,
-        prompt_template_id: Optional[str] = None,
-        custom_prompt_segments: Optional[Dict[str, str]] = None,
-        output_format_instruction: Optional[str] = None,
-        sampling_params: Optional[Dict[str, Any]] = None,
-        provide_reasoning: bool = False,
-        wait: bool = True,
+        http_client: httpx.AsyncClient,
+        model: str,
+        messages: List[Dict[str, str]],
+        sampling_params: Dict[str, Any],
         timeout: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Server mode implementation of compare_texts."""
-        # Build the request payload
-        payload = {
-            "judge_model_id": judge_model_id,
-            "text_A": text_A,
-            "text_B": text_B,
-            "comparison_criteria": comparison_criteria,
-            "provide_reasoning": provide_reasoning
-        }
-        
-        if prompt_template_id:
-            payload["prompt_template_id"] = prompt_template_id
-        
-        if custom_prompt_segments:
-            payload["custom_prompt_segments"] = custom_prompt_segments
-        
-        if output_format_instruction:
-            payload["output_format_instruction"] = output_format_instruction
+        """Call vLLM's chat completions API directly (direct mode only)."""
+        cache_key = self._completion_cache_key(model, messages, sampling_params)
+        if cache_key is not None:
+            completion_response = self.completion_cache.get(cache_key)
+            if completion_response is not None:
+                return completion_response
         
-        if sampling_params:
-            payload["vllm_sampling_params"] = sampling_params
-        
-        # Send the request
-        response = requests.post(
-            f"{self.base_url}/evaluate/pairwise_comparison",
-            json=payload,
-            timeout=self.timeout
+        completion_response = await self._post_async(
+            http_client,
+            self.vllm_client.completions_url,
+            {"model": model, "messages": messages, **sampling_params},
+            headers=self.vllm_client.headers,
+            timeout=timeout
         )
         
+        if cache_key is not None:
+            self.completion_cache.set(cache_key, completion_response)
+        return completion_response
+    
+    async def _post_async(
+        self,
+        http_client: httpx.AsyncClient,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """POST a JSON payload and return the decoded JSON response."""
+        try:
+            response = await http_client.post(
+                url,
+                content=orjson.dumps(payload),
+                headers=headers or _JSON_HEADERS,
+                timeout=timeout or self.timeout
+            )
+        except httpx.HTTPError as e:
+            raise VLLMJudgeError(f"Network error: {str(e)}")
+        
         # Check for errors
         if response.status_code != 200:
             raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
         
-        # Parse the response
-        task_data = response.json()
-        evaluation_id = task_data["evaluation_id"]
-        
-        # Return immediately if not waiting
-        if not wait:
-            return task_data
+        return orjson.loads(response.content)
+    
+    async def _wait_for_result_async(
+        self,
+        http_client: httpx.AsyncClient,
+        evaluation_id: str,
+        timeout: int
+    ) -> Dict[str, Any]:
+        """Asynchronous counterpart of _wait_for_result."""
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while (remaining := deadline - time.monotonic()) > 0:
+            wait_ms = int(min(remaining, 5) * 1000)
+            params = {"wait_ms": wait_ms}
+            if self.consume_results:
+                # The task is only consumed once it has finished
+                params["consume"] = "true"
+            try:
+                response = await http_client.get(
+                    self._url_status + evaluation_id,
+                    params=params,
+                    timeout=self.timeout + wait_ms / 1000
+                )
+            except httpx.HTTPError as e:
+                raise VLLMJudgeError(f"Network error: {str(e)}")
+            
+            if response.status_code != 200:
+                raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
+            
+            status_data = orjson.loads(response.content)
+            if status_data["status"] == "COMPLETED":
+                return status_data
+            elif status_data["status"] == "FAILED":
+                raise VLLMJudgeError(f"Evaluation failed: {status_data.get('error_message')}")
+            
+            # Wait a bit before checking again
+            await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 1.7, 2.0)
         
-        # Wait for the result
-        return self._wait_for_result(evaluation_id, timeout or self.timeout)
+        raise TimeoutError(f"Evaluation timed out after {timeout} seconds")
     
-    def get_status(self, evaluation_id: str) -> Dict[str, Any]:
+    def get_status(self, evaluation_id: str, consume: bool = False, wait_ms: int = 0) -> Dict[str, Any]:
         """
         Get the status of an evaluation task.
         
         Args:
             evaluation_id: ID of the evaluation task
+            consume: Remove the task from the server once it has finished
+            wait_ms: Let the server hold the request until the task finishes,
+                for at most this many milliseconds
             
         Returns:
             Status response
@@ -530,16 +1771,23 @@ class VLLMJudgeClient:
         if self.direct_mode:
             raise ValueError("get_status is not available in direct mode")
             
-        response = requests.get(
-            f"{self.base_url}/evaluate/status/{evaluation_id}",
-            timeout=self.timeout
+        params = {}
+        if consume:
+            params["consume"] = "true"
+        if wait_ms > 0:
+            params["wait_ms"] = wait_ms
+        
+        response = self._http.get(
+            self._url_status + evaluation_id,
+            params=params or None,
+            timeout=self.timeout + wait_ms / 1000
         )
         
         # Check for errors
         if response.status_code != 200:
             raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
         
-        return response.json()
+        return orjson.loads(response.content)
     
     def list_templates(self) -> List[Dict[str, Any]]:
         """
@@ -549,10 +1797,10 @@ class VLLMJudgeClient:
             List of templates
         """
         if self.direct_mode:
-            return self.prompt_manager.list_templates()
+            return [thaw_template(template) for template in self.prompt_manager.list_templates()]
             
-        response = requests.get(
-            f"{self.base_url}/config/judge_templates",
+        response = self._http.get(
+            self._url_templates,
             timeout=self.timeout
         )
         
@@ -560,7 +1808,7 @@ class VLLMJudgeClient:
         if response.status_code != 200:
             raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
         
-        return response.json()
+        return orjson.loads(response.content)
     
     def get_template(self, template_id: str) -> Dict[str, Any]:
         """
@@ -573,10 +1821,10 @@ class VLLMJudgeClient:
             Template data
         """
         if self.direct_mode:
-            return self.prompt_manager.get_template(template_id)
+            return thaw_template(self.prompt_manager.get_template(template_id))
             
-        response = requests.get(
-            f"{self.base_url}/config/judge_templates/{template_id}",
+        response = self._http.get(
+            self._url_template + template_id,
             timeout=self.timeout
         )
         
@@ -584,7 +1832,7 @@ class VLLMJudgeClient:
         if response.status_code != 200:
             raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
         
-        return response.json()
+        return orjson.loads(response.content)
     
     def create_template(self, template_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -597,19 +1845,24 @@ class VLLMJudgeClient:
             Created template
         """
         if self.direct_mode:
-            return self.prompt_manager.create_template(template_data)
+            # Reject invalid patterns now rather than on every evaluation
+            self.output_parser.compile_rules(template_data.get("output_parser_rules"))
+            return thaw_template(self.prompt_manager.create_template(template_data))
             
-        response = requests.post(
-            f"{self.base_url}/config/judge_templates",
-            json=template_data,
+        response = self._http.post(
+            self._url_templates,
+            content=orjson.dumps(template_data),
+            headers=_JSON_HEADERS,
             timeout=self.timeout
         )
+        # The server's template list changed, so stop reusing the fetched one
+        _forget_templates(self.base_url)
         
         # Check for errors
         if response.status_code != 200:
             raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
         
-        return response.json()
+        return orjson.loads(response.content)
     
     def update_template(self, template_id: str, template_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -622,20 +1875,29 @@ class VLLMJudgeClient:
         Returns:
             Updated template
         """
+        self._forget_warmed_template(template_id)
+        self.clear_cache(template_id)
+        
         if self.direct_mode:
-            return self.prompt_manager.update_template(template_id, template_data)
+            self.output_parser.compile_rules(template_data.get("output_parser_rules"))
+            template = self.prompt_manager.update_template(template_id, template_data)
+            self.output_parser.clear_cache(template_id)
+            return thaw_template(template)
             
-        response = requests.put(
-            f"{self.base_url}/config/judge_templates/{template_id}",
-            json=template_data,
+        response = self._http.put(
+            self._url_template + template_id,
+            content=orjson.dumps(template_data),
+            headers=_JSON_HEADERS,
             timeout=self.timeout
         )
+        # The server's template list changed, so stop reusing the fetched one
+        _forget_templates(self.base_url)
         
         # Check for errors
         if response.status_code != 200:
             raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
         
-        return response.json()
+        return orjson.loads(response.content)
     
     def delete_template(self, template_id: str) -> None:
         """
@@ -644,12 +1906,48 @@ class VLLMJudgeClient:
         Args:
             template_id: ID of the template to delete
         """
+        self._forget_warmed_template(template_id)
+        self.clear_cache(template_id)
+        
         if self.direct_mode:
             self.prompt_manager.delete_template(template_id)
+            self.output_parser.clear_cache(template_id)
             return
             
-        response = requests.delete(
-            f"{self.base_url}/config/judge_templates/{template_id}",
+        response = self._http.delete(
+            self._url_template + template_id,
+            timeout=self.timeout
+        )
+        # The server's template list changed, so stop reusing the fetched one
+        _forget_templates(self.base_url)
+        
+        # Check for errors
+        if response.status_code != 204:
+            raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
+    
+    def warmup(self, judge_model_id: str) -> None:
+        """
+        Send the judge model a one-token request and ignore the result.
+        
+        Call this once right after creating the client, so one-time startup
+        costs on the server and connection setup are not paid by the first
+        real evaluation.
+        
+        Args:
+            judge_model_id: ID of the model to warm up
+        """
+        if self.direct_mode:
+            self.vllm_client.generate_completion(
+                model=judge_model_id,
+                messages=[{"role": "user", "content": "ping"}],
+                sampling_params={"max_tokens": 1}
+            )
+            return
+        
+        response = self._http.post(
+            self._url_warmup,
+            content=orjson.dumps({"judge_model_id": judge_model_id}),
+            headers=_JSON_HEADERS,
             timeout=self.timeout
         )
         
@@ -657,6 +1955,47 @@ class VLLMJudgeClient:
         if response.status_code != 204:
             raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
     
+    def warm_template(self, template_id: str, judge_model_id: str) -> None:
+        """
+        Warm the vLLM prefix cache with the static prefix of a template.
+        
+        Call this once before submitting many evaluations that use the same
+        template, so they reuse the cached prefix instead of each computing it.
+        Repeated calls for the same template and model are no-ops.
+        
+        Args:
+            template_id: ID of the template to warm
+            judge_model_id: ID of the model the template will be used with
+        """
+        if (template_id, judge_model_id) in self._warmed_templates:
+            return
+        
+        if self.direct_mode:
+            self.vllm_client.generate_completion(
+                model=judge_model_id,
+                messages=self.prompt_manager.generate_template_prefix_prompt(template_id),
+                sampling_params={"max_tokens": 1}
+            )
+        else:
+            response = self._http.post(
+                self._url_template + template_id + "/warmup",
+                content=orjson.dumps({"judge_model_id": judge_model_id}),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout
+            )
+            
+            # Check for errors
+            if response.status_code != 204:
+                raise VLLMJudgeError(f"Error: {response.status_code} - {response.text}")
+        
+        self._warmed_templates.add((template_id, judge_model_id))
+    
+    def _forget_warmed_template(self, template_id: str) -> None:
+        """Forget that a template was warmed, e.g. after it changed."""
+        self._warmed_templates = {
+            warmed for warmed in self._warmed_templates if warmed[0] != template_id
+        }
+    
     def _wait_for_result(self, evaluation_id: str, timeout: int) -> Dict[str, Any]:
         """
         Wait for a result to be available.
@@ -675,9 +2014,15 @@ class VLLMJudgeClient:
         if self.direct_mode:
             raise ValueError("_wait_for_result is not available in direct mode")
             
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            status_data = self.get_status(evaluation_id)
+        # The server holds each status request until the task finishes or
+        # wait_ms passes; servers that ignore wait_ms are polled with backoff
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while (remaining := deadline - time.monotonic()) > 0:
+            # The task is only consumed once it has finished
+            status_data = self.get_status(
+                evaluation_id, consume=self.consume_results, wait_ms=int(min(remaining, 5) * 1000)
+            )
             
             if status_data["status"] == "COMPLETED":
                 return status_data
@@ -685,7 +2030,8 @@ class VLLMJudgeClient:
                 raise VLLMJudgeError(f"Evaluation failed: {status_data.get('error_message')}")
             
             # Wait a bit before checking again
-            time.sleep(1)
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 1.7, 2.0)
         
         raise TimeoutError(f"Evaluation timed out after {timeout} seconds")
 
@@ -696,6 +2042,13 @@ class VLLMJudgeError(Exception):
 
 
 # Utility functions for common evaluation tasks
+
+# Sampling parameters of helpers whose judgment is a short label and no
+# reasoning is requested; the label fits in a few tokens, so a runaway
+# generation is cut off instead of running to the model's limit
+_SHORT_LABEL_SAMPLING_PARAMS = {"max_tokens": 8, "stop": ["\n"]}
+
+
 def detect_toxicity(
     client: VLLMJudgeClient,
     text: str,
@@ -720,6 +2073,7 @@ def detect_toxicity(
         judge_model_id=judge_model_id,
         prompt_template_id="toxicity_detection",
         output_format_instruction="Respond with ONLY 'TOXIC' if the content contains any toxic elements, or 'NON-TOXIC' if it does not.",
+        sampling_params=None if provide_reasoning else _SHORT_LABEL_SAMPLING_PARAMS,
         provide_reasoning=provide_reasoning
     )
 
@@ -780,6 +2134,15 @@ def detect_hallucinations(
     )
 
 
+# Prompt segments of compare_responses, kept constant so every call starts
+# with the same system message and instruction header and vLLM can reuse
+# their cached prefix
+_RESPONSE_COMPARISON_SEGMENTS = {
+    "system_message": "You are an expert evaluator of AI systems. Your task is to compare two AI responses to the same user prompt and determine which is better.",
+    "user_instruction_prefix": "Compare the following two AI responses to the user prompt. Choose the response that is more helpful, accurate, and appropriate.\n\nUser Prompt:\n\"\"\"\n{comparison_criteria}\n\"\"\"\n\nResponse A:\n\"\"\"\n{text_A}\n\"\"\"\n\nResponse B:\n\"\"\"\n{text_B}\n\"\"\"\n\n"
+}
+
+
 def compare_responses(
     client: VLLMJudgeClient,
     prompt: str,
@@ -802,24 +2165,67 @@ def compare_responses(
     Returns:
         Comparison result
     """
-    # Create custom prompt segments for this use case
-    custom_prompt_segments = {
-        "system_message": "You are an expert evaluator of AI systems. Your task is to compare two AI responses to the same user prompt and determine which is better.",
-        "user_instruction_prefix": "Compare the following two AI responses to the user prompt. Choose the response that is more helpful, accurate, and appropriate.\n\nUser Prompt:\n\"\"\"\n{comparison_criteria}\n\"\"\"\n\nResponse A:\n\"\"\"\n{text_A}\n\"\"\"\n\nResponse B:\n\"\"\"\n{text_B}\n\"\"\"\n\n"
-    }
-    
     return client.compare_texts(
         text_A=response_A,
         text_B=response_B,
         comparison_criteria=prompt,
         judge_model_id=judge_model_id,
         prompt_template_id="pairwise_comparison",
-        custom_prompt_segments=custom_prompt_segments,
+        custom_prompt_segments=_RESPONSE_COMPARISON_SEGMENTS,
         output_format_instruction="Respond with 'A' if Response A is better, 'B' if Response B is better, or 'EQUAL' if they are of equal quality.",
+        sampling_params=None if provide_reasoning else _SHORT_LABEL_SAMPLING_PARAMS,
         provide_reasoning=provide_reasoning
     )
 
 
+# Fixed prompt parts of evaluate_code; per-call requirements are appended
+# after the criteria sentence so the shared prefix stays intact
+_CODE_EVALUATION_CRITERIA = "Evaluate the following code for quality, readability, efficiency, and adherence to best practices."
+_CODE_EVALUATION_SEGMENTS = {
+    "system_message": "You are an expert software developer. Your task is to evaluate the quality of the provided code.",
+    "user_instruction_prefix": "Please evaluate the following code for quality, readability, efficiency, and best practices:\n\n{evaluation_criteria}\n\nCode to evaluate:\n\n"
+}
+
+
+# Template lists fetched from judge servers, by base URL: (fetch time, templates)
+TEMPLATE_CACHE_TTL = 60
+_template_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+_template_cache_lock = threading.Lock()
+
+
+def _forget_templates(base_url: str) -> None:
+    """Drop the template list fetched from a judge server, so the next use fetches it again."""
+    with _template_cache_lock:
+        _template_cache.pop(base_url, None)
+
+
+def _get_templates(client: VLLMJudgeClient, ttl: float = TEMPLATE_CACHE_TTL) -> List[Dict[str, Any]]:
+    """
+    List the templates of a client, reusing a server's list for up to ttl seconds.
+    
+    Args:
+        client: VLLMJudgeClient instance
+        ttl: Time for which a fetched list is reused, in seconds
+        
+    Returns:
+        List of templates
+    """
+    # Direct-mode clients list templates from memory, so there is nothing to save
+    if client.direct_mode:
+        return client.list_templates()
+    
+    now = time.monotonic()
+    with _template_cache_lock:
+        cached = _template_cache.get(client.base_url)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+    
+    templates = client.list_templates()
+    with _template_cache_lock:
+        _template_cache[client.base_url] = (now, templates)
+    return templates
+
+
 def evaluate_code(
     client: VLLMJudgeClient,
     code: str,
@@ -838,25 +2244,20 @@ def evaluate_code(
     Returns:
         Evaluation result
     """
-    criteria = "Evaluate the following code for quality, readability, efficiency, and adherence to best practices."
+    criteria = _CODE_EVALUATION_CRITERIA
     if requirements:
         criteria = f"{criteria}\n\nRequirements:\n{requirements}"
     
     # First check if there's a code quality template
     try:
-        templates = client.list_templates()
+        templates = _get_templates(client)
         has_code_template = any(t["template_name"] == "Code Quality Evaluation" for t in templates)
         template_id = "code_quality" if has_code_template else None
     except:
         template_id = None
     
     # If no template exists, use custom prompt segments
-    custom_prompt_segments = None
-    if not template_id:
-        custom_prompt_segments = {
-            "system_message": "You are an expert software developer. Your task is to evaluate the quality of the provided code.",
-            "user_instruction_prefix": "Please evaluate the following code for quality, readability, efficiency, and best practices:\n\n{evaluation_criteria}\n\nCode to evaluate:\n\n"
-        }
+    custom_prompt_segments = None if template_id else _CODE_EVALUATION_SEGMENTS
     
     return client.evaluate_text(
         text=code,
@@ -1,5 +1,5 @@
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -10,6 +10,8 @@ class Settings(BaseSettings):
     # vLLM Server configuration
     VLLM_API_BASE: str = os.getenv("VLLM_API_BASE", "http://localhost:8080/v1")
     VLLM_API_KEY: Optional[str] = os.getenv("VLLM_API_KEY", "")
+    VLLM_HTTP_TRANSPORT: str = "httpx"  # "aiohttp" requires the aiohttp extra
+    WARMUP_MODEL_IDS: List[str] = []  # Judge models to warm up on startup
     
     # Adapter configuration
     DEFAULT_TIMEOUT: int = 60
@@ -19,7 +21,25 @@ class Settings(BaseSettings):
         os.path.join(os.path.dirname(__file__), "../templates/default_templates.json")
     )
     
+    # Prefix caching configuration
+    ROUTING_KEY_HEADER: str = "x-routing-key"  # Empty to disable
+    
+    # Batching configuration
+    MAX_BATCH_SIZE: int = 64
+    MAX_BATCH_ITEMS: int = 256  # Items accepted in one /evaluate/batch request
+    BATCH_MAX_WAIT_MS: float = 5.0
+    
+    # Completion cache configuration
+    COMPLETION_CACHE_SIZE: int = 1024  # Temperature-0 completions kept in memory; 0 to disable
+    
     # Async task configuration
+    JUDGE_WORKERS: int = 64
+    JUDGE_QUEUE_SIZE: int = 1024
     TASK_EXPIRY_SECONDS: int = 3600  # 1 hour
+    TASK_STORE_URL: Optional[str] = os.getenv("TASK_STORE_URL")  # e.g. redis://localhost:6379/0
+    
+    # Number of server processes, set by the CLI; each holds its own copy of
+    # the templates, so templates are read-only when there is more than one
+    SERVER_WORKERS: int = 1
 
 settings = Settings()
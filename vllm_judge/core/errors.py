@@ -35,3 +35,9 @@ class TemplateNotFoundError(AdapterError):
     """Exception raised when a requested template is not found."""
     def __init__(self, template_id: str):
         super().__init__(status_code=404, detail=f"Template not found: {template_id}")
+
+
+class QueueFullError(AdapterError):
+    """Exception raised when the evaluation queue is full."""
+    def __init__(self, max_queue_size: int):
+        super().__init__(status_code=429, detail=f"Evaluation queue is full ({max_queue_size} tasks), retry later")
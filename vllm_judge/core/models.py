@@ -1,6 +1,9 @@
 from enum import Enum
 from typing import Dict, List, Optional, Union, Any
 from pydantic import BaseModel, Field
+from typing_extensions import TypedDict
+
+from vllm_judge.core.config import settings
 
 
 class TaskStatus(str, Enum):
@@ -22,11 +25,16 @@ class VLLMSamplingParams(BaseModel):
     presence_penalty: Optional[float] = 0.0
 
 
-class CustomPromptSegments(BaseModel):
-    """Custom segments for building a prompt."""
-    system_message: Optional[str] = None
-    user_instruction_prefix: Optional[str] = None
-    user_instruction_suffix: Optional[str] = None
+class CustomPromptSegments(TypedDict, total=False):
+    """
+    Custom segments for building a prompt.
+    
+    A TypedDict rather than a model: the segments are only read as a dict, so
+    requests validate them without building a model instance per request.
+    """
+    system_message: Optional[str]
+    user_instruction_prefix: Optional[str]
+    user_instruction_suffix: Optional[str]
 
 
 class SingleEvaluationRequest(BaseModel):
@@ -86,3 +94,18 @@ class TemplateResponse(BaseModel):
     prompt_structure: Dict[str, Any] = Field(..., description="Structure of the prompt template")
     output_parser_rules: Optional[Dict[str, Any]] = Field(None, description="Rules for parsing the output")
     description: Optional[str] = Field(None, description="Description of the template")
+
+
+class WarmupRequest(BaseModel):
+    """Request model for warming up the judge model or a template's prefix."""
+    judge_model_id: str = Field(..., description="ID of the vLLM-hosted model to warm up")
+
+
+class BatchEvaluationRequest(BaseModel):
+    """Request model for submitting several evaluations in one call."""
+    items: List[Union[SingleEvaluationRequest, PairwiseComparisonRequest]] = Field(..., max_length=settings.MAX_BATCH_ITEMS, description="Evaluations and pairwise comparisons to run together")
+
+
+class BatchEvaluationResponse(BaseModel):
+    """Response model for batch evaluation requests."""
+    results: List[EvaluationResponse] = Field(..., description="One response per item, in the same order as the request")
@@ -1,9 +1,14 @@
+import asyncio
+import logging
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from vllm_judge.api import dependencies
 from vllm_judge.api.routes import evaluate, config
-from vllm_judge.core.errors import AdapterError
+from vllm_judge.core.config import settings
+from vllm_judge.core.errors import AdapterError, PromptTemplateError
 
 app = FastAPI(
     title="vLLM Judge",
@@ -24,6 +29,37 @@ app.add_middleware(
 app.include_router(evaluate.router)
 app.include_router(config.router)
 
+# Start the evaluation workers, request batching and task expiry once the event loop is running
+@app.on_event("startup")
+async def start_background_services():
+    await evaluate.judge_batcher.start()
+    await evaluate.task_store.start()
+    await evaluate.worker_pool.start()
+    
+    # Compile the parser rules of the stored templates now, not on their first evaluation
+    for template_id, template in dependencies.prompt_manager.template_snapshot.items():
+        try:
+            dependencies.output_parser.compile_rules(template.get("output_parser_rules"))
+        except PromptTemplateError as e:
+            logging.getLogger(__name__).warning("Template %s has invalid parser rules: %s", template_id, e)
+    
+    # Warm up the configured judge models together, while nothing else is running yet
+    results = await asyncio.gather(
+        *(dependencies.vllm_client.warmup(model) for model in settings.WARMUP_MODEL_IDS),
+        return_exceptions=True,
+    )
+    for model, result in zip(settings.WARMUP_MODEL_IDS, results):
+        if isinstance(result, Exception):
+            logging.getLogger(__name__).warning("Failed to warm up %s: %s", model, result)
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    await evaluate.worker_pool.stop()
+    await evaluate.judge_batcher.stop()
+    await evaluate.task_store.stop()
+    await dependencies.vllm_client.aclose()
+    dependencies.prompt_manager.flush()
+
 # Error handling
 @app.exception_handler(AdapterError)
 async def adapter_error_handler(request: Request, exc: AdapterError):
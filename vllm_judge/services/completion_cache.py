@@ -0,0 +1,133 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+
+class CompletionCache(ABC):
+    """
+    Base class for caches of judge completions.
+    
+    Entries are keyed by a hash of the model, messages and sampling parameters
+    of a completion request, so only exact repeats are served from the cache.
+    """
+    
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], sampling_params: Dict[str, Any]) -> str:
+        """
+        Build the cache key of a completion request.
+        
+        Args:
+            model: The model ID used for generation
+            messages: The messages sent to the model
+            sampling_params: Parameters for the generation
+        
+        Returns:
+            Hex digest identifying the request
+        """
+        data = orjson.dumps(
+            {"model": model, "messages": messages, "params": sampling_params},
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached completion response, or None if there is none."""
+    
+    @abstractmethod
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a completion response."""
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all cached completions."""
+
+
+class LRUCache(CompletionCache):
+    """In-memory completion cache that evicts the least recently used entry when full."""
+    
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of completions to keep
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+    
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(CompletionCache):
+    """
+    Completion cache kept in an SQLite file.
+    
+    Entries survive restarts, so re-running the same evaluations, e.g. in a
+    regression test suite, does not call the model again.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: Path to the SQLite file, created if it does not exist
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+        return orjson.loads(row[0]) if row else None
+    
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        data = orjson.dumps(response).decode()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, response) VALUES (?, ?)", (key, data)
+            )
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self._conn.close()
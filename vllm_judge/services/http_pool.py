@@ -0,0 +1,130 @@
+import asyncio
+import atexit
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, Optional
+
+import httpx
+
+from vllm_judge.services.aiohttp_transport import AioHTTPTransport
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Event loop running in a daemon thread. Every client schedules its async HTTP
+# work here so that one connection pool outlives individual calls, whichever
+# thread or event loop the caller uses.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+# Shared HTTP clients keyed by transport name, only ever touched from _loop
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop, starting it on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="vllm-judge-http", daemon=True).start()
+            atexit.register(_shutdown)
+    return _loop
+
+
+def submit(coro: Coroutine[Any, Any, Any]) -> Future:
+    """
+    Schedule a coroutine on the background event loop.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Future resolving to the coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine on the background event loop and block until it finishes.
+
+    Unlike asyncio.run, this also works when the caller is already inside a
+    running event loop, and keeps pooled connections open between calls.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    return submit(coro).result()
+
+
+async def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Await a coroutine that runs on the background event loop.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    return await asyncio.wrap_future(submit(coro))
+
+
+def get_client(transport: str = "httpx") -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client for a transport.
+
+    Must be called from a coroutine running on the background event loop.
+    Request timeouts are set per request by the caller.
+
+    Args:
+        transport: "httpx" for httpx's own connection pool, or "aiohttp"
+
+    Returns:
+        The shared client
+    """
+    client = _clients.get(transport)
+    if client is None or client.is_closed:
+        if transport == "aiohttp":
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(120.0, connect=5.0),
+                transport=AioHTTPTransport(limit=512, limit_per_host=512)
+            )
+        else:
+            client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(120.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=512,
+                    max_keepalive_connections=512,
+                    keepalive_expiry=60
+                )
+            )
+        _clients[transport] = client
+    return client
+
+
+async def _close_clients() -> None:
+    """Close every shared client."""
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
+
+
+def _shutdown() -> None:
+    """Close the shared clients and stop the background event loop at exit."""
+    if _loop is None or not _loop.is_running():
+        return
+    try:
+        submit(_close_clients()).result(timeout=5)
+    except Exception:
+        pass
+    _loop.call_soon_threadsafe(_loop.stop)
@@ -0,0 +1,191 @@
+import asyncio
+from typing import Callable, Dict, Any, AsyncIterator, List, Optional, Set, Tuple
+
+import orjson
+
+from vllm_judge.core.config import settings
+from vllm_judge.services.vllm_client import VLLMClient
+
+
+class JudgeBatcher:
+    """
+    Coalesces judge completion requests into batches before sending them to vLLM.
+    
+    Requests that arrive within a short window are collected and released to
+    vLLM together, so its continuous batcher schedules them in the same step
+    instead of trickling in one by one.
+    """
+    
+    def __init__(
+        self,
+        vllm_client: VLLMClient,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ):
+        """
+        Initialize the batcher.
+        
+        Args:
+            vllm_client: Client used to send the batched requests
+            max_batch_size: Maximum number of requests released together
+            max_wait_ms: Maximum time to wait for a batch to fill up, in milliseconds
+        """
+        self.vllm_client = vllm_client
+        self.max_batch_size = max_batch_size or settings.MAX_BATCH_SIZE
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else settings.BATCH_MAX_WAIT_MS
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Keep references to in-flight sends so they are not garbage collected
+        self._sends: Set[asyncio.Task] = set()
+    
+    async def start(self) -> None:
+        """Start collecting requests into batches."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """
+        Stop collecting requests; later requests are sent to vLLM directly.
+        
+        Requests still waiting in the queue are sent right away, and stop
+        returns once every batch already sent has been answered.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            
+            queue, self._queue = self._queue, None
+            pending = []
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+            if pending:
+                self._dispatch(pending)
+        
+        await asyncio.gather(*self._sends, return_exceptions=True)
+    
+    async def generate_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        sampling_params: Dict[str, Any],
+        is_decided: Optional[Callable[[str], bool]] = None,
+        routing_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate a completion as part of the next batch.
+        
+        Completions stopped early with is_decided are streamed, so they are
+        sent to vLLM directly; they are still answered from the client's
+        completion cache when possible.
+        
+        Args:
+            model: The model ID to use for generation
+            messages: The messages to send to the model
+            sampling_params: Parameters for the generation
+            is_decided: Optional check of the output so far that ends the generation early
+            routing_key: Key sent in the routing header, e.g. the template ID (optional)
+        
+        Returns:
+            The response from the vLLM server
+        """
+        if self._queue is None or is_decided is not None:
+            return await self.vllm_client.generate_completion(
+                model=model,
+                messages=messages,
+                sampling_params=sampling_params,
+                is_decided=is_decided,
+                routing_key=routing_key,
+            )
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((model, messages, sampling_params, routing_key, future))
+        return await future
+    
+    def stream_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        sampling_params: Dict[str, Any],
+        routing_key: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion; streams are sent to vLLM directly, without batching.
+        
+        Args:
+            model: The model ID to use for generation
+            messages: The messages to send to the model
+            sampling_params: Parameters for the generation
+            routing_key: Key sent in the routing header, e.g. the template ID (optional)
+            
+        Returns:
+            Async iterator over pieces of the generated text
+        """
+        return self.vllm_client.stream_completion(
+            model=model,
+            messages=messages,
+            sampling_params=sampling_params,
+            routing_key=routing_key,
+        )
+    
+    async def _run(self) -> None:
+        """Collect queued requests into batches and send them."""
+        while True:
+            batch = [await self._queue.get()]
+            
+            # Keep collecting until the batch is full or the wait time is up
+            deadline = asyncio.get_running_loop().time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+                except asyncio.CancelledError:
+                    # Stopped while collecting; send what was already taken off the queue
+                    self._dispatch(batch)
+                    raise
+            
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch: List[Tuple[Any, ...]]) -> None:
+        """Split a batch into groups that can share a call and start sending them."""
+        # Only requests for the same model, sampling parameters and routing
+        # key share a call
+        groups: Dict[Tuple[str, bytes, Optional[str]], List[Tuple[Any, ...]]] = {}
+        for item in batch:
+            model, _, sampling_params, routing_key, _ = item
+            key = (model, orjson.dumps(sampling_params, option=orjson.OPT_SORT_KEYS), routing_key)
+            groups.setdefault(key, []).append(item)
+        
+        for items in groups.values():
+            send = asyncio.create_task(self._send(items))
+            self._sends.add(send)
+            send.add_done_callback(self._sends.discard)
+    
+    async def _send(self, items: List[Tuple[Any, ...]]) -> None:
+        """Send one group of requests and hand the responses back to the callers."""
+        model, _, sampling_params, routing_key, _ = items[0]
+        try:
+            responses = await self.vllm_client.generate_completions_batch(
+                model=model,
+                messages_list=[messages for _, messages, _, _, _ in items],
+                sampling_params=sampling_params,
+                routing_key=routing_key,
+            )
+        except Exception as e:
+            responses = [e] * len(items)
+        
+        for (_, _, _, _, future), response in zip(items, responses):
+            if future.done():
+                continue
+            if isinstance(response, Exception):
+                future.set_exception(response)
+            else:
+                future.set_result(response)
@@ -1,6 +1,100 @@
 import re
-import json
-from typing import Any, Dict, Optional, List
+import threading
+import orjson
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, List, Tuple
+
+from vllm_judge.core.errors import PromptTemplateError
+
+
+def _trie_pattern(node: Dict[str, Any]) -> str:
+    """Build the regex matching any term below a node of a character trie."""
+    # A term ending here already matches, so longer terms sharing it add nothing
+    if "" in node:
+        return ""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items())]
+    return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+
+@lru_cache(maxsize=256)
+def _compile_patterns(patterns: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile a list of literal patterns into one case-insensitive matcher.
+    
+    The patterns are merged into a trie first, so terms sharing a prefix are
+    tried as one branch and the text is scanned in a single pass without
+    retrying every term at each position. Only whether a pattern occurs is
+    kept, not which one or where.
+    """
+    trie: Dict[str, Any] = {}
+    for pattern in patterns:
+        if not isinstance(pattern, str):
+            raise TypeError(f"pattern must be a string, not {type(pattern).__name__}")
+        node = trie
+        for char in pattern.lower():
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return re.compile(_trie_pattern(trie), re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def _compile_regex(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a parser rule's regex pattern once and reuse it for every output."""
+    return re.compile(pattern, flags)
+
+
+def _split_reasoning(raw_output: str, provide_reasoning: bool) -> Tuple[str, Optional[str]]:
+    """Split a judge output into its judgment text and the reasoning, if reasoning was requested."""
+    if not provide_reasoning:
+        return raw_output, None
+    
+    # Look for a reasoning section and remove it from the judgment text
+    reasoning_match = _REASONING_PATTERN.search(raw_output)
+    if reasoning_match:
+        return raw_output[:reasoning_match.start()].strip(), reasoning_match.group(1).strip()
+    
+    # Otherwise assume the reasoning comes after the first line
+    first_line, newline, rest = raw_output.partition("\n")
+    if newline:
+        return first_line.strip(), rest.strip()
+    return raw_output, None
+
+
+def _looks_like_json(text: str) -> bool:
+    """Check whether text is enclosed in braces, ignoring surrounding whitespace, without copying it."""
+    start, end = 0, len(text) - 1
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end].isspace():
+        end -= 1
+    return start < end and text[start] == "{" and text[end] == "}"
+
+
+# Common positive and negative terms for binary classification
+_POSITIVE_TERMS = _compile_patterns(("yes", "true", "positive", "correct", "acceptable", "safe", "allow", "allowed", "approve", "approved"))
+_NEGATIVE_TERMS = _compile_patterns(("no", "false", "negative", "incorrect", "unacceptable", "unsafe", "deny", "denied", "reject", "rejected"))
+
+# Fixed patterns used while parsing
+_REASONING_PATTERN = re.compile(r"Reasoning:(.+?)$", re.DOTALL)
+# Mentions of either text or of a tie, told apart by the name of the matching group
+_MENTION_PATTERN = re.compile(
+    r"\b(?:(?P<A>a|text a|option a)|(?P<B>b|text b|option b)|(?P<EQUAL>equal|same|tie|equivalent))\b",
+    re.IGNORECASE,
+)
+_EQUAL_PATTERN = re.compile(r"\b(?:equal|same|tie|equivalent)\b", re.IGNORECASE)
+_NUMBER_PATTERN = re.compile(r"\b(\d+)\b")
+
+# Patterns of parser rules that do not set their own; these are compiled
+# through _compile_regex like any other rule pattern
+_DEFAULT_RATING_PATTERN = r"\b([1-5])\b"
+_DEFAULT_PREFERENCE_PATTERN = r"(?:(?:Text|Option|Response)\s*)?([AB])"
+
+# Parsed results shared by every parser, keyed by the template and the output
+PARSE_CACHE_SIZE = 4096
+_parse_cache: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
 
 class OutputParser:
     """Parses outputs from LLMs into structured format."""
@@ -15,6 +109,134 @@ class OutputParser:
         """
         Parse the output from a single evaluation.
         
+        Results are memoized, so parsing the same output again is a lookup.
+        
+        Args:
+            raw_output: The raw output from the judge LLM
+            template_id: ID of the template used (optional)
+            parser_rules: Custom parser rules (optional)
+            provide_reasoning: Whether reasoning was requested
+            
+        Returns:
+            A dictionary containing the parsed judgment and reasoning
+        """
+        return self._parse_cached(
+            self._parse_single_evaluation, raw_output, template_id, parser_rules, provide_reasoning
+        )
+    
+    def parse_pairwise_comparison(
+        self, 
+        raw_output: str, 
+        template_id: Optional[str] = None,
+        parser_rules: Optional[Dict[str, Any]] = None,
+        provide_reasoning: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Parse the output from a pairwise comparison.
+        
+        Results are memoized, so parsing the same output again is a lookup.
+        
+        Args:
+            raw_output: The raw output from the judge LLM
+            template_id: ID of the template used (optional)
+            parser_rules: Custom parser rules (optional)
+            provide_reasoning: Whether reasoning was requested
+            
+        Returns:
+            A dictionary containing the parsed preference and reasoning
+        """
+        return self._parse_cached(
+            self._parse_pairwise_comparison, raw_output, template_id, parser_rules, provide_reasoning
+        )
+    
+    def compile_rules(self, parser_rules: Optional[Dict[str, Any]]) -> None:
+        """
+        Compile the patterns of a template's parser rules ahead of the first evaluation.
+        
+        Args:
+            parser_rules: Parser rules of the template (optional)
+            
+        Raises:
+            PromptTemplateError: If a regex pattern is invalid
+        """
+        if not parser_rules:
+            return
+        
+        rule_type = parser_rules.get("type", "text")
+        try:
+            if rule_type == "binary":
+                for key in ("positive_patterns", "negative_patterns"):
+                    if parser_rules.get(key):
+                        _compile_patterns(tuple(parser_rules[key]))
+            elif rule_type == "preference":
+                _compile_regex(parser_rules.get("pattern", _DEFAULT_PREFERENCE_PATTERN), re.IGNORECASE)
+            elif rule_type in ("numeric", "regex") and "pattern" in parser_rules:
+                _compile_regex(parser_rules["pattern"])
+        except (re.error, TypeError) as e:
+            raise PromptTemplateError(f"Invalid {rule_type} parser rule pattern: {e}")
+    
+    def clear_cache(self, template_id: Optional[str] = None) -> None:
+        """
+        Clear memoized parse results.
+        
+        Args:
+            template_id: Only clear results parsed for this template (optional)
+        """
+        with _parse_cache_lock:
+            if template_id is None:
+                _parse_cache.clear()
+                return
+            
+            for cache_key in [k for k in _parse_cache if k[1] == template_id]:
+                del _parse_cache[cache_key]
+    
+    def _parse_cached(
+        self,
+        parse: Callable[..., Dict[str, Any]],
+        raw_output: str,
+        template_id: Optional[str],
+        parser_rules: Optional[Dict[str, Any]],
+        provide_reasoning: bool
+    ) -> Dict[str, Any]:
+        """
+        Run a parse function, reusing the result of an identical earlier call.
+        
+        Parser rules come from the template, so results are keyed by the
+        template ID rather than the rules themselves; clear_cache drops them
+        when the template changes. Outputs parsed with rules of no template,
+        and JSON judgments that callers could change, are not memoized.
+        """
+        if parser_rules and template_id is None:
+            return parse(raw_output, template_id, parser_rules, provide_reasoning)
+        
+        cache_key = (parse.__name__, template_id, provide_reasoning, raw_output)
+        with _parse_cache_lock:
+            result = _parse_cache.get(cache_key)
+            if result is not None:
+                _parse_cache.move_to_end(cache_key)
+                return dict(result)
+        
+        result = parse(raw_output, template_id, parser_rules, provide_reasoning)
+        if isinstance(result["judgment"], (dict, list)):
+            return result
+        
+        with _parse_cache_lock:
+            _parse_cache[cache_key] = result
+            while len(_parse_cache) > PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+        
+        return dict(result)
+    
+    def _parse_single_evaluation(
+        self, 
+        raw_output: str, 
+        template_id: Optional[str] = None,
+        parser_rules: Optional[Dict[str, Any]] = None,
+        provide_reasoning: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Parse the output from a single evaluation.
+        
         Args:
             raw_output: The raw output from the judge LLM
             template_id: ID of the template used (optional)
@@ -25,35 +247,21 @@ class OutputParser:
             A dictionary containing the parsed judgment and reasoning
         """
         # Extract reasoning if it was requested
-        reasoning = None
-        judgment_text = raw_output
-        
-        if provide_reasoning:
-            # Look for a reasoning section
-            reasoning_match = re.search(r"Reasoning:(.+?)$", raw_output, re.DOTALL)
-            if reasoning_match:
-                reasoning = reasoning_match.group(1).strip()
-                # Remove the reasoning section from the judgment text
-                judgment_text = raw_output[:reasoning_match.start()].strip()
-            else:
-                # Try to split by newlines and assume reasoning comes after
-                lines = raw_output.split("\n")
-                if len(lines) > 1:
-                    judgment_text = lines[0].strip()
-                    reasoning = "\n".join(lines[1:]).strip()
+        judgment_text, reasoning = _split_reasoning(raw_output, provide_reasoning)
         
         # Try to parse the judgment
         judgment = None
         
         # First, check if the output is JSON
-        if judgment_text.strip().startswith("{") and judgment_text.strip().endswith("}"):
+        # orjson accepts the surrounding whitespace, so the text is not stripped first
+        if _looks_like_json(judgment_text):
             try:
-                judgment = json.loads(judgment_text.strip())
+                judgment = orjson.loads(judgment_text)
                 return {
                     "judgment": judgment,
                     "reasoning": reasoning
                 }
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # Not valid JSON, continue with other parsing methods
                 pass
         
@@ -83,7 +291,7 @@ class OutputParser:
             "reasoning": reasoning
         }
     
-    def parse_pairwise_comparison(
+    def _parse_pairwise_comparison(
         self, 
         raw_output: str, 
         template_id: Optional[str] = None,
@@ -103,30 +311,15 @@ class OutputParser:
             A dictionary containing the parsed preference and reasoning
         """
         # Extract reasoning if it was requested
-        reasoning = None
-        judgment_text = raw_output
-        
-        if provide_reasoning:
-            # Look for a reasoning section
-            reasoning_match = re.search(r"Reasoning:(.+?)$", raw_output, re.DOTALL)
-            if reasoning_match:
-                reasoning = reasoning_match.group(1).strip()
-                # Remove the reasoning section from the judgment text
-                judgment_text = raw_output[:reasoning_match.start()].strip()
-            else:
-                # Try to split by newlines and assume reasoning comes after
-                lines = raw_output.split("\n")
-                if len(lines) > 1:
-                    judgment_text = lines[0].strip()
-                    reasoning = "\n".join(lines[1:]).strip()
+        judgment_text, reasoning = _split_reasoning(raw_output, provide_reasoning)
         
         # Try to determine preference (A, B, or EQUAL)
         preference = None
         
         # First, check if the output is JSON
-        if judgment_text.strip().startswith("{") and judgment_text.strip().endswith("}"):
+        if _looks_like_json(judgment_text):
             try:
-                preference_data = json.loads(judgment_text.strip())
+                preference_data = orjson.loads(judgment_text)
                 if "preference" in preference_data:
                     preference = preference_data["preference"]
                 elif "preferred_text" in preference_data:
@@ -141,7 +334,7 @@ class OutputParser:
                     "judgment": preference,
                     "reasoning": reasoning
                 }
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # Not valid JSON, continue with other parsing methods
                 pass
         
@@ -151,25 +344,22 @@ class OutputParser:
         
         # If no result from parser rules, try some common patterns
         if preference is None:
-            # Look for A or B mentions
-            a_pattern = re.compile(r"\b(?:a|text a|option a)\b", re.IGNORECASE)
-            b_pattern = re.compile(r"\b(?:b|text b|option b)\b", re.IGNORECASE)
-            equal_pattern = re.compile(r"\b(?:equal|same|tie|equivalent)\b", re.IGNORECASE)
-            
-            a_matches = a_pattern.findall(judgment_text.lower())
-            b_matches = b_pattern.findall(judgment_text.lower())
-            equal_matches = equal_pattern.findall(judgment_text.lower())
+            # Count A, B and tie mentions in one pass; the pattern ignores case itself
+            mentions = {"A": 0, "B": 0, "EQUAL": 0}
+            for match in _MENTION_PATTERN.finditer(judgment_text):
+                mentions[match.lastgroup] += 1
             
             # Simple heuristic: choose the option with more mentions
-            if len(equal_matches) > 0 and (len(equal_matches) >= len(a_matches) and len(equal_matches) >= len(b_matches)):
+            if mentions["EQUAL"] > 0 and (mentions["EQUAL"] >= mentions["A"] and mentions["EQUAL"] >= mentions["B"]):
                 preference = "EQUAL"
-            elif len(a_matches) > len(b_matches):
+            elif mentions["A"] > mentions["B"]:
                 preference = "A"
-            elif len(b_matches) > len(a_matches):
+            elif mentions["B"] > mentions["A"]:
                 preference = "B"
-            elif "a" in judgment_text.lower():
+            # Only a tie in mentions needs the single lowercase copy of the text
+            elif "a" in (lowered := judgment_text.lower()):
                 preference = "A"
-            elif "b" in judgment_text.lower():
+            elif "b" in lowered:
                 preference = "B"
             else:
                 preference = "EQUAL"  # Default if no clear preference
@@ -179,6 +369,78 @@ class OutputParser:
             "reasoning": reasoning
         }
     
+    def is_decided(
+        self,
+        partial_output: str,
+        parser_rules: Optional[Dict[str, Any]],
+        provide_reasoning: bool = False
+    ) -> bool:
+        """
+        Check whether a partial single evaluation output already fixes the judgment.
+        
+        This is the case for binary rules once a positive pattern has appeared,
+        since positive patterns take precedence over anything generated later,
+        and for numeric rules once their pattern has matched and the line
+        holding the match is complete, since the first match wins. Callers
+        streaming the output can then stop the generation early.
+        
+        Args:
+            partial_output: The output generated so far
+            parser_rules: Parser rules of the template in use (optional)
+            provide_reasoning: Whether reasoning was requested
+            
+        Returns:
+            True if the rest of the output cannot change the parsed judgment
+        """
+        # The reasoning is part of the result, and JSON output is parsed as a whole
+        if provide_reasoning or not parser_rules or parser_rules.get("type") not in ("binary", "numeric"):
+            return False
+        if partial_output.lstrip().startswith(("{", "`")):
+            return False
+        
+        if parser_rules["type"] == "numeric":
+            match = _compile_regex(parser_rules.get("pattern", _DEFAULT_RATING_PATTERN)).search(partial_output)
+            # A match that is not a number falls through to other parsing of the full output
+            return (
+                match is not None
+                and "\n" in partial_output[match.end():]
+                and match.group(1).isdigit()
+            )
+        
+        positive_patterns = parser_rules.get("positive_patterns", ["yes", "true", "positive"])
+        return bool(positive_patterns) and _compile_patterns(tuple(positive_patterns)).search(partial_output) is not None
+    
+    def is_comparison_decided(
+        self,
+        partial_output: str,
+        parser_rules: Optional[Dict[str, Any]],
+        provide_reasoning: bool = False
+    ) -> bool:
+        """
+        Check whether a partial pairwise comparison output already fixes the preference.
+        
+        This is the case for preference rules once their pattern has matched and
+        the line holding the match is complete, since the first match wins.
+        Callers streaming the output can then stop the generation early.
+        
+        Args:
+            partial_output: The output generated so far
+            parser_rules: Parser rules of the template in use (optional)
+            provide_reasoning: Whether reasoning was requested
+            
+        Returns:
+            True if the rest of the output cannot change the parsed preference
+        """
+        # The reasoning is part of the result, and JSON output is parsed as a whole
+        if provide_reasoning or not parser_rules or parser_rules.get("type") != "preference":
+            return False
+        if partial_output.lstrip().startswith(("{", "`")):
+            return False
+        
+        pattern = parser_rules.get("pattern", _DEFAULT_PREFERENCE_PATTERN)
+        match = _compile_regex(pattern, re.IGNORECASE).search(partial_output)
+        return match is not None and "\n" in partial_output[match.end():]
+    
     def _apply_parser_rules(self, text: str, rules: Dict[str, Any]) -> Any:
         """Apply parser rules to extract structured data from text."""
         rule_type = rules.get("type", "text")
@@ -188,23 +450,20 @@ class OutputParser:
             positive_patterns = rules.get("positive_patterns", ["yes", "true", "positive"])
             negative_patterns = rules.get("negative_patterns", ["no", "false", "negative"])
             
-            text_lower = text.lower()
-            
-            for pattern in positive_patterns:
-                if pattern.lower() in text_lower:
-                    return True
+            # Each pattern list is compiled once and scanned in a single pass
+            if positive_patterns and _compile_patterns(tuple(positive_patterns)).search(text):
+                return True
             
-            for pattern in negative_patterns:
-                if pattern.lower() in text_lower:
-                    return False
+            if negative_patterns and _compile_patterns(tuple(negative_patterns)).search(text):
+                return False
             
             # No match found
             return None
         
         elif rule_type == "numeric":
             # Numeric rating (e.g., 1-5 scale)
-            pattern = rules.get("pattern", r"\b([1-5])\b")
-            match = re.search(pattern, text)
+            pattern = rules.get("pattern", _DEFAULT_RATING_PATTERN)
+            match = _compile_regex(pattern).search(text)
             
             if match:
                 try:
@@ -216,15 +475,14 @@ class OutputParser:
         
         elif rule_type == "preference":
             # Preference (e.g., A vs B)
-            pattern = rules.get("pattern", r"(?:(?:Text|Option|Response)\s*)?([AB])")
-            match = re.search(pattern, text, re.IGNORECASE)
+            pattern = rules.get("pattern", _DEFAULT_PREFERENCE_PATTERN)
+            match = _compile_regex(pattern, re.IGNORECASE).search(text)
             
             if match:
                 return match.group(1).upper()
             
             # Check for EQUAL or similar
-            equal_pattern = re.compile(r"\b(?:equal|same|tie|equivalent)\b", re.IGNORECASE)
-            if equal_pattern.search(text):
+            if _EQUAL_PATTERN.search(text):
                 return "EQUAL"
             
             return None
@@ -232,14 +490,14 @@ class OutputParser:
         elif rule_type == "json":
             # Try to parse as JSON
             try:
-                return json.loads(text)
-            except json.JSONDecodeError:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
                 return None
         
         elif rule_type == "regex":
             # Use a custom regex pattern
             pattern = rules.get("pattern", "")
-            match = re.search(pattern, text)
+            match = _compile_regex(pattern).search(text)
             
             if match:
                 # Return the capture group or the entire match
@@ -256,32 +514,22 @@ class OutputParser:
     
     def _parse_binary_classification(self, text: str) -> Optional[bool]:
         """Parse binary classification output (yes/no, true/false, etc.)."""
-        text_lower = text.lower().strip()
-        
-        # Common positive terms
-        positive_terms = ["yes", "true", "positive", "correct", "acceptable", "safe", "allow", "allowed", "approve", "approved"]
-        # Common negative terms
-        negative_terms = ["no", "false", "negative", "incorrect", "unacceptable", "unsafe", "deny", "denied", "reject", "rejected"]
+        if _POSITIVE_TERMS.search(text):
+            return True
         
-        for term in positive_terms:
-            if term in text_lower or term == text_lower:
-                return True
-        
-        for term in negative_terms:
-            if term in text_lower or term == text_lower:
-                return False
+        if _NEGATIVE_TERMS.search(text):
+            return False
         
         return None
     
     def _parse_numeric_rating(self, text: str) -> Optional[int]:
         """Parse numeric rating output (e.g., 1-5 scale)."""
-        # Look for digits
-        matches = re.findall(r"\b(\d+)\b", text)
+        # Look for the first number; the rest of the text need not be scanned
+        match = _NUMBER_PATTERN.search(text)
         
-        if matches:
+        if match:
             try:
-                # Return the first number found
-                return int(matches[0])
+                return int(match.group(1))
             except ValueError:
                 return None
         
@@ -1,99 +1,258 @@
-import json
+import copy
 import os
+import sys
+import threading
 import uuid
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+
+import orjson
 
 from vllm_judge.core.config import settings
 from vllm_judge.core.errors import PromptTemplateError, TemplateNotFoundError
 from vllm_judge.core.models import CustomPromptSegments
+from vllm_judge.services.segments import render_segment
+
+# Delay before a template change is written to the template file, in seconds;
+# changes made within it are written together
+TEMPLATE_SAVE_DELAY = 0.25
+
+# Templates used when a request names none
+_BINARY_TEMPLATE_ID = sys.intern("binary_classification")
+_PAIRWISE_TEMPLATE_ID = sys.intern("pairwise_comparison")
+
+# Templates the template file starts with when it does not exist yet
+_DEFAULT_TEMPLATES: Dict[str, Any] = {
+    "templates": {
+        # Binary classification template
+        "binary_classification": {
+            "template_id": "binary_classification",
+            "template_name": "Binary Classification",
+            "target_judge_model_family": None,
+            "description": "Template for binary classification tasks (yes/no, safe/unsafe, etc.)",
+            "prompt_structure": {
+                "system_message": "You are an expert evaluator. Your task is to analyze the given content and make a binary classification decision based on the provided criteria.",
+                "user_instruction_prefix": "Please evaluate the following content based on these criteria:\n\n{evaluation_criteria}\n\nContent to evaluate:\n\n",
+                "user_instruction_suffix": "\n\n{output_format_instruction}"
+            },
+            "output_parser_rules": {
+                "type": "binary",
+                "positive_patterns": ["yes", "true", "safe", "positive", "acceptable"],
+                "negative_patterns": ["no", "false", "unsafe", "negative", "unacceptable"]
+            }
+        },
+        # Likert scale template
+        "likert_scale": {
+            "template_id": "likert_scale",
+            "template_name": "Likert Scale Evaluation",
+            "target_judge_model_family": None,
+            "description": "Template for Likert scale evaluations (rating on a scale, e.g., 1-5)",
+            "prompt_structure": {
+                "system_message": "You are an expert evaluator. Your task is to rate the given content on a scale based on the provided criteria.",
+                "user_instruction_prefix": "Please evaluate the following content based on these criteria:\n\n{evaluation_criteria}\n\nContent to evaluate:\n\n",
+                "user_instruction_suffix": "\n\n{output_format_instruction}"
+            },
+            "output_parser_rules": {
+                "type": "numeric",
+                "pattern": r"\b([1-5])\b"
+            }
+        },
+        # Pairwise comparison template
+        "pairwise_comparison": {
+            "template_id": "pairwise_comparison",
+            "template_name": "Pairwise Comparison",
+            "target_judge_model_family": None,
+            "description": "Template for comparing two texts and selecting the better one",
+            "prompt_structure": {
+                "system_message": "You are an expert evaluator. Your task is to compare two texts and select the better one based on the provided criteria.",
+                "user_instruction_prefix": "Please compare the following two texts based on these criteria:\n\n{comparison_criteria}\n\nText A:\n\n{text_A}\n\nText B:\n\n{text_B}\n\n",
+                "user_instruction_suffix": "\n\n{output_format_instruction}"
+            },
+            "output_parser_rules": {
+                "type": "preference",
+                "pattern": r"(?:(?:Text|Option|Response)\s*)?([AB])"
+            }
+        }
+    }
+}
+
+
+@lru_cache(maxsize=1024)
+def _format_evaluation_segments(
+    user_instruction_prefix: str,
+    user_instruction_suffix: Optional[str],
+    evaluation_criteria: str,
+    output_format_instruction: str,
+) -> Tuple[str, str]:
+    """
+    Format the parts of a single evaluation prompt around the text being evaluated.
+    
+    Batch workloads repeat the same template, criteria and output format with
+    only the text changing, so the formatted parts are memoized. The key is the
+    segment text itself, so changed templates never hit stale entries.
+    """
+    prefix = render_segment(
+        user_instruction_prefix,
+        evaluation_criteria=evaluation_criteria,
+        output_format_instruction=output_format_instruction,
+    )
+    suffix = "" if user_instruction_suffix is None else render_segment(
+        user_instruction_suffix,
+        output_format_instruction=output_format_instruction,
+    )
+    return prefix, suffix
+
+
+def _freeze_value(value: Any) -> Any:
+    """Make a template value read-only: dicts become read-only mappings and lists tuples."""
+    if isinstance(value, MappingProxyType):
+        return value
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze_value(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze_value(v) for v in value)
+    return value
+
+
+def _thaw_value(value: Any) -> Any:
+    """Turn a read-only template value back into plain dicts and lists."""
+    if isinstance(value, Mapping):
+        return {k: _thaw_value(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw_value(v) for v in value]
+    return value
+
+
+def _freeze_template(template: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Make a template read-only throughout, so no caller can change it in place."""
+    return _freeze_value(template)
+
+
+def thaw_template(template: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a stored template into plain, modifiable dicts and lists.
+    
+    Args:
+        template: Template as returned by PromptManager
+        
+    Returns:
+        The template as plain dicts and lists
+    """
+    return _thaw_value(template)
 
 
 class PromptManager:
-    """Manages prompt templates and their generation."""
+    """
+    Manages prompt templates and their generation.
+    
+    Templates are held in a read-only mapping that is replaced as a whole on
+    every change, so lookups never take the lock and never see a half-applied
+    change.
+    """
     
     def __init__(self, template_path: Optional[str] = None):
         self.template_path = template_path or settings.TEMPLATE_STORAGE_PATH
-        self.templates = self._load_templates()
+        self._templates: Mapping[str, Mapping[str, Any]] = self._freeze(
+            self._load_templates()["templates"]
+        )
+        # Serializes template changes, which may be made from worker threads
+        self._lock = threading.Lock()
+        # Pending write of the template file, and the lock serializing writes
+        self._save_timer: Optional[threading.Timer] = None
+        self._write_lock = threading.Lock()
+    
+    @property
+    def template_snapshot(self) -> Mapping[str, Mapping[str, Any]]:
+        """
+        Current templates by ID.
+        
+        The mapping is a snapshot: it is never changed in place, and a new one
+        is put in its place whenever a template is created, updated or deleted.
+        """
+        return self._templates
+    
+    @property
+    def templates(self) -> Mapping[str, Mapping[str, Mapping[str, Any]]]:
+        """
+        Current templates in the template file's layout, {"templates": {id: template}}.
+        
+        The view is read-only; use create_template, update_template and
+        delete_template to change templates.
+        """
+        return MappingProxyType({"templates": self._templates})
+        
+    @staticmethod
+    def _freeze(templates: Dict[str, Dict[str, Any]]) -> Mapping[str, Mapping[str, Any]]:
+        """
+        Make a read-only snapshot of templates.
+        
+        The IDs are interned, so looking up a default template with the
+        module's constant IDs matches keys by identity, and the templates
+        are read-only throughout, so they can be used without copying.
+        """
+        return MappingProxyType({sys.intern(k): _freeze_template(v) for k, v in templates.items()})
         
     def _load_templates(self) -> Dict[str, Any]:
         """Load templates from the template file."""
         if not os.path.exists(self.template_path):
-            # Create template file with default templates if it doesn't exist
-            os.makedirs(os.path.dirname(self.template_path), exist_ok=True)
-            default_templates = self._get_default_templates()
-            with open(self.template_path, "w") as f:
-                json.dump(default_templates, f, indent=2)
-            return default_templates
+            # Start from the default templates; the file is written on the first change
+            return copy.deepcopy(_DEFAULT_TEMPLATES)
         
+        # Parse the raw bytes, without decoding them to a str first
         try:
-            with open(self.template_path, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            with open(self.template_path, "rb") as f:
+                return orjson.loads(f.read())
+        except orjson.JSONDecodeError:
             raise PromptTemplateError("Failed to parse template file")
             
-    def _save_templates(self) -> None:
-        """Save templates to the template file."""
+    def _save_templates(self, templates: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Make templates the current ones and schedule writing them to the template file.
+        
+        The write is delayed by TEMPLATE_SAVE_DELAY and restarted by every
+        further change, so a burst of changes, e.g. an import of many
+        templates, rewrites the file once. Must be called with the lock held.
+        """
+        self._templates = self._freeze(templates)
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        # Not a daemon thread, so a pending write still happens when the process exits
+        self._save_timer = threading.Timer(TEMPLATE_SAVE_DELAY, self.flush)
+        self._save_timer.start()
+    
+    def flush(self) -> None:
+        """Write pending template changes to the template file now."""
+        with self._lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
+            self._save_timer = None
+        
+        # Always write the latest templates, so a late write never undoes a newer one
+        with self._write_lock:
+            self._write_templates(self._templates)
+    
+    def _write_templates(self, templates: Mapping[str, Mapping[str, Any]]) -> None:
+        """
+        Write templates to the template file.
+        
+        The file is written under a temporary name and then renamed over the
+        old one, so a crash mid-write never leaves a truncated template file.
+        """
         os.makedirs(os.path.dirname(self.template_path), exist_ok=True)
-        with open(self.template_path, "w") as f:
-            json.dump(self.templates, f, indent=2)
+        data = orjson.dumps(
+            {"templates": dict(templates)},
+            # Read-only templates are written as plain objects
+            default=dict,
+            option=orjson.OPT_INDENT_2,
+        )
+        tmp_path = f"{self.template_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.template_path)
     
-    def _get_default_templates(self) -> Dict[str, Any]:
-        """Get default prompt templates."""
-        return {
-            "templates": {
-                # Binary classification template
-                "binary_classification": {
-                    "template_id": "binary_classification",
-                    "template_name": "Binary Classification",
-                    "target_judge_model_family": None,
-                    "description": "Template for binary classification tasks (yes/no, safe/unsafe, etc.)",
-                    "prompt_structure": {
-                        "system_message": "You are an expert evaluator. Your task is to analyze the given content and make a binary classification decision based on the provided criteria.",
-                        "user_instruction_prefix": "Please evaluate the following content based on these criteria:\n\n{evaluation_criteria}\n\nContent to evaluate:\n\n",
-                        "user_instruction_suffix": "\n\n{output_format_instruction}"
-                    },
-                    "output_parser_rules": {
-                        "type": "binary",
-                        "positive_patterns": ["yes", "true", "safe", "positive", "acceptable"],
-                        "negative_patterns": ["no", "false", "unsafe", "negative", "unacceptable"]
-                    }
-                },
-                # Likert scale template
-                "likert_scale": {
-                    "template_id": "likert_scale",
-                    "template_name": "Likert Scale Evaluation",
-                    "target_judge_model_family": None,
-                    "description": "Template for Likert scale evaluations (rating on a scale, e.g., 1-5)",
-                    "prompt_structure": {
-                        "system_message": "You are an expert evaluator. Your task is to rate the given content on a scale based on the provided criteria.",
-                        "user_instruction_prefix": "Please evaluate the following content based on these criteria:\n\n{evaluation_criteria}\n\nContent to evaluate:\n\n",
-                        "user_instruction_suffix": "\n\n{output_format_instruction}"
-                    },
-                    "output_parser_rules": {
-                        "type": "numeric",
-                        "pattern": r"\b([1-5])\b"
-                    }
-                },
-                # Pairwise comparison template
-                "pairwise_comparison": {
-                    "template_id": "pairwise_comparison",
-                    "template_name": "Pairwise Comparison",
-                    "target_judge_model_family": None,
-                    "description": "Template for comparing two texts and selecting the better one",
-                    "prompt_structure": {
-                        "system_message": "You are an expert evaluator. Your task is to compare two texts and select the better one based on the provided criteria.",
-                        "user_instruction_prefix": "Please compare the following two texts based on these criteria:\n\n{comparison_criteria}\n\nText A:\n\n{text_A}\n\nText B:\n\n{text_B}\n\n",
-                        "user_instruction_suffix": "\n\n{output_format_instruction}"
-                    },
-                    "output_parser_rules": {
-                        "type": "preference",
-                        "pattern": r"(?:(?:Text|Option|Response)\s*)?([AB])"
-                    }
-                }
-            }
-        }
-            
-    def get_template(self, template_id: str) -> Dict[str, Any]:
+    def get_template(self, template_id: str) -> Mapping[str, Any]:
         """
         Get a prompt template by ID.
         
@@ -106,10 +265,24 @@ class PromptManager:
         Raises:
             TemplateNotFoundError: If the template is not found
         """
-        if template_id not in self.templates["templates"]:
+        template = self._templates.get(template_id)
+        if template is None:
             raise TemplateNotFoundError(template_id)
         
-        return self.templates["templates"][template_id]
+        return template
+        
+    def get_parser_rules(self, template_id: Optional[str]) -> Optional[Mapping[str, Any]]:
+        """
+        Get the output parser rules of a template.
+        
+        Args:
+            template_id: ID of the template, if one was used
+            
+        Returns:
+            The template's parser rules, or None if there is no such template or it has none
+        """
+        template = self._templates.get(template_id) if template_id else None
+        return template.get("output_parser_rules") if template else None
         
     def create_template(self, template_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -123,17 +296,15 @@ class PromptManager:
         """
         # Generate a unique ID for the template
         template_id = str(uuid.uuid4())
-        
-        # Add the template to the templates dictionary
-        self.templates["templates"][template_id] = {
+        template = {
             "template_id": template_id,
             **template_data
         }
         
-        # Save the templates
-        self._save_templates()
+        with self._lock:
+            self._save_templates({**self._templates, template_id: template})
         
-        return self.templates["templates"][template_id]
+        return template
         
     def update_template(self, template_id: str, template_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -149,16 +320,16 @@ class PromptManager:
         Raises:
             TemplateNotFoundError: If the template is not found
         """
-        if template_id not in self.templates["templates"]:
-            raise TemplateNotFoundError(template_id)
-        
-        # Update the template
-        self.templates["templates"][template_id].update(template_data)
-        
-        # Save the templates
-        self._save_templates()
+        with self._lock:
+            current = self._templates.get(template_id)
+            if current is None:
+                raise TemplateNotFoundError(template_id)
+            
+            # Build an updated copy; the current template may still be in use
+            template = {**current, **template_data}
+            self._save_templates({**self._templates, template_id: template})
         
-        return self.templates["templates"][template_id]
+        return template
         
     def delete_template(self, template_id: str) -> None:
         """
@@ -170,14 +341,12 @@ class PromptManager:
         Raises:
             TemplateNotFoundError: If the template is not found
         """
-        if template_id not in self.templates["templates"]:
-            raise TemplateNotFoundError(template_id)
-        
-        # Delete the template
-        del self.templates["templates"][template_id]
-        
-        # Save the templates
-        self._save_templates()
+        with self._lock:
+            templates = dict(self._templates)
+            if templates.pop(template_id, None) is None:
+                raise TemplateNotFoundError(template_id)
+            
+            self._save_templates(templates)
         
     def list_templates(self) -> List[Dict[str, Any]]:
         """
@@ -186,7 +355,77 @@ class PromptManager:
         Returns:
             List of templates
         """
-        return list(self.templates["templates"].values())
+        return list(self._templates.values())
+        
+    def _resolve_prompt_structure(
+        self,
+        template_id: str,
+        custom_prompt_segments: Optional[CustomPromptSegments] = None,
+    ) -> Mapping[str, str]:
+        """
+        Get the prompt structure of a template with custom segments applied.
+        
+        The stored template is never modified, so every request using a template
+        renders the same prompt prefix and can hit vLLM's prefix cache.
+        
+        Args:
+            template_id: ID of the template to use
+            custom_prompt_segments: Custom segments to override parts of the template (optional)
+            
+        Returns:
+            The template's prompt structure, or a copy of it with the custom
+            segments applied; must not be modified
+            
+        Raises:
+            PromptTemplateError: If the template is not found
+        """
+        try:
+            prompt_structure = self.get_template(template_id)["prompt_structure"]
+        except TemplateNotFoundError:
+            raise PromptTemplateError(f"Template not found: {template_id}")
+        
+        # Override template segments with custom segments if provided
+        if custom_prompt_segments:
+            overrides = {
+                segment: value
+                for segment in ("system_message", "user_instruction_prefix", "user_instruction_suffix")
+                if (value := custom_prompt_segments.get(segment))
+            }
+            if overrides:
+                prompt_structure = {**prompt_structure, **overrides}
+        
+        return prompt_structure
+        
+    def generate_template_prefix_prompt(self, template_id: str) -> List[Dict[str, str]]:
+        """
+        Generate the static leading part of a template's prompt.
+        
+        This is the system message plus the user instruction prefix up to its first
+        placeholder, which every prompt rendered from the template starts with.
+        Sending it to vLLM once fills the prefix cache for later evaluations.
+        
+        Args:
+            template_id: ID of the template
+            
+        Returns:
+            A list of messages in the format expected by the vLLM server
+            
+        Raises:
+            TemplateNotFoundError: If the template is not found
+        """
+        prompt_structure = self.get_template(template_id)["prompt_structure"]
+        static_prefix = prompt_structure["user_instruction_prefix"].split("{", 1)[0]
+        
+        return [
+            {
+                "role": "system",
+                "content": prompt_structure["system_message"],
+            },
+            {
+                "role": "user",
+                "content": static_prefix,
+            },
+        ]
         
     def generate_single_evaluation_prompt(
         self,
@@ -224,35 +463,19 @@ class PromptManager:
             )
             
         # Use the provided template or default to binary classification
-        template = None
-        if prompt_template_id:
-            try:
-                template = self.get_template(prompt_template_id)["prompt_structure"]
-            except TemplateNotFoundError:
-                raise PromptTemplateError(f"Template not found: {prompt_template_id}")
-        else:
-            # Use the binary classification template
-            template = self.get_template("binary_classification")["prompt_structure"]
-            
-        # Override template segments with custom segments if provided
-        if custom_prompt_segments:
-            if custom_prompt_segments.system_message:
-                template["system_message"] = custom_prompt_segments.system_message
-            if custom_prompt_segments.user_instruction_prefix:
-                template["user_instruction_prefix"] = custom_prompt_segments.user_instruction_prefix
-            if custom_prompt_segments.user_instruction_suffix:
-                template["user_instruction_suffix"] = custom_prompt_segments.user_instruction_suffix
+        template = self._resolve_prompt_structure(
+            prompt_template_id or _BINARY_TEMPLATE_ID,
+            custom_prompt_segments,
+        )
                 
-        # Format the prompt
-        user_content = template["user_instruction_prefix"].format(
-            evaluation_criteria=evaluation_criteria,
-            output_format_instruction=output_format_instruction,
-        ) + text_to_evaluate
-        
-        if "user_instruction_suffix" in template:
-            user_content += template["user_instruction_suffix"].format(
-                output_format_instruction=output_format_instruction,
-            )
+        # Format the prompt; only the text differs between calls with the same template
+        prefix, suffix = _format_evaluation_segments(
+            template["user_instruction_prefix"],
+            template.get("user_instruction_suffix"),
+            evaluation_criteria,
+            output_format_instruction,
+        )
+        user_content = prefix + text_to_evaluate + suffix
             
         # Create the chat messages
         messages = [
@@ -274,7 +497,7 @@ class PromptManager:
         text_B: str,
         comparison_criteria: str,
         prompt_template_id: Optional[str] = None,
-        custom_prompt_segments: Optional[Dict[str, str]] = None,
+        custom_prompt_segments: Optional[CustomPromptSegments] = None,
         output_format_instruction: Optional[str] = None,
         provide_reasoning: bool = False,
     ) -> List[Dict[str, str]]:
@@ -306,27 +529,14 @@ class PromptManager:
             )
             
         # Use the provided template or default to pairwise comparison
-        template = None
-        if prompt_template_id:
-            try:
-                template = self.get_template(prompt_template_id)["prompt_structure"]
-            except TemplateNotFoundError:
-                raise PromptTemplateError(f"Template not found: {prompt_template_id}")
-        else:
-            # Use the pairwise comparison template
-            template = self.get_template("pairwise_comparison")["prompt_structure"]
-            
-        # Override template segments with custom segments if provided
-        if custom_prompt_segments:
-            if custom_prompt_segments.get("system_message"):
-                template["system_message"] = custom_prompt_segments.get("system_message")
-            if custom_prompt_segments.get("user_instruction_prefix"):
-                template["user_instruction_prefix"] = custom_prompt_segments.get("user_instruction_prefix")
-            if custom_prompt_segments.get("user_instruction_suffix"):
-                template["user_instruction_suffix"] = custom_prompt_segments.get("user_instruction_suffix")
+        template = self._resolve_prompt_structure(
+            prompt_template_id or _PAIRWISE_TEMPLATE_ID,
+            custom_prompt_segments,
+        )
                 
         # Format the prompt
-        user_content = template["user_instruction_prefix"].format(
+        user_content = render_segment(
+            template["user_instruction_prefix"],
             comparison_criteria=comparison_criteria,
             text_A=text_A,
             text_B=text_B,
@@ -334,7 +544,8 @@ class PromptManager:
         )
         
         if "user_instruction_suffix" in template:
-            user_content += template["user_instruction_suffix"].format(
+            user_content += render_segment(
+                template["user_instruction_suffix"],
                 output_format_instruction=output_format_instruction,
             )
             
@@ -0,0 +1,42 @@
+import string
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+
+@lru_cache(maxsize=256)
+def compile_segment(segment: str) -> Optional[Tuple[Tuple[Optional[str], ...], Tuple[Tuple[int, str], ...]]]:
+    """
+    Split a prompt segment into its pieces and the positions of its placeholders.
+    
+    Returns None for segments using format specs, conversions or indexing,
+    which are left to str.format.
+    """
+    pieces: List[Optional[str]] = []
+    slots: List[Tuple[int, str]] = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(segment):
+        if literal:
+            pieces.append(literal)
+        if field is not None:
+            if format_spec or conversion or not field.isidentifier():
+                return None
+            slots.append((len(pieces), field))
+            pieces.append(None)
+    return tuple(pieces), tuple(slots)
+
+
+def render_segment(segment: str, **values: str) -> str:
+    """
+    Fill the placeholders of a prompt segment, like segment.format(**values).
+    
+    The segment is parsed once and then filled by joining its pieces, which
+    skips the format string parsing str.format repeats on every call.
+    """
+    compiled = compile_segment(segment)
+    if compiled is None:
+        return segment.format(**values)
+    
+    pieces, slots = compiled
+    filled = list(pieces)
+    for index, field in slots:
+        filled[index] = values[field]
+    return "".join(filled)
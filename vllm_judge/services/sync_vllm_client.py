@@ -1,7 +1,10 @@
-import json
-from typing import Dict, Any, Optional, List
+import asyncio
+from typing import Dict, Any, Optional, List, Iterator, Union
 
-import requests
+import httpx
+import orjson
+
+from vllm_judge.services import http_pool
 
 
 class SyncVLLMClient:
@@ -24,15 +27,30 @@ class SyncVLLMClient:
             self.api_base = f"{self.api_base}/v1"
         self.api_key = api_key
         self.timeout = timeout
-    
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers for API requests."""
-        headers = {
-            "Content-Type": "application/json",
-        }
+        
+        # Every request goes to the same endpoint with the same headers
+        self.completions_url = f"{self.api_base}/chat/completions"
+        self.headers = {"Content-Type": "application/json"}
         if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
+            self.headers["Authorization"] = f"Bearer {self.api_key}"
+        
+        # Blocking calls reuse pooled connections instead of opening one per
+        # request; with the http2 extra, an HTTPS server gets one multiplexed
+        # connection
+        self._http = httpx.Client(
+            timeout=httpx.Timeout(timeout),
+            transport=httpx.HTTPTransport(
+                http2=http_pool.HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                # Retry failed connection attempts; sent requests are never retried
+                retries=3
+            )
+        )
+    
+    def close(self) -> None:
+        """Close the pooled connections of the blocking calls."""
+        self._http.close()
+    
     
     def generate_completion(self, 
                            model: str, 
@@ -52,14 +70,14 @@ class SyncVLLMClient:
             Completion response
         """
         try:
-            response = requests.post(
-                f"{self.api_base}/chat/completions",
-                headers=self._get_headers(),
-                json={
+            response = self._http.post(
+                self.completions_url,
+                headers=self.headers,
+                content=orjson.dumps({
                     "model": model,
                     "messages": messages,
                     **sampling_params
-                },
+                }),
                 timeout=self.timeout
             )
             
@@ -67,8 +85,150 @@ class SyncVLLMClient:
                 error_message = f"Failed to generate completion: {response.status_code} - {response.text}"
                 raise ValueError(error_message)
             
-            return response.json()
-        except requests.RequestException as e:
+            return orjson.loads(response.content)
+        except httpx.HTTPError as e:
             raise ValueError(f"Network error when contacting vLLM server: {str(e)}")
-        except json.JSONDecodeError:
-            raise ValueError("Failed to parse response from vLLM server")
\ No newline at end of file
+        except orjson.JSONDecodeError:
+            raise ValueError("Failed to parse response from vLLM server")
+    
+    def generate_completions_batch(self, 
+                                   model: str, 
+                                   messages_list: List[List[Dict[str, str]]], 
+                                   sampling_params: Dict[str, Any]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Generate completions for several conversations at once.
+        
+        Blocking counterpart of generate_completions_batch_async.
+        
+        Args:
+            model: Model ID to use
+            messages_list: The messages of each conversation
+            sampling_params: Parameters for sampling, shared by all conversations
+            
+        Returns:
+            The completion response for each conversation, or the exception raised for it
+        """
+        return http_pool.run(
+            self.generate_completions_batch_async(model, messages_list, sampling_params)
+        )
+    
+    async def generate_completions_batch_async(self, 
+                                               model: str, 
+                                               messages_list: List[List[Dict[str, str]]], 
+                                               sampling_params: Dict[str, Any]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Generate completions for several conversations at once.
+        
+        The requests are all sent over the shared connection pool before any
+        response is awaited, so vLLM schedules them in the same batch. Must be
+        run on the http_pool event loop.
+        
+        Args:
+            model: Model ID to use
+            messages_list: The messages of each conversation
+            sampling_params: Parameters for sampling, shared by all conversations
+            
+        Returns:
+            The completion response for each conversation, or the exception raised for it
+        """
+        http_client = http_pool.get_client()
+        return await asyncio.gather(
+            *(self._generate_completion_async(http_client, model, messages, sampling_params)
+              for messages in messages_list),
+            return_exceptions=True
+        )
+    
+    async def _generate_completion_async(self, 
+                                         http_client: httpx.AsyncClient, 
+                                         model: str, 
+                                         messages: List[Dict[str, str]], 
+                                         sampling_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Asynchronous counterpart of generate_completion, raising the same errors."""
+        try:
+            response = await http_client.post(
+                self.completions_url,
+                headers=self.headers,
+                content=orjson.dumps({
+                    "model": model,
+                    "messages": messages,
+                    **sampling_params
+                }),
+                timeout=self.timeout
+            )
+        except httpx.HTTPError as e:
+            raise ValueError(f"Network error when contacting vLLM server: {str(e)}")
+        
+        if response.status_code != 200:
+            error_message = f"Failed to generate completion: {response.status_code} - {response.text}"
+            raise ValueError(error_message)
+        
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise ValueError("Failed to parse response from vLLM server")
+    
+    def stream_completion(self, 
+                          model: str, 
+                          messages: List[Dict[str, str]], 
+                          sampling_params: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream a completion using vLLM's chat completion API.
+        
+        Closing the generator early closes the connection, which makes vLLM
+        abort the rest of the generation.
+        
+        Args:
+            model: Model ID to use
+            messages: List of message dictionaries
+            sampling_params: Parameters for sampling
+            
+        Yields:
+            Pieces of the generated text as they arrive
+        """
+        try:
+            with self._http.stream(
+                "POST",
+                self.completions_url,
+                headers=self.headers,
+                content=orjson.dumps({
+                    "model": model,
+                    "messages": messages,
+                    **sampling_params,
+                    "stream": True
+                }),
+                timeout=self.timeout
+            ) as response:
+                if response.status_code != 200:
+                    response.read()
+                    error_message = f"Failed to generate completion: {response.status_code} - {response.text}"
+                    raise ValueError(error_message)
+                
+                for line in response.iter_lines():
+                    delta = parse_stream_line(line)
+                    if delta:
+                        yield delta
+        except httpx.HTTPError as e:
+            raise ValueError(f"Network error when contacting vLLM server: {str(e)}")
+        except orjson.JSONDecodeError:
+            raise ValueError("Failed to parse response from vLLM server")
+
+
+def parse_stream_line(line: Optional[str]) -> Optional[str]:
+    """
+    Extract the generated text from one line of a chat completions event stream.
+    
+    Args:
+        line: A line of the server-sent event stream
+        
+    Returns:
+        The text delta, or None for lines that carry no text
+    """
+    if not line or not line.startswith("data:"):
+        return None
+    
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return None
+    
+    choices = orjson.loads(data).get("choices") or [{}]
+    return choices[0].get("delta", {}).get("content")
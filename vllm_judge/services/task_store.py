@@ -0,0 +1,313 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import orjson
+
+from vllm_judge.core.config import settings
+from vllm_judge.core.models import TaskStatus, EvaluationResult
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+
+# Statuses after which a task no longer changes
+FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+
+
+@dataclass(slots=True)
+class TaskRecord:
+    """State of an evaluation task."""
+    evaluation_id: str
+    status: TaskStatus
+    result: Optional[EvaluationResult] = None
+    error_message: Optional[str] = None
+    expires_at: float = 0.0
+    # Serialized status response, cached once the task has finished
+    response_json: Optional[bytes] = None
+
+
+class TaskStore:
+    """
+    In-process store of evaluation tasks.
+    
+    Tasks are spread over several dict shards and expire after a fixed time.
+    The sweeper clears one shard per tick, so expiring old tasks never pauses
+    the event loop for a scan of the whole store.
+    """
+    
+    def __init__(self, num_shards: Optional[int] = None, expiry_seconds: Optional[int] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            num_shards: Number of shards (defaults to the number of CPUs)
+            expiry_seconds: Time after its last update at which a task is dropped
+        """
+        self.num_shards = num_shards or os.cpu_count() or 1
+        self.expiry_seconds = expiry_seconds or settings.TASK_EXPIRY_SECONDS
+        self._shards: List[Dict[str, TaskRecord]] = [{} for _ in range(self.num_shards)]
+        self._sweeper: Optional[asyncio.Task] = None
+        # Events set when a task someone is waiting for finishes
+        self._waiters: Dict[str, asyncio.Event] = {}
+    
+    def _shard(self, evaluation_id: str) -> Dict[str, TaskRecord]:
+        """Get the shard holding a task."""
+        return self._shards[hash(evaluation_id) % self.num_shards]
+    
+    async def create(self, evaluation_id: str) -> None:
+        """
+        Add a pending task.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+        """
+        self._shard(evaluation_id)[evaluation_id] = TaskRecord(
+            evaluation_id=evaluation_id,
+            status=TaskStatus.PENDING,
+            expires_at=time.monotonic() + self.expiry_seconds,
+        )
+    
+    async def update(
+        self,
+        evaluation_id: str,
+        status: TaskStatus,
+        result: Optional[EvaluationResult] = None,
+        error_message: Optional[str] = None,
+    ) -> None:
+        """
+        Update the state of a task.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+            status: New status of the task
+            result: Result of the evaluation, if completed
+            error_message: Error message, if the evaluation failed
+        """
+        self._shard(evaluation_id)[evaluation_id] = TaskRecord(
+            evaluation_id=evaluation_id,
+            status=status,
+            result=result,
+            error_message=error_message,
+            expires_at=time.monotonic() + self.expiry_seconds,
+        )
+        
+        if status in FINISHED_STATUSES and evaluation_id in self._waiters:
+            self._waiters.pop(evaluation_id).set()
+    
+    async def get(self, evaluation_id: str) -> Optional[TaskRecord]:
+        """
+        Get a task.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+        
+        Returns:
+            The task, or None if it does not exist or has expired
+        """
+        record = self._shard(evaluation_id).get(evaluation_id)
+        if record is None or record.expires_at < time.monotonic():
+            return None
+        return record
+    
+    async def wait(self, evaluation_id: str, timeout: float) -> Optional[TaskRecord]:
+        """
+        Get a task once it has finished, waiting for it at most timeout seconds.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+            timeout: Maximum time to wait, in seconds
+        
+        Returns:
+            The task, which may still be unfinished if the wait timed out,
+            or None if it does not exist or has expired
+        """
+        record = await self.get(evaluation_id)
+        if record is None or record.status in FINISHED_STATUSES or timeout <= 0:
+            return record
+        
+        event = self._waiters.setdefault(evaluation_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return await self.get(evaluation_id)
+    
+    async def delete(self, evaluation_id: str) -> None:
+        """
+        Remove a task.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+        """
+        self._shard(evaluation_id).pop(evaluation_id, None)
+        waiter = self._waiters.pop(evaluation_id, None)
+        if waiter is not None:
+            waiter.set()
+    
+    async def start(self) -> None:
+        """Start dropping expired tasks in the background."""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep())
+    
+    async def stop(self) -> None:
+        """Stop dropping expired tasks."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+    
+    async def _sweep(self) -> None:
+        """Clear expired tasks one shard at a time, visiting every shard once per minute."""
+        while True:
+            for shard in self._shards:
+                await asyncio.sleep(60 / self.num_shards)
+                now = time.monotonic()
+                for evaluation_id in [k for k, record in shard.items() if record.expires_at < now]:
+                    del shard[evaluation_id]
+
+
+class RedisTaskStore:
+    """
+    Store of evaluation tasks kept in Redis.
+    
+    Lets several server workers share task state, so a task's status can be
+    read from any worker. Redis expires the tasks itself.
+    """
+    
+    def __init__(self, url: str, expiry_seconds: Optional[int] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            url: Redis URL, e.g. redis://localhost:6379/0
+            expiry_seconds: Time after its last update at which a task is dropped
+        """
+        if redis is None:
+            raise ImportError(
+                "The Redis task store requires the 'redis' package. "
+                "Install it with: pip install vllm_judge[redis]"
+            )
+        self.expiry_seconds = expiry_seconds or settings.TASK_EXPIRY_SECONDS
+        self._redis = redis.from_url(url)
+    
+    @staticmethod
+    def _key(evaluation_id: str) -> str:
+        return f"vllm_judge:task:{evaluation_id}"
+    
+    async def create(self, evaluation_id: str) -> None:
+        """
+        Add a pending task.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+        """
+        await self.update(evaluation_id, TaskStatus.PENDING)
+    
+    async def update(
+        self,
+        evaluation_id: str,
+        status: TaskStatus,
+        result: Optional[EvaluationResult] = None,
+        error_message: Optional[str] = None,
+    ) -> None:
+        """
+        Update the state of a task.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+            status: New status of the task
+            result: Result of the evaluation, if completed
+            error_message: Error message, if the evaluation failed
+        """
+        await self._redis.set(
+            self._key(evaluation_id),
+            orjson.dumps({
+                "status": status.value,
+                "result": result.model_dump() if result else None,
+                "error_message": error_message,
+            }),
+            ex=self.expiry_seconds,
+        )
+    
+    async def get(self, evaluation_id: str) -> Optional[TaskRecord]:
+        """
+        Get a task.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+        
+        Returns:
+            The task, or None if it does not exist or has expired
+        """
+        data = await self._redis.get(self._key(evaluation_id))
+        if data is None:
+            return None
+        
+        task = orjson.loads(data)
+        return TaskRecord(
+            evaluation_id=evaluation_id,
+            status=TaskStatus(task["status"]),
+            result=EvaluationResult.model_construct(**task["result"]) if task["result"] else None,
+            error_message=task["error_message"],
+        )
+    
+    async def wait(self, evaluation_id: str, timeout: float) -> Optional[TaskRecord]:
+        """
+        Get a task once it has finished, waiting for it at most timeout seconds.
+        
+        Other server workers may finish the task, so Redis is polled with a
+        growing delay instead of waiting for a local event.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+            timeout: Maximum time to wait, in seconds
+        
+        Returns:
+            The task, which may still be unfinished if the wait timed out,
+            or None if it does not exist or has expired
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while True:
+            record = await self.get(evaluation_id)
+            remaining = deadline - time.monotonic()
+            if record is None or record.status in FINISHED_STATUSES or remaining <= 0:
+                return record
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 1.0)
+    
+    async def delete(self, evaluation_id: str) -> None:
+        """
+        Remove a task.
+        
+        Args:
+            evaluation_id: ID of the evaluation task
+        """
+        await self._redis.delete(self._key(evaluation_id))
+    
+    async def start(self) -> None:
+        """Nothing to start; Redis expires tasks itself."""
+    
+    async def stop(self) -> None:
+        """Close the connection to Redis."""
+        await self._redis.aclose()
+
+
+def create_task_store() -> Union[TaskStore, RedisTaskStore]:
+    """
+    Create the task store configured by TASK_STORE_URL.
+    
+    Returns:
+        A RedisTaskStore if TASK_STORE_URL is set, otherwise an in-process TaskStore
+    """
+    if settings.TASK_STORE_URL:
+        return RedisTaskStore(settings.TASK_STORE_URL)
+    return TaskStore()
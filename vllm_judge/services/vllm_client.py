@@ -1,69 +1,337 @@
-import json
+import asyncio
+import random
 import httpx
-import backoff
-from typing import Dict, Any, Optional
+import orjson
+from contextlib import aclosing
+from typing import Callable, Dict, Any, Optional, AsyncIterator, List, Union
 
 from vllm_judge.core.config import settings
 from vllm_judge.core.errors import VLLMServerError
+from vllm_judge.services.aiohttp_transport import AioHTTPTransport
+from vllm_judge.services.completion_cache import CompletionCache, LRUCache
+from vllm_judge.services.http_pool import HTTP2_AVAILABLE
+from vllm_judge.services.sync_vllm_client import parse_stream_line
+
+# Upper bound of the first pause before retrying a failed request, in seconds;
+# it doubles with every further attempt
+RETRY_BASE_DELAY = 0.5
 
 
 class VLLMClient:
     """Client for communicating with vLLM server."""
     
-    def __init__(self, api_base: Optional[str] = None, api_key: Optional[str] = None, timeout: Optional[int] = None):
+    def __init__(
+        self,
+        api_base: Optional[str] = None,
+        api_key: Optional[str] = None,
+        timeout: Optional[int] = None,
+        completion_cache_size: Optional[int] = None,
+        transport: Optional[str] = None,
+    ):
         self.api_base = api_base or settings.VLLM_API_BASE
         self.api_key = api_key or settings.VLLM_API_KEY
         self.timeout = timeout or settings.DEFAULT_TIMEOUT
         
+        # "httpx" for httpx's own connection pool, or "aiohttp"
+        self.transport = transport or settings.VLLM_HTTP_TRANSPORT
+        if self.transport not in ("httpx", "aiohttp"):
+            raise ValueError(f"Unsupported transport: {self.transport}")
+        
+        # Exact-match cache of deterministic completions; a size of 0 disables it
+        if completion_cache_size is None:
+            completion_cache_size = settings.COMPLETION_CACHE_SIZE
+        self.completion_cache: Optional[LRUCache] = (
+            LRUCache(maxsize=completion_cache_size) if completion_cache_size > 0 else None
+        )
+        
         # Ensure the API base URL ends with /v1
         if not self.api_base.endswith("/v1"):
             self.api_base = f"{self.api_base}/v1"
-            
-    def _get_headers(self) -> Dict[str, str]:
-        """Get the HTTP headers for requests to vLLM."""
-        headers = {
-            "Content-Type": "application/json",
-        }
+        
+        # Every request goes to the same endpoint with the same base headers
+        self._completions_url = f"{self.api_base}/chat/completions"
+        self._headers = {"Content-Type": "application/json"}
         if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
+            self._headers["Authorization"] = f"Bearer {self.api_key}"
+            
+        # Created on first use, inside the server's event loop
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client shared by all requests to vLLM."""
+        if self._client is None or self._client.is_closed:
+            if self.transport == "aiohttp":
+                self._client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.timeout, connect=5.0),
+                    transport=AioHTTPTransport(limit=256, limit_per_host=256),
+                )
+            else:
+                self._client = httpx.AsyncClient(
+                    http2=HTTP2_AVAILABLE,
+                    timeout=httpx.Timeout(self.timeout, connect=5.0),
+                    limits=httpx.Limits(
+                        max_connections=256,
+                        max_keepalive_connections=256,
+                    ),
+                )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            
+    def _get_headers(self, routing_key: Optional[str] = None) -> Dict[str, str]:
+        """
+        Get the HTTP headers for requests to vLLM.
+        
+        The routing key, e.g. a template ID, is sent in a routing header, so a
+        load balancer in front of several vLLM replicas can pin requests sharing
+        a template to one replica without parsing the body.
+        """
+        if routing_key and settings.ROUTING_KEY_HEADER:
+            return {**self._headers, settings.ROUTING_KEY_HEADER: routing_key}
+        return self._headers
+    
+    def _completion_cache_key(self, model: str, messages: list, sampling_params: Dict[str, Any]) -> Optional[str]:
+        """Get the completion cache key of a request, or None if it must not be cached."""
+        # Only greedy completions are reproducible, so only those are cached
+        if self.completion_cache is not None and sampling_params.get("temperature") == 0:
+            return CompletionCache.make_key(model, messages, sampling_params)
+        return None
     
-    @backoff.on_exception(
-        backoff.expo,
-        (httpx.RequestError, httpx.TimeoutException),
-        max_tries=settings.MAX_RETRY_ATTEMPTS,
-    )
-    async def generate_completion(self, model: str, messages: list, sampling_params: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_completion(
+        self,
+        model: str,
+        messages: list,
+        sampling_params: Dict[str, Any],
+        is_decided: Optional[Callable[[str], bool]] = None,
+        routing_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Generate a completion using the vLLM server's chat completions API.
         
+        Network errors are retried up to MAX_RETRY_ATTEMPTS times in all, with
+        exponential backoff and jitter between attempts.
+        
+        If is_decided is given, the completion is streamed and stopped as soon
+        as is_decided returns True for the output so far; the response then
+        only holds the message content generated up to that point. Like streams
+        closed early, such truncated responses are never stored in the
+        completion cache, though a cached full completion is still used.
+        
         Args:
             model: The model ID to use for generation
             messages: The messages to send to the model
             sampling_params: Parameters for the generation
+            is_decided: Optional check of the output so far that ends the generation early
+            routing_key: Key sent in the routing header, e.g. the template ID (optional)
             
         Returns:
             The response from the vLLM server
         """
+        cache_key = self._completion_cache_key(model, messages, sampling_params)
+        if cache_key is not None:
+            cached = self.completion_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        if is_decided is not None:
+            raw_output = ""
+            async with aclosing(self._stream_completion(model, messages, sampling_params, routing_key)) as deltas:
+                async for delta in deltas:
+                    raw_output += delta
+                    if is_decided(raw_output):
+                        # Where the output was cut depends on the caller's rules
+                        cache_key = None
+                        break
+            result = {"choices": [{"message": {"role": "assistant", "content": raw_output}}]}
+        else:
+            result = await self._post_completion(model, messages, sampling_params, routing_key)
+        
+        if cache_key is not None:
+            self.completion_cache.set(cache_key, result)
+        return result
+    
+    async def _post_completion(
+        self,
+        model: str,
+        messages: list,
+        sampling_params: Dict[str, Any],
+        routing_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Send one non-streaming completion request, retrying network errors."""
+        # Encode the body with orjson rather than letting httpx use the json module
+        body = orjson.dumps({
+            "model": model,
+            "messages": messages,
+            **sampling_params,
+        })
+        headers = self._get_headers(routing_key)
+        
+        delay = RETRY_BASE_DELAY
+        for attempt in range(1, settings.MAX_RETRY_ATTEMPTS + 1):
+            try:
+                response = await self._get_client().post(self._completions_url, headers=headers, content=body)
+                break
+            except (httpx.RequestError, httpx.TimeoutException) as e:
+                if attempt >= settings.MAX_RETRY_ATTEMPTS:
+                    raise VLLMServerError(f"Network error when contacting vLLM server: {str(e)}")
+                await asyncio.sleep(random.uniform(0, delay))
+                delay *= 2
+        
+        if response.status_code != 200:
+            raise VLLMServerError(
+                f"Failed to generate completion: {response.status_code} - {response.text}"
+            )
+        
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.api_base}/chat/completions",
-                    headers=self._get_headers(),
-                    json={
-                        "model": model,
-                        "messages": messages,
-                        **sampling_params,
-                    },
-                )
-                
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise VLLMServerError("Failed to parse response from vLLM server")
+    
+    async def warmup(self, model: str) -> None:
+        """
+        Send the model a one-token request and ignore the result.
+        
+        The first request to a freshly started vLLM server pays one-time startup
+        costs, and the first request from this client opens its connection;
+        warming up moves both out of the first real evaluation.
+        
+        Args:
+            model: The model ID to warm up
+        """
+        await self.generate_completion(
+            model=model,
+            messages=[{"role": "user", "content": "ping"}],
+            sampling_params={"max_tokens": 1},
+        )
+    
+    async def generate_completions_batch(
+        self,
+        model: str,
+        messages_list: List[list],
+        sampling_params: Dict[str, Any],
+        max_concurrency: Optional[int] = None,
+        routing_key: Optional[str] = None,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Generate completions for several conversations at once.
+        
+        The chat completions API takes one conversation per request, so the
+        requests are all sent before any response is awaited; vLLM then
+        schedules them in the same batch.
+        
+        Args:
+            model: The model ID to use for generation
+            messages_list: The messages of each conversation
+            sampling_params: Parameters for the generation, shared by all conversations
+            max_concurrency: Maximum number of requests in flight at once (None for no limit)
+            routing_key: Key sent in the routing header, e.g. the template ID (optional)
+            
+        Returns:
+            The response for each conversation, or the exception raised for it
+        """
+        if not max_concurrency:
+            return await asyncio.gather(
+                *(
+                    self.generate_completion(model, messages, sampling_params, routing_key=routing_key)
+                    for messages in messages_list
+                ),
+                return_exceptions=True,
+            )
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def generate(messages: list) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_completion(model, messages, sampling_params, routing_key=routing_key)
+        
+        return await asyncio.gather(
+            *(generate(messages) for messages in messages_list),
+            return_exceptions=True,
+        )
+    
+    async def stream_completion(
+        self,
+        model: str,
+        messages: list,
+        sampling_params: Dict[str, Any],
+        routing_key: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion using the vLLM server's chat completions API.
+        
+        Closing the generator early closes the response, which makes vLLM
+        abort the rest of the generation.
+        
+        Temperature-0 requests share the completion cache with
+        generate_completion: a cached completion is yielded as one piece, and
+        a stream read to the end is stored. Streams closed early are not
+        stored, since the caller decided where to stop.
+        
+        Args:
+            model: The model ID to use for generation
+            messages: The messages to send to the model
+            sampling_params: Parameters for the generation
+            routing_key: Key sent in the routing header, e.g. the template ID (optional)
+            
+        Yields:
+            Pieces of the generated text as they arrive
+        """
+        cache_key = self._completion_cache_key(model, messages, sampling_params)
+        if cache_key is None:
+            async with aclosing(self._stream_completion(model, messages, sampling_params, routing_key)) as deltas:
+                async for delta in deltas:
+                    yield delta
+            return
+        
+        cached = self.completion_cache.get(cache_key)
+        if cached is not None:
+            yield cached["choices"][0]["message"]["content"]
+            return
+        
+        raw_output = ""
+        async with aclosing(self._stream_completion(model, messages, sampling_params, routing_key)) as deltas:
+            async for delta in deltas:
+                raw_output += delta
+                yield delta
+        self.completion_cache.set(
+            cache_key, {"choices": [{"message": {"role": "assistant", "content": raw_output}}]}
+        )
+    
+    async def _stream_completion(
+        self,
+        model: str,
+        messages: list,
+        sampling_params: Dict[str, Any],
+        routing_key: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Stream one completion request from vLLM, yielding pieces of the generated text."""
+        try:
+            async with self._get_client().stream(
+                "POST",
+                self._completions_url,
+                headers=self._get_headers(routing_key),
+                content=orjson.dumps({
+                    "model": model,
+                    "messages": messages,
+                    **sampling_params,
+                    "stream": True,
+                }),
+            ) as response:
                 if response.status_code != 200:
+                    await response.aread()
                     raise VLLMServerError(
                         f"Failed to generate completion: {response.status_code} - {response.text}"
                     )
                 
-                return response.json()
+                async for line in response.aiter_lines():
+                    delta = parse_stream_line(line)
+                    if delta:
+                        yield delta
         except (httpx.RequestError, httpx.TimeoutException) as e:
             raise VLLMServerError(f"Network error when contacting vLLM server: {str(e)}")
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             raise VLLMServerError("Failed to parse response from vLLM server")
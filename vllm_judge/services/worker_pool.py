@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from typing import Any, Callable, Coroutine, List, Optional, Set
+
+from vllm_judge.core.config import settings
+from vllm_judge.core.errors import QueueFullError
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """
+    Fixed set of worker coroutines processing queued evaluation tasks.
+    
+    The queue is bounded, so under overload new tasks are rejected right away
+    instead of piling up in memory, and at most num_workers tasks run at once.
+    """
+    
+    def __init__(self, num_workers: Optional[int] = None, max_queue_size: Optional[int] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            num_workers: Number of tasks processed concurrently
+            max_queue_size: Maximum number of tasks waiting for a worker
+        """
+        self.num_workers = num_workers or settings.JUDGE_WORKERS
+        self.max_queue_size = max_queue_size or settings.JUDGE_QUEUE_SIZE
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        # Tasks run directly while the pool is not started
+        self._direct: Set[asyncio.Task] = set()
+    
+    async def start(self) -> None:
+        """Start the workers."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.num_workers)]
+    
+    async def stop(self) -> None:
+        """Stop the workers; tasks still in the queue are dropped."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+    
+    def submit(self, fn: Callable[..., Coroutine[Any, Any, Any]], *args: Any) -> None:
+        """
+        Queue a task for the next free worker.
+        
+        Args:
+            fn: Coroutine function to run
+            *args: Arguments to call it with
+        
+        Raises:
+            QueueFullError: If the queue is full
+        """
+        if self._queue is None:
+            task = asyncio.create_task(fn(*args))
+            self._direct.add(task)
+            task.add_done_callback(self._direct.discard)
+            return
+        
+        try:
+            self._queue.put_nowait((fn, args))
+        except asyncio.QueueFull:
+            raise QueueFullError(self.max_queue_size)
+    
+    async def _work(self) -> None:
+        """Run queued tasks one after another."""
+        while True:
+            fn, args = await self._queue.get()
+            try:
+                await fn(*args)
+            except Exception:
+                logger.exception("Evaluation task failed")
+            finally:
+                self._queue.task_done()
@@ -1,12 +1,69 @@
-import json
 import os
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import orjson
+
+from vllm_judge.services.segments import compile_segment
+
+# Default output format instructions by task type
+_OUTPUT_FORMAT_INSTRUCTIONS: Dict[str, str] = {
+    "binary_classification": "Respond with ONLY 'POSITIVE' or 'NEGATIVE'.",
+    "likert_scale": "Respond with ONLY a single number from 1 to 5, where 1 is the worst and 5 is the best.",
+    "pairwise_comparison": "Respond with ONLY 'A' if Text A is better, 'B' if Text B is better, or 'EQUAL' if they are of equal quality.",
+    "toxicity_detection": "Respond with ONLY 'TOXIC' or 'NON-TOXIC'.",
+    "factual_accuracy": "Respond with JSON in this format: {\"accuracy_score\": <1-5>, \"errors_found\": [<list of factual errors>], \"is_accurate\": <true|false>}",
+    "reasoning_evaluation": "Respond with ONLY a single number from 1 to 5, where 1 indicates poor reasoning and 5 indicates excellent reasoning.",
+    "summarization_quality": "Respond with JSON in this format: {\"completeness_score\": <1-5>, \"conciseness_score\": <1-5>, \"accuracy_score\": <1-5>, \"overall_score\": <1-5>}",
+    "hallucination_detection": "Respond with JSON in this format: {\"contains_hallucinations\": <true|false>, \"hallucinated_claims\": [<list of hallucinated claims>], \"hallucination_severity\": <\"low\"|\"medium\"|\"high\">}",
+}
+_DEFAULT_OUTPUT_FORMAT_INSTRUCTION = "Provide a clear and concise evaluation."
+
+# Chain-of-thought prompts by task type
+_CHAIN_OF_THOUGHT_PROMPTS: Dict[str, str] = {
+    "binary_classification": "Think step by step about your evaluation. First, identify the key aspects of the content relevant to the criteria. Then, assess how well the content meets or fails to meet each criterion. Finally, make your determination. After your analysis, ",
+    "likert_scale": "Think step by step about your evaluation. First, identify the key aspects of the content relevant to the criteria. Then, assess how well the content meets or fails to meet each criterion. Consider the strengths and weaknesses to determine the appropriate score. After your analysis, ",
+    "pairwise_comparison": "Think step by step about your comparison. First, identify the key aspects of both texts relevant to the criteria. Then, compare how well each text addresses these aspects. Note the strengths and weaknesses of each. Finally, determine which text is better overall. After your analysis, ",
+    "toxicity_detection": "Think step by step about your evaluation. First, identify any potentially harmful or inappropriate content. Then, assess the severity and intent of this content. Consider the context and the potential impact on different audiences. After your analysis, ",
+    "factual_accuracy": "Think step by step about your evaluation. First, identify the key factual claims in the text. Then, check each claim against the reference information. Note any inconsistencies, omissions, or additions that are not supported by the reference. After your analysis, ",
+    "reasoning_evaluation": "Think step by step about your evaluation. First, identify the main arguments and logical structure of the text. Then, assess the clarity, coherence, and soundness of the reasoning. Look for logical fallacies, unsupported assumptions, or gaps in the argument. After your analysis, ",
+    "summarization_quality": "Think step by step about your evaluation. First, identify the key points in the original text. Then, check if the summary captures these key points. Assess the completeness, accuracy, and conciseness of the summary. Consider if any important information is missing or if any extraneous details are included. After your analysis, ",
+    "hallucination_detection": "Think step by step about your evaluation. First, identify the key factual claims in the generated text. Then, check each claim against the source information. Note any claims that are not supported by or contradict the source. Assess the severity of any hallucinations found. After your analysis, ",
+}
+_DEFAULT_CHAIN_OF_THOUGHT_PROMPT = "Think step by step about your evaluation. Consider all relevant aspects of the content in relation to the criteria. Carefully weigh the evidence before making your determination. After your analysis, "
+
+# Model families by a keyword of their model IDs, checked in order
+_MODEL_FAMILY_KEYWORDS = (
+    ("llama", "llama"),
+    ("mistral", "mistral"),
+    ("falcon", "falcon"),
+    ("claude", "claude"),
+    ("gpt", "gpt"),
+    ("palm", "google"),
+    ("gemini", "google"),
+    ("bloom", "bloom"),
+)
+
+# Model-adapted templates by (serialized base template, model family), so a
+# changed template is adapted again
+ADAPTED_TEMPLATE_CACHE_SIZE = 256
+_adapted_templates: Dict[Tuple[bytes, str], Dict[str, Any]] = {}
+
+
+@lru_cache(maxsize=64)
+def _read_templates_cached(template_path: str, mtime_ns: int, size: int) -> bytes:
+    """Read a template file; the modification time and size make a changed file a new entry."""
+    with open(template_path, "rb") as f:
+        return f.read()
 
 
 def load_templates(template_path: str) -> Dict[str, Any]:
     """
     Load templates from a JSON file.
     
+    The file contents are memoized until the file changes and parsed again
+    on every call, so each caller gets its own dictionary to modify.
+    
     Args:
         template_path: Path to the template file
         
@@ -15,65 +72,86 @@ def load_templates(template_path: str) -> Dict[str, Any]:
         
     Raises:
         FileNotFoundError: If the template file doesn't exist
-        json.JSONDecodeError: If the template file is not valid JSON
+        orjson.JSONDecodeError: If the template file is not valid JSON
     """
-    with open(template_path, "r") as f:
-        return json.load(f)
+    stat = os.stat(template_path)
+    return orjson.loads(_read_templates_cached(template_path, stat.st_mtime_ns, stat.st_size))
 
 
 def save_templates(templates: Dict[str, Any], template_path: str) -> None:
     """
     Save templates to a JSON file.
     
+    The file is written in one go under a temporary name and then renamed
+    over the old one, so a crash mid-write never leaves a truncated file.
+    
     Args:
         templates: Dictionary of templates
         template_path: Path to the template file
     """
-    os.makedirs(os.path.dirname(template_path), exist_ok=True)
-    with open(template_path, "w") as f:
-        json.dump(templates, f, indent=2)
+    directory = os.path.dirname(template_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = orjson.dumps(templates, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    tmp_path = f"{template_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, template_path)
+    _read_templates_cached.cache_clear()
 
 
-def format_prompt(
-    template: Dict[str, Any],
-    variables: Dict[str, str],
-    custom_segments: Optional[Dict[str, str]] = None
-) -> List[Dict[str, str]]:
+def _format_segment(segment: str, variables: Dict[str, Any]) -> str:
     """
-    Format a prompt template with variables.
+    Fill the placeholders of a prompt segment, like segment.format_map(variables).
     
-    Args:
-        template: The prompt template
-        variables: Dictionary of variables to substitute in the template
-        custom_segments: Optional custom segments to override parts of the template
-        
-    Returns:
-        A list of messages in the format expected by the vLLM server
+    The segment is parsed once, sharing the segment cache PromptManager
+    uses, and then filled by joining its pieces.
     """
-    prompt_structure = template["prompt_structure"].copy()
+    if "{" not in segment and "}" not in segment:
+        return segment
+    compiled = compile_segment(segment)
+    if compiled is None:
+        return segment.format_map(variables)
+    
+    pieces, slots = compiled
+    filled = list(pieces)
+    for index, field in slots:
+        filled[index] = str(variables[field])
+    return "".join(filled)
+
+
+def _resolve_prompt_structure(
+    template: Dict[str, Any],
+    custom_segments: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """Get a template's prompt structure with custom segments applied, copying it only when something is overridden."""
+    prompt_structure = template["prompt_structure"]
     
     # Override template segments with custom segments if provided
     if custom_segments:
-        for key, value in custom_segments.items():
-            if key in prompt_structure:
-                prompt_structure[key] = value
+        overrides = {key: value for key, value in custom_segments.items() if key in prompt_structure}
+        if overrides:
+            prompt_structure = {**prompt_structure, **overrides}
     
+    return prompt_structure
+
+
+def _build_messages(prompt_structure: Dict[str, str], variables: Dict[str, str]) -> List[Dict[str, str]]:
+    """Format a resolved prompt structure with variables into chat messages."""
     # Format the system message
     system_message = prompt_structure["system_message"]
     
     # Format the user content
-    user_content = prompt_structure["user_instruction_prefix"].format(**variables)
+    user_content = _format_segment(prompt_structure["user_instruction_prefix"], variables)
     
-    # Add text to evaluate or comparison texts (these are handled specially)
-    if "text_to_evaluate" in variables:
-        user_content += variables["text_to_evaluate"]
-    elif "text_A" in variables and "text_B" in variables:
-        # For pairwise comparison, the texts are already included in the prefix
-        pass
+    # Add the text to evaluate; pairwise comparison texts are already included in the prefix
+    text_to_evaluate = variables.get("text_to_evaluate")
+    if text_to_evaluate is not None:
+        user_content += text_to_evaluate
     
     # Add suffix if present
     if "user_instruction_suffix" in prompt_structure:
-        user_content += prompt_structure["user_instruction_suffix"].format(**variables)
+        user_content += _format_segment(prompt_structure["user_instruction_suffix"], variables)
     
     # Create the chat messages
     messages = [
@@ -90,6 +168,53 @@ def format_prompt(
     return messages
 
 
+def format_prompt(
+    template: Dict[str, Any],
+    variables: Dict[str, str],
+    custom_segments: Optional[Dict[str, str]] = None
+) -> List[Dict[str, str]]:
+    """
+    Format a prompt template with variables.
+    
+    Args:
+        template: The prompt template
+        variables: Dictionary of variables to substitute in the template
+        custom_segments: Optional custom segments to override parts of the template
+        
+    Returns:
+        A list of messages in the format expected by the vLLM server
+    """
+    return _build_messages(_resolve_prompt_structure(template, custom_segments), variables)
+
+
+def format_prompt_many(
+    template: Dict[str, Any],
+    variables_list: Iterable[Dict[str, str]],
+    custom_segments: Optional[Dict[str, str]] = None
+) -> List[List[Dict[str, str]]]:
+    """
+    Format a prompt template with each of several sets of variables.
+    
+    Equivalent to calling format_prompt for every set, but the custom
+    segments are applied to the template only once.
+    
+    Args:
+        template: The prompt template
+        variables_list: Dictionaries of variables, one per prompt
+        custom_segments: Optional custom segments to override parts of the template
+        
+    Returns:
+        The messages of each prompt, in the order of variables_list
+    """
+    prompt_structure = _resolve_prompt_structure(template, custom_segments)
+    return [_build_messages(prompt_structure, variables) for variables in variables_list]
+
+
+def _copy_template(template: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a template and the sections merged by model adaptations."""
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in template.items()}
+
+
 def get_model_specific_template(
     template_data: Dict[str, Any],
     model_id: str
@@ -98,7 +223,9 @@ def get_model_specific_template(
     Get the most appropriate template version for a specific model.
     
     This function checks if there are model-specific adaptations of a template
-    and returns the most appropriate one for the given model.
+    and returns the most appropriate one for the given model. Adapted
+    templates are memoized by template content and model family; each call
+    gets its own copy.
     
     Args:
         template_data: The template data
@@ -108,36 +235,48 @@ def get_model_specific_template(
         The most appropriate template for the model
     """
     # If there are no model adaptations, return the base template
-    if "model_adaptations" not in template_data:
+    adaptations = template_data.get("model_adaptations")
+    if not adaptations:
         return template_data
     
     # Get the model family from the model ID
     model_family = get_model_family(model_id)
     
     # Check if there's an adaptation for this model family
-    if model_family in template_data["model_adaptations"]:
-        # Create a copy of the base template
-        adapted_template = dict(template_data)
-        
-        # Update with the model-specific adaptations
-        for key, value in template_data["model_adaptations"][model_family].items():
-            if isinstance(value, dict) and isinstance(adapted_template.get(key), dict):
-                # Merge dictionaries recursively
-                adapted_template[key] = {**adapted_template[key], **value}
-            else:
-                # Replace value
-                adapted_template[key] = value
-        
-        return adapted_template
+    family_adaptations = adaptations.get(model_family)
+    if family_adaptations is None:
+        return template_data
+    
+    cache_key = (orjson.dumps(template_data, default=dict), model_family)
+    cached = _adapted_templates.get(cache_key)
+    if cached is not None:
+        return _copy_template(cached)
+    
+    # Create a copy of the base template
+    adapted_template = template_data.copy()
+    
+    # Update with the model-specific adaptations
+    for key, value in family_adaptations.items():
+        if isinstance(value, dict) and isinstance(adapted_template.get(key), dict):
+            # Merge dictionaries recursively
+            adapted_template[key] = adapted_template[key] | value
+        else:
+            # Replace value
+            adapted_template[key] = value
     
-    # No specific adaptation found, return the base template
-    return template_data
+    if len(_adapted_templates) >= ADAPTED_TEMPLATE_CACHE_SIZE:
+        _adapted_templates.clear()
+    _adapted_templates[cache_key] = adapted_template
+    return _copy_template(adapted_template)
 
 
+@lru_cache(maxsize=1024)
 def get_model_family(model_id: str) -> str:
     """
     Extract the model family from a model ID.
     
+    Deployments use only a few model IDs, so the result is memoized.
+    
     Args:
         model_id: The ID of the model
         
@@ -147,28 +286,17 @@ def get_model_family(model_id: str) -> str:
     # Extract model family based on common naming patterns
     lower_id = model_id.lower()
     
-    if "llama" in lower_id:
-        return "llama"
-    elif "mistral" in lower_id:
-        return "mistral"
-    elif "falcon" in lower_id:
-        return "falcon"
-    elif "claude" in lower_id:
-        return "claude"
-    elif "gpt" in lower_id:
-        return "gpt"
-    elif "palm" in lower_id or "gemini" in lower_id:
-        return "google"
-    elif "bloom" in lower_id:
-        return "bloom"
-    else:
-        # Return the organization part of the model ID if available
-        parts = model_id.split("/")
-        if len(parts) > 1:
-            return parts[0].lower()
-        
-        # If no clear family can be determined, return unknown
-        return "unknown"
+    for keyword, family in _MODEL_FAMILY_KEYWORDS:
+        if keyword in lower_id:
+            return family
+    
+    # Return the organization part of the model ID if available
+    parts = model_id.split("/")
+    if len(parts) > 1:
+        return parts[0].lower()
+    
+    # If no clear family can be determined, return unknown
+    return "unknown"
 
 
 def get_default_output_format_instruction(task_type: str) -> str:
@@ -181,24 +309,7 @@ def get_default_output_format_instruction(task_type: str) -> str:
     Returns:
         A default output format instruction
     """
-    if task_type == "binary_classification":
-        return "Respond with ONLY 'POSITIVE' or 'NEGATIVE'."
-    elif task_type == "likert_scale":
-        return "Respond with ONLY a single number from 1 to 5, where 1 is the worst and 5 is the best."
-    elif task_type == "pairwise_comparison":
-        return "Respond with ONLY 'A' if Text A is better, 'B' if Text B is better, or 'EQUAL' if they are of equal quality."
-    elif task_type == "toxicity_detection":
-        return "Respond with ONLY 'TOXIC' or 'NON-TOXIC'."
-    elif task_type == "factual_accuracy":
-        return "Respond with JSON in this format: {\"accuracy_score\": <1-5>, \"errors_found\": [<list of factual errors>], \"is_accurate\": <true|false>}"
-    elif task_type == "reasoning_evaluation":
-        return "Respond with ONLY a single number from 1 to 5, where 1 indicates poor reasoning and 5 indicates excellent reasoning."
-    elif task_type == "summarization_quality":
-        return "Respond with JSON in this format: {\"completeness_score\": <1-5>, \"conciseness_score\": <1-5>, \"accuracy_score\": <1-5>, \"overall_score\": <1-5>}"
-    elif task_type == "hallucination_detection":
-        return "Respond with JSON in this format: {\"contains_hallucinations\": <true|false>, \"hallucinated_claims\": [<list of hallucinated claims>], \"hallucination_severity\": <\"low\"|\"medium\"|\"high\">}"
-    else:
-        return "Provide a clear and concise evaluation."
+    return _OUTPUT_FORMAT_INSTRUCTIONS.get(task_type, _DEFAULT_OUTPUT_FORMAT_INSTRUCTION)
 
 
 def get_chain_of_thought_prompt(task_type: str) -> str:
@@ -211,21 +322,4 @@ def get_chain_of_thought_prompt(task_type: str) -> str:
     Returns:
         A chain-of-thought prompt
     """
-    if task_type == "binary_classification":
-        return "Think step by step about your evaluation. First, identify the key aspects of the content relevant to the criteria. Then, assess how well the content meets or fails to meet each criterion. Finally, make your determination. After your analysis, "
-    elif task_type == "likert_scale":
-        return "Think step by step about your evaluation. First, identify the key aspects of the content relevant to the criteria. Then, assess how well the content meets or fails to meet each criterion. Consider the strengths and weaknesses to determine the appropriate score. After your analysis, "
-    elif task_type == "pairwise_comparison":
-        return "Think step by step about your comparison. First, identify the key aspects of both texts relevant to the criteria. Then, compare how well each text addresses these aspects. Note the strengths and weaknesses of each. Finally, determine which text is better overall. After your analysis, "
-    elif task_type == "toxicity_detection":
-        return "Think step by step about your evaluation. First, identify any potentially harmful or inappropriate content. Then, assess the severity and intent of this content. Consider the context and the potential impact on different audiences. After your analysis, "
-    elif task_type == "factual_accuracy":
-        return "Think step by step about your evaluation. First, identify the key factual claims in the text. Then, check each claim against the reference information. Note any inconsistencies, omissions, or additions that are not supported by the reference. After your analysis, "
-    elif task_type == "reasoning_evaluation":
-        return "Think step by step about your evaluation. First, identify the main arguments and logical structure of the text. Then, assess the clarity, coherence, and soundness of the reasoning. Look for logical fallacies, unsupported assumptions, or gaps in the argument. After your analysis, "
-    elif task_type == "summarization_quality":
-        return "Think step by step about your evaluation. First, identify the key points in the original text. Then, check if the summary captures these key points. Assess the completeness, accuracy, and conciseness of the summary. Consider if any important information is missing or if any extraneous details are included. After your analysis, "
-    elif task_type == "hallucination_detection":
-        return "Think step by step about your evaluation. First, identify the key factual claims in the generated text. Then, check each claim against the source information. Note any claims that are not supported by or contradict the source. Assess the severity of any hallucinations found. After your analysis, "
-    else:
-        return "Think step by step about your evaluation. Consider all relevant aspects of the content in relation to the criteria. Carefully weigh the evidence before making your determination. After your analysis, "
\ No newline at end of file
+    return _CHAIN_OF_THOUGHT_PROMPTS.get(task_type, _DEFAULT_CHAIN_OF_THOUGHT_PROMPT)